@@ -0,0 +1,193 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from sqlmodel import Session
+
+from .database import engine
+from .schema import ensure_schema, reset_schema
+from . import models  # noqa: F401 - enregistre les tables dans SQLModel.metadata
+from .repositories import ClientPointsRepository, ClientSearchRepository
+from .models import ClientDuplicateReport
+from .services import ClientService, ClientDedupService, SalesService
+from .services.client_service import SEARCH_BUDGET_MS
+
+
+def init_db(args: argparse.Namespace) -> int:
+    """Create the missing tables and store the schema fingerprint."""
+    up_to_date = ensure_schema(engine)
+    print("Schema up to date" if up_to_date else "Schema created/updated")
+    return 0
+
+
+def reset_db(args: argparse.Namespace) -> int:
+    """Drop and recreate every table after confirmation."""
+    if not args.yes:
+        answer = input(f"Drop ALL tables of {engine.url.render_as_string(hide_password=True)}? [y/N] ")
+        if answer.strip().lower() not in ("y", "yes", "o", "oui"):
+            print("Aborted")
+            return 1
+    reset_schema(engine)
+    print("Database reset")
+    return 0
+
+
+def rebuild_search_index(args: argparse.Namespace) -> int:
+    """Rebuild the client trigram search index from t_client."""
+    start = time.perf_counter()
+    with Session(engine) as session:
+        total = ClientSearchRepository.rebuild(session, chunk_size=args.chunk_size)
+    print(f"{total} clients indexed in {time.perf_counter() - start:.1f} s")
+    return 0
+
+
+def rebuild_points(args: argparse.Namespace) -> int:
+    """Recompute every client loyalty points balance from the orders."""
+    start = time.perf_counter()
+    with Session(engine) as session:
+        total = ClientPointsRepository.rebuild(session)
+    print(f"{total} balances rebuilt in {time.perf_counter() - start:.1f} s")
+    return 0
+
+
+def backfill_sales(args: argparse.Namespace) -> int:
+    """Rebuild the sales rollup from the order history."""
+    start = time.perf_counter()
+    with Session(engine) as session:
+        total = SalesService.backfill(session, chunk_size=args.chunk_size)
+    print(f"{total} orders aggregated in {time.perf_counter() - start:.1f} s")
+    return 0
+
+
+def find_duplicates(args: argparse.Namespace) -> int:
+    """Write the duplicate client candidates as NDJSON and report the throughput."""
+    report = ClientDuplicateReport()
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        with Session(engine) as session:
+            for candidate in ClientDedupService.find(
+                session, report, min_score=args.min_score, chunk_size=args.chunk_size, max_block=args.max_block
+            ):
+                output.write(candidate.model_dump_json() + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(
+        f"{report.scanned} clients scanned in {report.elapsed_ms / 1000:.1f} s ({report.rows_per_second:.0f} rows/s): "
+        f"{report.pairs} pairs compared in {report.blocks} blocks ({report.skipped_blocks} skipped), {report.found} candidates",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def bench_search(args: argparse.Namespace) -> int:
+    """Run the given search queries and report latency percentiles against the budget."""
+    timings = []
+    with Session(engine) as session:
+        for _ in range(args.repeat):
+            for q in args.queries:
+                start = time.perf_counter()
+                ClientService.search(q=q, limit=args.limit, session=session)
+                timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p50 = statistics.median(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) >= 20 else timings[-1]
+    print(f"{len(timings)} searches: p50={p50:.2f} ms p95={p95:.2f} ms max={timings[-1]:.2f} ms (budget {SEARCH_BUDGET_MS:.0f} ms)")
+    return 0 if p95 <= SEARCH_BUDGET_MS else 1
+
+
+def bench_serialization(args: argparse.Namespace) -> int:
+    """Compare the serialization time of a client page: FastAPI response_model path vs fast path."""
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from pydantic import TypeAdapter
+    from .models import ClientPublic
+    from .routers.client_router import get_clients
+    from .routers.fast_response import render_rows
+    from .main import app
+
+    route = next(route for route in app.routes if getattr(route, "endpoint", None) is get_clients)
+    adapter = TypeAdapter(list[ClientPublic])
+    with Session(engine) as session:
+        clients, _ = ClientService.get_page(limit=args.limit, session=session)
+        rows, _ = ClientService.get_page_rows(limit=args.limit, session=session)
+
+        async def current_path():
+            content = await serialize_response(
+                field=route.response_field, response_content=clients, exclude_unset=True, is_coroutine=True
+            )
+            return JSONResponse(content).body
+
+        def timed(func) -> float:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                func()
+            return (time.perf_counter() - start) / args.repeat * 1e6
+
+        results = {
+            "response_model + JSONResponse": timed(lambda: asyncio.run(current_path())),
+            "fast path, validated (TypeAdapter)": timed(lambda: render_rows(rows, adapter)),
+            "fast path, trusted (orjson)": timed(lambda: render_rows(rows)),
+        }
+    # asyncio.run ajoute un coût fixe au chemin actuel : on le mesure pour le retirer
+    overhead = timed(lambda: asyncio.run(asyncio.sleep(0)))
+    results["response_model + JSONResponse"] -= overhead
+    reference = results["response_model + JSONResponse"]
+    print(f"Page of {len(rows)} clients, {args.repeat} runs")
+    for name, duration in results.items():
+        print(f"  {name:<36} {duration:9.1f} us/page  x{reference / duration:.1f}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="DigiCheese administration commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("init-db", help="Create the missing tables without touching data")
+    command.set_defaults(func=init_db)
+
+    command = commands.add_parser("reset-db", help="Drop and recreate every table (destructive)")
+    command.add_argument("--yes", action="store_true", help="Do not ask for confirmation")
+    command.set_defaults(func=reset_db)
+
+    command = commands.add_parser("rebuild-search-index", help="Rebuild the client search index")
+    command.add_argument("--chunk-size", type=int, default=1000, help="Clients indexed per transaction")
+    command.set_defaults(func=rebuild_search_index)
+
+    command = commands.add_parser("rebuild-points", help="Recompute the client loyalty points balances")
+    command.set_defaults(func=rebuild_points)
+
+    command = commands.add_parser("backfill-sales", help="Rebuild the sales rollup from the order history")
+    command.add_argument("--chunk-size", type=int, default=1000, help="Orders aggregated per transaction")
+    command.set_defaults(func=backfill_sales)
+
+    command = commands.add_parser("find-duplicates", help="Detect probable duplicate clients (NDJSON merge candidates)")
+    command.add_argument("--min-score", type=float, default=0.8, help="Minimum similarity score of a candidate pair")
+    command.add_argument("--max-block", type=int, default=50, help="Blocks larger than this are skipped")
+    command.add_argument("--chunk-size", type=int, default=1000, help="Clients read per chunk")
+    command.add_argument("--output", help="Output file, standard output by default")
+    command.set_defaults(func=find_duplicates)
+
+    command = commands.add_parser("bench-search", help="Measure the client search latency")
+    command.add_argument("queries", nargs="+", help="Search queries to run")
+    command.add_argument("--repeat", type=int, default=20, help="Number of runs of each query")
+    command.add_argument("--limit", type=int, default=20, help="Number of results per search")
+    command.set_defaults(func=bench_search)
+
+    command = commands.add_parser("bench-serialization", help="Benchmark the client list serialization paths")
+    command.add_argument("--limit", type=int, default=100, help="Number of clients per page")
+    command.add_argument("--repeat", type=int, default=200, help="Number of runs of each path")
+    command.set_defaults(func=bench_serialization)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import os
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+
+try:
+    import brotli
+except ImportError:  # Brotli optionnel : gzip seul sans lui
+    brotli = None
+
+# Compression des réponses (br, gzip) selon Accept-Encoding, COMPRESSION=0 pour la désactiver
+COMPRESSION = os.environ.get("COMPRESSION", "1").lower() in ("1", "true", "yes")
+
+# En dessous de cette taille (octets), le coût CPU dépasse le gain en bande passante
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1000"))
+GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "4"))
+
+
+def accepted_encodings(header: str) -> dict[str, float]:
+    """Codings of an Accept-Encoding header with their q-value."""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding.strip().lower()] = q
+    return codings
+
+
+def negotiate(header: str, available: tuple[str, ...]) -> str | None:
+    """Best coding of `available` (in server preference order) accepted by the client, None for identity."""
+    codings = accepted_encodings(header)
+    default = codings.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in available:
+        q = codings.get(coding, default)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def _weaken_etag(message) -> None:
+    """A compressed body is another representation: its strong ETag becomes weak, as nginx does."""
+    headers = MutableHeaders(raw=message["headers"])
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+
+class _GZipResponder(GZipResponder):
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        _weaken_etag(self.initial_message)
+        return super().apply_compression(body, more_body=more_body)
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app, minimum_size: int, quality: int = BROTLI_QUALITY):
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        _weaken_etag(self.initial_message)
+        data = self.compressor.process(body)
+        return data + (self.compressor.flush() if more_body else self.compressor.finish())
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing the responses with brotli or gzip, following Accept-Encoding.
+
+    Brotli is preferred when the `brotli` package is installed. Bodies smaller
+    than `minimum_size`, already encoded responses and event streams are sent
+    as is; streamed responses (NDJSON, CSV) are compressed chunk by chunk.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE, gzip_level: int = GZIP_LEVEL):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.available = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.available)
+        if coding == "br":
+            responder = BrotliResponder(self.app, self.minimum_size)
+        elif coding == "gzip":
+            responder = _GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
@@ -1,5 +1,19 @@
+import itertools
+import logging
 import os
+import threading
+import time
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
 from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.sql import Select, CompoundSelect
+from sqlalchemy.sql.dml import UpdateBase
+
+logger = logging.getLogger("uvicorn.error")
 
 # Configuration de la base de données
 DB_CONFIG = {
@@ -13,22 +27,246 @@ DB_CONFIG = {
 
 # URL de connexion à la base de données
 CONNEXION_STRING = "{connector}://{username}:{password}@{host}:{port}/{database}"
-DATABASE_URL = CONNEXION_STRING.format(**DB_CONFIG)
+DATABASE_URL = os.environ.get("DB_URL") or CONNEXION_STRING.format(**DB_CONFIG)
+
+# Profils du moteur (DB_PROFILE=dev|test|prod), chaque valeur peut être surchargée par variable d'environnement
+ENGINE_PROFILES = {
+    "dev": {
+        "echo": True,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 3600,
+        "query_cache_size": 500,
+        "isolation_level": None,
+    },
+    "test": {
+        "echo": False,
+        "pool_size": 5,
+        "max_overflow": 0,
+        "pool_pre_ping": False,
+        "pool_recycle": -1,
+        "query_cache_size": 500,
+        "isolation_level": None,
+    },
+    "prod": {
+        # Pas d'echo : la journalisation synchrone de chaque requête SQL coûte cher en charge
+        "echo": False,
+        "pool_size": 20,
+        "max_overflow": 10,
+        # pre_ping + recycle < wait_timeout MySQL : plus de 500 sur connexions mortes après inactivité
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "query_cache_size": 1200,
+        "isolation_level": "READ COMMITTED",
+    },
+}
+
+ENGINE_ENV = {
+    "echo": ("DB_ECHO", lambda value: value.lower() in ("1", "true", "yes")),
+    "pool_size": ("DB_POOL_SIZE", int),
+    "max_overflow": ("DB_MAX_OVERFLOW", int),
+    "pool_pre_ping": ("DB_POOL_PRE_PING", lambda value: value.lower() in ("1", "true", "yes")),
+    "pool_recycle": ("DB_POOL_RECYCLE", int),
+    "query_cache_size": ("DB_QUERY_CACHE_SIZE", int),
+    "isolation_level": ("DB_ISOLATION_LEVEL", str),
+}
+
+DB_PROFILE = os.environ.get("DB_PROFILE", "dev")
+
+
+def engine_options(profile: str = DB_PROFILE) -> dict:
+    """Build the create_engine keyword arguments of a profile, with environment overrides.
+    
+    Args:
+        profile (str): The profile name (dev, test or prod).
+    
+    Returns:
+        dict: The keyword arguments for create_engine / create_async_engine.
+    
+    Raises:
+        ValueError: If the profile does not exist.
+    """
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown DB_PROFILE '{profile}', expected one of {sorted(ENGINE_PROFILES)}")
+    options = dict(ENGINE_PROFILES[profile])
+    for key, (variable, cast) in ENGINE_ENV.items():
+        if variable in os.environ:
+            options[key] = cast(os.environ[variable])
+    if options["isolation_level"] is None:
+        del options["isolation_level"]
+    return options
+
+
+ENGINE_OPTIONS = engine_options()
 
 # Moteur de base de données
-engine = create_engine(DATABASE_URL, echo=True)
+engine = create_engine(DATABASE_URL, **ENGINE_OPTIONS)
+
+# Réplicas en lecture (DB_REPLICA_URLS, URLs séparées par des virgules) : vide, tout passe par le primaire.
+# Seul le mode synchrone répartit les lectures, DB_ASYNC=1 lit et écrit tout sur le primaire.
+REPLICA_URLS = [url.strip() for url in os.environ.get("DB_REPLICA_URLS", "").split(",") if url.strip()]
+# Après une écriture, les lectures du même client restent sur le primaire pendant cette durée (retard de réplication)
+REPLICA_STICKY_SECONDS = float(os.environ.get("DB_REPLICA_STICKY_SECONDS", "5"))
+# Un réplica est revérifié (SELECT 1) au plus toutes les DB_REPLICA_HEALTH_INTERVAL secondes
+REPLICA_HEALTH_INTERVAL = float(os.environ.get("DB_REPLICA_HEALTH_INTERVAL", "10"))
+REPLICA_STICKY_COOKIE = "db_primary_until"
+
+
+class ReplicaPool:
+    """Read replicas served round-robin, skipping the ones whose last health check failed.
+    
+    A replica is checked with a `SELECT 1` when it is picked and its last
+    check is older than `health_interval` seconds, so a failed replica is
+    retried at that pace without a background thread.
+    """
+    
+    def __init__(self, engines: list[Engine], health_interval: float = 10.0):
+        self.engines = engines
+        self.health_interval = health_interval
+        self._cycle = itertools.cycle(engines)
+        self._lock = threading.Lock()
+        # Moteur -> (sain, instant de la dernière vérification)
+        self._health: dict[Engine, tuple[bool, float]] = {}
+    
+    def _check(self, engine: Engine) -> bool:
+        try:
+            with engine.connect() as connection:
+                connection.exec_driver_sql("SELECT 1")
+            return True
+        except SQLAlchemyError as e:
+            logger.warning("Replica %s is unavailable: %s", engine.url.render_as_string(hide_password=True), e)
+            return False
+    
+    def healthy(self, engine: Engine) -> bool:
+        now = time.monotonic()
+        healthy, checked_at = self._health.get(engine, (True, float("-inf")))
+        if now - checked_at < self.health_interval:
+            return healthy
+        # Marqué vérifié avant le test : les autres requêtes ne vérifient pas le même réplica en parallèle
+        self._health[engine] = (healthy, now)
+        healthy = self._check(engine)
+        self._health[engine] = (healthy, now)
+        return healthy
+    
+    def choose(self) -> Engine | None:
+        """Next healthy replica, or None when there is none (reads then go to the primary)."""
+        for _ in range(len(self.engines)):
+            with self._lock:
+                engine = next(self._cycle)
+            if self.healthy(engine):
+                return engine
+        return None
+
+
+class RoutingSession(Session):
+    """Session reading from `replica` until its first write, then bound to the primary.
+    
+    INSERT/UPDATE/DELETE, ORM flushes and SELECT ... FOR UPDATE go to the
+    primary; once the session has written, its reads follow so that it sees
+    its own writes. Statements that are neither (text(), DDL) use the primary.
+    """
+    
+    def __init__(self, bind: Engine, replica: Engine | None = None, **kwargs):
+        super().__init__(bind=bind, **kwargs)
+        self.replica = replica
+        self.wrote = False
+    
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replica is None or self.wrote:
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.wrote = True
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if isinstance(clause, (Select, CompoundSelect)) and clause._for_update_arg is None:
+            return self.replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+def reads_replica(session: Session) -> bool:
+    """True while `session` sends its reads to a replica: what it reads may lag behind the primary."""
+    return isinstance(session, RoutingSession) and session.replica is not None and not session.wrote
+
+
+replicas = ReplicaPool(
+    [create_engine(url, **ENGINE_OPTIONS) for url in REPLICA_URLS],
+    health_interval=REPLICA_HEALTH_INTERVAL,
+)
+
+
+def reads_from_replica(request: Request) -> bool:
+    """GET/HEAD requests may read from a replica, unless the client wrote within the sticky window."""
+    if request.method not in ("GET", "HEAD"):
+        return False
+    try:
+        return float(request.cookies.get(REPLICA_STICKY_COOKIE, "0")) < time.time()
+    except ValueError:
+        return True
+
 
 # déclaration d'une base qui permet après de créer un modèle et de mapper avec SqlModel
-def get_session():
+def get_session(request: Request):
     """
     Fonction génératrice pour fournir une session de base de données.
     Laisse ouverte la session pour les opérations de base de données et la ferme après utilisation.
+    Les lectures des requêtes GET passent par un réplica quand DB_REPLICA_URLS est configurée.
     """
-    session = Session(engine, autoflush=False, autocommit=False)
+    replica = replicas.choose() if replicas.engines and reads_from_replica(request) else None
+    session = RoutingSession(engine, replica, autoflush=False, autocommit=False)
     try:
         yield session
     finally:
         session.close()
 
+
+class ReplicaStickinessMiddleware:
+    """ASGI middleware marking the clients that just wrote, so that their next reads use the primary.
+    
+    Every non GET/HEAD request gets a cookie holding the end of the sticky
+    window; `get_session` sends the client's reads to the primary until then.
+    """
+    
+    def __init__(self, app, sticky_seconds: float = REPLICA_STICKY_SECONDS):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            await self.app(scope, receive, send)
+            return
+        
+        cookie = (
+            f"{REPLICA_STICKY_COOKIE}={time.time() + self.sticky_seconds:.3f}; "
+            f"Max-Age={max(1, round(self.sticky_seconds))}; Path=/; HttpOnly; SameSite=Lax"
+        )
+        
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Set-Cookie", cookie)
+            await send(message)
+        
+        await self.app(scope, receive, send_with_cookie)
+
+# Mode asynchrone optionnel (DB_ASYNC=1) : les routes clients passent sur un AsyncSession
+ASYNC_MODE = os.environ.get("DB_ASYNC", "0").lower() in ("1", "true", "yes")
+ASYNC_DATABASE_URL = os.environ.get(
+    "DB_ASYNC_URL",
+    CONNEXION_STRING.format(**{**DB_CONFIG, "connector": "mysql+aiomysql"})
+)
+
+# Le moteur asynchrone n'est créé qu'en mode asynchrone (le driver aiomysql est alors requis)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **ENGINE_OPTIONS) if ASYNC_MODE else None
+
+async def get_async_session():
+    """
+    Fonction génératrice asynchrone pour fournir une session de base de données.
+    Équivalent de `get_session` pour le mode asynchrone, sans lecture sur les réplicas :
+    DB_REPLICA_URLS est ignorée par les routes asynchrones, qui lisent toujours le primaire.
+    """
+    if async_engine is None:
+        raise RuntimeError("Async mode is disabled, set DB_ASYNC=1 to enable it")
+    async with AsyncSession(async_engine, autoflush=False, expire_on_commit=False) as session:
+        yield session
+
 # Il est possible de créer des fonctions utilitaires pour supprimer et recréer la base de données
 # Attention à ne pas essayer de se connecter à la base de données pendant cette opération (DATABASE_URL)
\ No newline at end of file
@@ -1,19 +1,94 @@
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from sqlmodel import SQLModel
+from fastapi.responses import PlainTextResponse
+from sqlmodel import Session
 
 from .routers import global_router
-from .database import engine
+from .compression import COMPRESSION, CompressionMiddleware
+from .database import engine, async_engine, replicas, DB_PROFILE, ENGINE_OPTIONS, ReplicaStickinessMiddleware
+from .metrics import METRICS, MetricsMiddleware, instrument_pool, registry
+from .profiling import PROFILING, SAMPLE_INTERVAL_MS, SAMPLE_SLOW_MS, ProfilingMiddleware, StackSampler, instrument_engine, instrument_routes
+from .schema import ensure_schema
+from .services.commune_index import commune_index
+from .services.shipping_rates import shipping_rates
 from .models import (
     Client,
     Departement,
     Commune
 )
 
-app = FastAPI()
-SQLModel.metadata.drop_all(bind=engine)
-SQLModel.metadata.create_all(bind=engine)
+# Logger d'uvicorn pour que les messages de démarrage apparaissent avec les siens
+logger = logging.getLogger("uvicorn.error")
+
+# verify : vérifie l'empreinte du schéma et crée les tables manquantes, skip : aucun accès BDD
+# La réinitialisation destructive se fait uniquement via `python -m src.cli reset-db`
+DB_STARTUP = os.environ.get("DB_STARTUP", "verify")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info(
+        "Database engine profile '%s' on %s: %s",
+        DB_PROFILE, engine.url.render_as_string(hide_password=True), ENGINE_OPTIONS
+    )
+    if DB_STARTUP == "verify":
+        start = time.perf_counter()
+        up_to_date = ensure_schema(engine)
+        logger.info(
+            "Database schema %s in %.1f ms",
+            "verified" if up_to_date else "updated", (time.perf_counter() - start) * 1000
+        )
+        # Préchargement de l'index des communes (autocomplétion)
+        start = time.perf_counter()
+        with Session(engine) as session:
+            commune_index.load(session)
+        logger.info("Commune index loaded in %.1f ms", (time.perf_counter() - start) * 1000)
+        with Session(engine) as session:
+            shipping_rates.load(session)
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(global_router)
 
+# Lectures GET sur les réplicas (DB_REPLICA_URLS) : les clients venant d'écrire restent un moment sur le primaire
+if replicas.engines:
+    app.add_middleware(ReplicaStickinessMiddleware)
+
+# Compression br/gzip selon Accept-Encoding, ajoutée avant le profilage et les métriques qui mesurent aussi son coût
+if COMPRESSION:
+    app.add_middleware(CompressionMiddleware)
+
+# Server-Timing (temps total, SQL, sérialisation), détection N+1 et échantillonnage des requêtes lentes
+if PROFILING:
+    instrument_engine(engine)
+    for replica in replicas.engines:
+        instrument_engine(replica)
+    if async_engine is not None:
+        instrument_engine(async_engine)
+    instrument_routes(app)
+    app.add_middleware(
+        ProfilingMiddleware,
+        sampler=StackSampler(interval_ms=SAMPLE_INTERVAL_MS) if SAMPLE_SLOW_MS > 0 else None,
+    )
+
+# Latences par route, codes de retour et état du pool de connexions, agrégés entre workers si METRICS_DIR
+if METRICS:
+    instrument_pool(engine)
+    for index, replica in enumerate(replicas.engines):
+        instrument_pool(replica, name=f"replica{index}")
+    if async_engine is not None:
+        instrument_pool(async_engine.sync_engine, name="async")
+    app.add_middleware(MetricsMiddleware, registry=registry)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 def home():
     return {"response": "Hello World!"}
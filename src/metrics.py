@@ -0,0 +1,255 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy import Engine, event
+
+# Métriques Prometheus (/metrics), METRICS=0 pour les désactiver
+METRICS = os.environ.get("METRICS", "1").lower() in ("1", "true", "yes")
+
+# Répertoire partagé par les workers (uvicorn --workers, gunicorn) : chaque processus y écrit son
+# instantané, /metrics les agrège. À vider au démarrage du déploiement, pas par les workers.
+METRICS_DIR = os.environ.get("METRICS_DIR") or None
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "5"))
+
+# Bornes (secondes) des histogrammes de latence
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """Counters, histograms and gauges of the process, rendered in the Prometheus text format.
+
+    Updates are a lock-protected dict operation. With a `directory`, each
+    process flushes its snapshot there every `flush_interval` seconds and
+    `render` sums the counters and histograms of every process; gauges keep
+    a `pid` label and are dropped once their process stops flushing.
+    """
+
+    def __init__(self, directory: str | None = None, flush_interval: float = 5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._meta: dict[str, tuple[str, str]] = {}
+        self._buckets: dict[str, tuple[float, ...]] = {}
+        self._counters: dict[tuple[str, tuple], float] = {}
+        self._histograms: dict[tuple[str, tuple], list] = {}
+        self._gauges: list = []
+        self._flusher: threading.Thread | None = None
+
+    def counter(self, name: str, help: str) -> None:
+        self._meta[name] = ("counter", help)
+
+    def histogram(self, name: str, help: str, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self._meta[name] = ("histogram", help)
+        self._buckets[name] = tuple(sorted(buckets))
+
+    def gauge(self, name: str, help: str, callback) -> None:
+        """Declare a gauge read at collection time: `callback()` returns (labels, value) pairs."""
+        self._meta[name] = ("gauge", help)
+        self._gauges.append((name, callback))
+
+    def inc(self, name: str, labels: tuple = (), amount: float = 1) -> None:
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, labels: tuple = ()) -> None:
+        buckets = self._buckets[name]
+        index = bisect_left(buckets, value)
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # Compteurs par tranche (la dernière pour +Inf), somme, total
+                histogram = self._histograms[key] = [[0] * (len(buckets) + 1), 0.0, 0]
+            histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def snapshot(self) -> dict:
+        """JSON-serializable state of this process, gauges included."""
+        with self._lock:
+            counters = [[name, labels, value] for (name, labels), value in self._counters.items()]
+            histograms = [[name, labels, list(counts), total, count] for (name, labels), (counts, total, count) in self._histograms.items()]
+        gauges = [[name, labels, value] for name, callback in self._gauges for labels, value in callback()]
+        return {"pid": os.getpid(), "time": time.time(), "counters": counters, "histograms": histograms, "gauges": gauges}
+
+    def flush(self) -> None:
+        """Write the snapshot of this process atomically in the shared directory."""
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(self.snapshot(), file)
+        os.replace(f"{path}.tmp", path)
+
+    def start_flusher(self) -> None:
+        if self.directory is None or self._flusher is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(self.flush_interval)
+                self.flush()
+
+        self._flusher = threading.Thread(target=run, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+
+    def _snapshots(self) -> list[dict]:
+        """Live snapshot of this process and the last flushed snapshot of the others."""
+        snapshots = [self.snapshot()]
+        if self.directory is None or not os.path.isdir(self.directory):
+            return snapshots
+        own = f"{os.getpid()}.json"
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json") or filename == own:
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as file:
+                    snapshots.append(json.load(file))
+            except (OSError, ValueError):
+                # Fichier en cours de remplacement ou illisible : ignoré pour cette collecte
+                continue
+        return snapshots
+
+    def render(self) -> str:
+        """Prometheus text exposition of every process."""
+        counters: dict[tuple, float] = {}
+        histograms: dict[tuple, list] = {}
+        gauges: dict[tuple, float] = {}
+        stale_before = time.time() - 3 * self.flush_interval
+        for snapshot in self._snapshots():
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, counts, total, count in snapshot["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                merged = histograms.setdefault(key, [[0] * len(counts), 0.0, 0])
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+                merged[2] += count
+            if snapshot["pid"] == os.getpid() or snapshot["time"] >= stale_before:
+                for name, labels, value in snapshot["gauges"]:
+                    gauges[(name, (("pid", str(snapshot["pid"])),) + tuple(map(tuple, labels)))] = value
+
+        lines = []
+        for name, (kind, help) in self._meta.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                lines.extend(f"{name}{_labels(labels)} {_number(value)}" for (metric, labels), value in sorted(counters.items()) if metric == name)
+            elif kind == "gauge":
+                lines.extend(f"{name}{_labels(labels)} {_number(value)}" for (metric, labels), value in sorted(gauges.items()) if metric == name)
+            else:
+                bounds = [_number(bound) for bound in self._buckets[name]] + ["+Inf"]
+                for (metric, labels), (counts, total, count) in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, bucket in zip(bounds, counts):
+                        cumulative += bucket
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', bound),))} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+                    lines.append(f"{name}_count{_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry(directory=METRICS_DIR, flush_interval=METRICS_FLUSH_INTERVAL)
+registry.counter("http_requests_total", "HTTP requests by method, route template and status code.")
+registry.histogram("http_request_duration_seconds", "HTTP request latency by method and route template, body included.")
+registry.counter("db_pool_connects_total", "New database connections opened by the pool.")
+registry.histogram("db_pool_checkout_seconds", "Time a connection stays checked out of the pool, from checkout to checkin.")
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting the requests and timing them per route template (/api/v1/clients/{client_id})."""
+
+    def __init__(self, app, registry: MetricsRegistry = registry):
+        self.app = app
+        self.registry = registry
+        registry.start_flusher()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Gabarit de la route et non chemin réel, pour borner le nombre de séries
+            route = getattr(scope.get("route"), "path", "unmatched")
+            labels = (("method", scope["method"]), ("route", route))
+            self.registry.inc("http_requests_total", labels + (("status", str(status)),))
+            self.registry.observe("http_request_duration_seconds", time.perf_counter() - start, labels)
+
+
+# Moteurs instrumentés par nom : jauges et écouteurs enregistrés une seule fois par nom
+_pools: dict[str, Engine] = {}
+
+
+def instrument_pool(engine: Engine, name: str = "default", registry: MetricsRegistry = registry) -> None:
+    """Expose the pool state of `engine` as gauges and time how long its connections stay checked out.
+
+    The pool events are listened on the engine, so they keep firing on the
+    pool recreated by `engine.dispose()`, and the gauges read `engine.pool`
+    when collected. SQLAlchemy has no event before a checkout starts waiting:
+    pool pressure shows as checked_out reaching size + overflow, and as long
+    checkout times.
+    """
+    if _pools.get(name) is engine:
+        return
+    if name not in _pools:
+        def stats():
+            pool = _pools[name].pool
+            labels = (("engine", name),)
+            values = []
+            for metric, method in (("size", "size"), ("checked_out", "checkedout"), ("checked_in", "checkedin"), ("overflow", "overflow")):
+                if hasattr(pool, method):
+                    values.append((labels + (("state", metric),), getattr(pool, method)()))
+            return values
+
+        registry.gauge("db_pool_connections", "Connection pool state of each worker (size, checked_out, checked_in, overflow).", stats)
+    _pools[name] = engine
+    labels = (("engine", name),)
+
+    def on_connect(dbapi_connection, connection_record):
+        registry.inc("db_pool_connects_total", labels)
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    def on_checkin(dbapi_connection, connection_record):
+        start = connection_record.info.pop("checked_out_at", None)
+        if start is not None:
+            registry.observe("db_pool_checkout_seconds", time.perf_counter() - start, labels)
+
+    event.listen(engine, "connect", on_connect)
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
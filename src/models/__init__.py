@@ -1,3 +1,13 @@
-from .client import Client, ClientPublic, ClientPost, ClientPatch
+from .client import (
+    Client, ClientPublic, ClientExpanded, ClientPost, ClientPatch, ClientImportError, ClientImportReport, ClientSearchResult,
+    ClientBulkFilter, ClientBulkTarget, ClientBulkPatch, ClientBulkResult, ClientCount, ClientDuplicate, ClientDuplicateReport
+)
+from .client_search import ClientSearchToken
+from .client_points import ClientPoints, ClientPointsPublic
 from .departement import Departement, DepartementPublic, DepartementPost, DepartementPatch
-from .commune import Commune, CommunePublic, CommunePost, CommunePatch
\ No newline at end of file
+from .commune import Commune, CommunePublic, CommunePost, CommunePatch, CommuneExpanded, CommuneSearchResult
+from .objet import Objet, Conditionnement, ObjetCond
+from .commande import Commande, CommandePost, CommandePatch, CommandePublic, Detail, DetailPost, DetailPublic
+from .shipping import Poids, Vignette, ShippingQuoteRequest, ShippingQuote
+from .sales import SalesRollup, SalesRollupBackfill, SalesRollupPublic
+from .bulk import BulkTarget, BulkResult, Count
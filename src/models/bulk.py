@@ -0,0 +1,28 @@
+from pydantic import model_validator
+from sqlmodel import SQLModel, Field
+
+
+class BulkTarget(SQLModel):
+    """Cible d'une opération de masse générique : une liste d'identifiants ou un filtre colonne = valeur."""
+    ids: list[int] | None = Field(default=None, min_length=1)
+    filter: dict[str, str | int | None] | None = None
+    
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Exactly one of 'ids' or 'filter' must be given")
+        if self.filter is not None and not self.criteria():
+            raise ValueError("'filter' needs at least one criterion")
+        return self
+    
+    def criteria(self) -> dict:
+        """Les critères du filtre (colonne -> valeur)."""
+        return self.filter
+
+
+class BulkResult(SQLModel):
+    affected: int
+
+
+class Count(SQLModel):
+    count: int
@@ -1,5 +1,7 @@
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, TYPE_CHECKING
+from .bulk import BulkTarget
+from .commune import CommuneExpanded
 
 if TYPE_CHECKING:
     from .commune import Commune
@@ -24,6 +26,8 @@ class Client(ClientBase, table=True):
     """Table représentant les clients de la fidélisation de la fromagerie."""
     __tablename__ = "t_client"
     client_id: int | None = Field(default=None, primary_key=True)
+    # Incrémentée à chaque modification, sert d'ETag
+    version: int = Field(default=1, nullable=False, sa_column_kwargs={"server_default": "1"})
     commune: Optional["Commune"] = Relationship(back_populates="clients")
     
     
@@ -38,4 +42,71 @@ class ClientPatch(ClientBase):
     
     
 class ClientPublic(ClientBase):
-    client_id: int
\ No newline at end of file
+    client_id: int
+    version: int | None = None
+
+class ClientExpanded(ClientPublic):
+    commune: CommuneExpanded | None = None
+
+
+class ClientBulkFilter(SQLModel):
+    """Critères des opérations de masse (combinés par ET)."""
+    newsletter: int | None = None
+    commune_id: int | None = None
+    gender: str | None = None
+
+
+class ClientBulkTarget(BulkTarget):
+    """Cible d'une opération de masse : une liste d'identifiants ou un filtre."""
+    filter: ClientBulkFilter | None = None
+    
+    def criteria(self) -> dict:
+        return self.filter.model_dump(exclude_none=True)
+
+
+class ClientBulkPatch(ClientBulkTarget):
+    data: ClientPatch
+
+
+class ClientBulkResult(SQLModel):
+    affected: int
+
+
+class ClientCount(SQLModel):
+    count: int
+    approximate: bool = False
+
+
+class ClientImportError(SQLModel):
+    line: int
+    error: str
+
+
+class ClientImportReport(SQLModel):
+    inserted: int = 0
+    failed: int = 0
+    errors: list[ClientImportError] = []
+
+
+class ClientSearchResult(ClientPublic):
+    score: float
+
+
+class ClientDuplicate(SQLModel):
+    """Paire de clients candidate à la fusion, avec son score (0 à 1) et les critères concordants."""
+    client_id: int
+    duplicate_id: int
+    score: float
+    reasons: list[str] = []
+
+
+class ClientDuplicateReport(SQLModel):
+    """Bilan d'une détection de doublons : volumes traités, débit et candidats retenus."""
+    scanned: int = 0
+    blocks: int = 0
+    skipped_blocks: int = 0
+    pairs: int = 0
+    found: int = 0
+    elapsed_ms: float = 0.0
+    rows_per_second: float = 0.0
+    candidates: list[ClientDuplicate] = []
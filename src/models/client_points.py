@@ -0,0 +1,13 @@
+from sqlmodel import SQLModel, Field
+
+
+class ClientPoints(SQLModel, table=True):
+    """Solde de points de fidélité par client, tenu à jour à chaque écriture de commande."""
+    __tablename__ = "t_client_points"
+    client_id: int = Field(foreign_key="t_client.client_id", primary_key=True)
+    points: int = Field(default=0, nullable=False)
+
+
+class ClientPointsPublic(SQLModel):
+    client_id: int
+    points: int
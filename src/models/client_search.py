@@ -0,0 +1,8 @@
+from sqlmodel import SQLModel, Field
+
+
+class ClientSearchToken(SQLModel, table=True):
+    """Table d'index n-grammes (trigrammes) des clients pour la recherche partielle."""
+    __tablename__ = "t_client_search"
+    gram: str = Field(max_length=3, primary_key=True)
+    client_id: int = Field(foreign_key="t_client.client_id", primary_key=True, index=True, ondelete="CASCADE")
@@ -0,0 +1,81 @@
+from datetime import date
+from decimal import Decimal
+from sqlmodel import SQLModel, Field, Relationship
+from typing import Optional
+
+
+class CommandeBase(SQLModel):
+    """Schema de base représentant l'en-tête des commandes passées par les clients."""
+    datcde: date | None = Field(default=None, nullable=True)
+    codcli: int | None = Field(default=None, foreign_key="t_client.client_id", index=True, nullable=True)
+    timbrecli: Decimal | None = Field(default=None, max_digits=10, decimal_places=4, nullable=True)
+    timbrecde: Decimal | None = Field(default=None, max_digits=10, decimal_places=4, nullable=True)
+    nbcolis: int = Field(default=1)
+    cheqcli: Decimal | None = Field(default=None, max_digits=10, decimal_places=4, nullable=True)
+    idcondit: int = Field(default=0)
+    cdeComt: str | None = Field(default=None, max_length=255, nullable=True)
+    barchive: int = Field(default=0)
+    bstock: int = Field(default=0)
+
+
+class Commande(CommandeBase, table=True):
+    """Table représentant les commandes passées par les clients."""
+    __tablename__ = "t_entcde"
+    codcde: int | None = Field(default=None, primary_key=True)
+    # Département sous lequel la commande est comptée dans t_sales_rollup (0 : inconnu)
+    departement_id: int | None = Field(default=None, nullable=True)
+    lignes: list["Detail"] = Relationship(back_populates="commande")
+
+
+class DetailBase(SQLModel):
+    """Schema de base représentant une ligne de commande."""
+    codobj: int | None = Field(default=None, foreign_key="t_objet.codobj", nullable=True)
+    qte: int = Field(default=1)
+    colis: int = Field(default=1)
+    commentaire: str | None = Field(default=None, max_length=100, nullable=True)
+
+
+class Detail(DetailBase, table=True):
+    """Table représentant les détails des commandes."""
+    __tablename__ = "t_dtlcode"
+    id: int | None = Field(default=None, primary_key=True)
+    codcde: int | None = Field(default=None, foreign_key="t_entcde.codcde", index=True, nullable=True)
+    commande: Optional[Commande] = Relationship(back_populates="lignes")
+
+
+class DetailPost(DetailBase):
+    codobj: int
+    qte: int = Field(default=1, ge=1)
+    colis: int = Field(default=1, ge=1)
+
+
+class DetailPublic(DetailBase):
+    id: int
+    codcde: int
+
+
+class CommandePost(SQLModel):
+    """Saisie d'une commande : l'en-tête et toutes ses lignes."""
+    codcli: int
+    datcde: date | None = None
+    nbcolis: int = Field(default=1, ge=1)
+    cheqcli: Decimal | None = Field(default=None, max_digits=10, decimal_places=4)
+    cdeComt: str | None = Field(default=None, max_length=255)
+    lignes: list[DetailPost] = Field(min_length=1)
+
+
+class CommandePatch(SQLModel):
+    """Modification d'une commande : champs d'en-tête et, si fournies, remplacement de toutes les lignes."""
+    datcde: date | None = None
+    nbcolis: int | None = Field(default=None, ge=1)
+    cheqcli: Decimal | None = Field(default=None, max_digits=10, decimal_places=4)
+    cdeComt: str | None = Field(default=None, max_length=255)
+    lignes: list[DetailPost] | None = Field(default=None, min_length=1)
+
+
+class CommandePublic(CommandeBase):
+    codcde: int
+    lignes: list[DetailPublic] = []
+    # Calculés depuis le catalogue, non stockés
+    montant: Decimal | None = None
+    poids: Decimal | None = None
@@ -1,5 +1,6 @@
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, TYPE_CHECKING
+from .departement import DepartementPublic
 
 if TYPE_CHECKING:
     from .client import Client
@@ -31,4 +32,12 @@ class CommunePatch(CommuneBase):
     
     
 class CommunePublic(CommuneBase):
-    id: int
\ No newline at end of file
+    id: int
+
+class CommuneExpanded(CommunePublic):
+    departement: DepartementPublic | None = None
+
+
+class CommuneSearchResult(CommunePublic):
+    department_code: str | None = None
+    department_name: str | None = None
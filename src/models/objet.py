@@ -0,0 +1,42 @@
+from decimal import Decimal
+from sqlmodel import SQLModel, Field, Relationship
+
+
+class Conditionnement(SQLModel, table=True):
+    """Table représentant les conditionnements disponibles pour les objets."""
+    __tablename__ = "t_conditionnement"
+    idcondit: int | None = Field(default=None, primary_key=True)
+    libcondit: str | None = Field(default=None, max_length=50, nullable=True)
+    poidscondit: int | None = Field(default=None, nullable=True)
+    prixcond: Decimal = Field(default=Decimal("0.0000"), max_digits=10, decimal_places=4, nullable=False)
+    ordreimp: int | None = Field(default=None, nullable=True)
+    objets: list["ObjetCond"] = Relationship(back_populates="condit")
+
+
+class Objet(SQLModel, table=True):
+    """Table représentant les objets disponibles dans la fromagerie."""
+    __tablename__ = "t_objet"
+    codobj: int | None = Field(default=None, primary_key=True)
+    libobj: str | None = Field(default=None, max_length=50, nullable=True)
+    tailleobj: str | None = Field(default=None, max_length=50, nullable=True)
+    puobj: Decimal = Field(default=Decimal("0.0000"), max_digits=10, decimal_places=4, nullable=False)
+    poidsobj: Decimal = Field(default=Decimal("0.0000"), max_digits=10, decimal_places=4, nullable=False)
+    indispobj: int = Field(default=0)
+    o_imp: int = Field(default=0)
+    o_aff: int = Field(default=0)
+    o_cartp: int = Field(default=0)
+    points: int = Field(default=0)
+    o_ordre_aff: int = Field(default=0)
+    condit: list["ObjetCond"] = Relationship(back_populates="objets")
+
+
+class ObjetCond(SQLModel, table=True):
+    """Table représentant la relation entre les objets et les conditionnements (par tranche de quantité)."""
+    __tablename__ = "t_rel_cond"
+    idrelcond: int | None = Field(default=None, primary_key=True, index=True)
+    qteobjdeb: int = Field(default=0)
+    qteobjfin: int = Field(default=0)
+    codobj: int | None = Field(default=None, foreign_key="t_objet.codobj", index=True, nullable=True)
+    codcond: int | None = Field(default=None, foreign_key="t_conditionnement.idcondit", nullable=True)
+    objets: Objet | None = Relationship(back_populates="condit")
+    condit: Conditionnement | None = Relationship(back_populates="objets")
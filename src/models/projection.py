@@ -0,0 +1,39 @@
+from functools import lru_cache
+
+from pydantic import BaseModel, TypeAdapter, create_model
+
+
+@lru_cache(maxsize=256)
+def projection_model(base: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    """Build (once per field set) a response model restricted to `fields` of `base`."""
+    definitions = {}
+    for name in fields:
+        field = base.model_fields[name]
+        definitions[name] = (field.annotation, ... if field.is_required() else field.default)
+    return create_model(f"{base.__name__}[{','.join(fields)}]", **definitions)
+
+
+@lru_cache(maxsize=256)
+def projection_list_adapter(base: type[BaseModel], fields: tuple[str, ...]) -> TypeAdapter:
+    """Cached TypeAdapter validating a list of projected rows."""
+    return TypeAdapter(list[projection_model(base, fields)])
+
+
+def parse_fields(base: type[BaseModel], fields: str | None, required: tuple[str, ...] = ()) -> tuple[str, ...] | None:
+    """Parse a comma separated `fields` parameter into a canonical tuple (model field order).
+    
+    Args:
+        base (type[BaseModel]): The public schema the fields are taken from.
+        fields (str | None): The requested fields, or None for every field.
+        required (tuple[str, ...]): Fields always included (e.g. the primary key).
+    
+    Raises:
+        ValueError: If a field does not exist in `base`.
+    """
+    if not fields:
+        return None
+    requested = {part.strip() for part in fields.split(",") if part.strip()} | set(required)
+    unknown = requested - set(base.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown fields {sorted(unknown)}, expected any of {list(base.model_fields)}")
+    return tuple(name for name in base.model_fields if name in requested)
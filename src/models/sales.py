@@ -0,0 +1,33 @@
+from datetime import date
+from decimal import Decimal
+from sqlmodel import SQLModel, Field
+
+
+class SalesRollup(SQLModel, table=True):
+    """Chiffre d'affaires et nombre de commandes par département et par mois, tenus à jour à chaque écriture de commande."""
+    __tablename__ = "t_sales_rollup"
+    # 0 : client sans commune ou commune sans département
+    departement_id: int = Field(primary_key=True)
+    # Premier jour du mois
+    month: date = Field(primary_key=True, index=True)
+    revenue: Decimal = Field(default=Decimal("0"), max_digits=14, decimal_places=4)
+    orders: int = Field(default=0)
+
+
+class SalesRollupBackfill(SQLModel, table=True):
+    """Avancement d'une reconstruction de t_sales_rollup, présent seulement pendant celle-ci."""
+    __tablename__ = "t_sales_rollup_backfill"
+    id: int = Field(default=1, primary_key=True)
+    # Dernière commande (codcde) à agréger
+    until: int
+    # Dernière commande déjà agrégée : les commandes entre done et until ne sont pas encore comptées
+    done: int = 0
+
+
+class SalesRollupPublic(SQLModel):
+    departement_id: int | None = None
+    department_code: str | None = None
+    department_name: str | None = None
+    month: date | None = None
+    revenue: Decimal
+    orders: int
@@ -0,0 +1,42 @@
+from decimal import Decimal
+from pydantic import model_validator
+from sqlmodel import SQLModel, Field
+
+
+class Poids(SQLModel, table=True):
+    """Table représentant les poids et timbres associés aux commandes."""
+    __tablename__ = "t_poids"
+    id: int | None = Field(default=None, primary_key=True)
+    valmin: Decimal | None = Field(default=Decimal("0"), max_digits=10, decimal_places=4, nullable=True)
+    valtimbre: Decimal | None = Field(default=Decimal("0"), max_digits=10, decimal_places=4, nullable=True)
+
+
+class Vignette(SQLModel, table=True):
+    """Table représentant les vignettes (timbre) avec leurs prix pour un certain poids."""
+    __tablename__ = "t_poidsv"
+    id: int | None = Field(default=None, primary_key=True)
+    valmin: Decimal | None = Field(default=Decimal("0"), max_digits=10, decimal_places=4, nullable=True)
+    valtimbre: Decimal | None = Field(default=Decimal("0"), max_digits=10, decimal_places=4, nullable=True)
+
+
+class ShippingQuoteRequest(SQLModel):
+    """Lot à chiffrer : des commandes existantes ou des poids bruts."""
+    order_ids: list[int] | None = Field(default=None, min_length=1, max_length=10000)
+    weights: list[Decimal] | None = Field(default=None, min_length=1, max_length=10000)
+    # Enregistre timbrecde/timbrecli sur les commandes chiffrées
+    update: bool = False
+    
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.order_ids is None) == (self.weights is None):
+            raise ValueError("Exactly one of 'order_ids' or 'weights' must be given")
+        if self.update and self.order_ids is None:
+            raise ValueError("'update' needs 'order_ids'")
+        return self
+
+
+class ShippingQuote(SQLModel):
+    codcde: int | None = None
+    poids: Decimal
+    timbrecde: Decimal | None = None
+    timbrecli: Decimal | None = None
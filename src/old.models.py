@@ -1,90 +1,5 @@
-from sqlmodel import SQLModel, Field, Relationship
-from typing import List
+from sqlmodel import SQLModel, Field
 from datetime import date
-from decimal import Decimal
-
-class Commande(SQLModel, table=True):
-    """Table représentant les commandes passées par les clients."""
-    
-    __tablename__ = "t_entcde"
-    
-    codcde: int | None = Field(default=None, primary_key=True)
-    datcde: date | None = Field(default=None, nullable=True)
-    codcli: int | None = Field(default=None, foreign_key="t_client.codcli", nullable=True)
-    timbrecli: float | None = Field(default=None, nullable=True)
-    timbrecde: float | None = Field(default=None, nullable=True)
-    nbcolis: int = Field(default=1)
-    cheqcli: float | None = Field(default=None, nullable=True)
-    idcondit: int = Field(default=0)
-    cdeComt: str | None = Field(default=None, max_length=255, nullable=True)
-    barchive: int = Field(default=0)
-    bstock: int = Field(default=0)
-
-class Conditionnement(SQLModel, table=True):
-    """Table représentant les conditionnements disponibles pour les objets."""
-
-    __tablename__ = "t_conditionnement"
-    
-    idcondit: int | None = Field(default=None, primary_key=True)
-    libcondit: str | None = Field(default=None, max_length=50, nullable=True)
-    poidscondit: int | None = Field(default=None, nullable=True)
-    prixcond: Decimal = Field(default=Decimal("0.0000"), nullable=False)
-    ordreimp: int | None = Field(default=None, nullable=True)
-    
-    objets: List["ObjetCond"] = Relationship(back_populates="condit")
-
-class Objet(SQLModel, table=True):
-    """Table représentant les objets disponibles dans la fromagerie."""
-    
-    __tablename__ = "t_objet"
-    
-    codobj: int | None = Field(default=None, primary_key=True)
-    libobj: str | None = Field(default=None, max_length=50, nullable=True)
-    tailleobj: str | None = Field(default=None, max_length=50, nullable=True)
-    puobj: Decimal = Field(default=Decimal("0.0000"), nullable=False)
-    poidsobj: Decimal = Field(default=Decimal("0.0000"), nullable=False)
-    indispobj: int = Field(default=0)
-    o_imp: int = Field(default=0)
-    o_aff: int = Field(default=0)
-    o_cartp: int = Field(default=0)
-    points: int = Field(default=0)
-    o_ordre_aff: int = Field(default=0)
-    
-    condit: List["ObjetCond"] = Relationship(back_populates="objets")
-
-class ObjetCond(SQLModel, table=True):
-    """Table représentant la relation entre les objets et les conditionnements."""
-    
-    __tablename__ = "t_rel_cond"
-    
-    idrelcond: int | None = Field(default=None, primary_key=True, index=True)
-    qteobjdeb: int = Field(default=0)
-    qteobjfin: int = Field(default=0)
-    codobj: int | None = Field(default=None, foreign_key="t_objet.codobj", nullable=True)
-    codcond: int | None = Field(default=None, foreign_key="t_conditionnement.idcondit", nullable=True)
-    
-    objets: Objet | None = Relationship(back_populates="condit")
-    condit: Conditionnement | None = Relationship(back_populates="objets")
-
-class Detail(SQLModel, table=True):
-    """Table représentant les détails des commandes."""
-    
-    __tablename__ = "t_dtlcode"
-    
-    id: int | None = Field(default=None, primary_key=True) 
-    codcde: int | None = Field(default=None, foreign_key="t_entcde.codcde", index=True, nullable=True)
-    qte: int = Field(default=1)
-    colis: int = Field(default=1)
-    commentaire: str | None = Field(default=None, max_length=100, nullable=True)
-
-class DetailObjet(SQLModel, table=True):
-    """Table représentant les détails des objets associés aux commandes."""
-    
-    __tablename__ = "t_dtlcode_codobj"
-    
-    id: int | None = Field(default=None, primary_key=True)
-    detail_id: int | None = Field(default=None, foreign_key="t_dtlcode.id", nullable=True)
-    objet_id: int | None = Field(default=None, foreign_key="t_objet.codobj", nullable=True)
 
 class Enseigne(SQLModel, table=True):
     """Table représentant les enseignes que la société travaille avec."""
@@ -96,25 +11,6 @@ class Enseigne(SQLModel, table=True):
     ville_enseigne: str | None = Field(default=None, max_length=50, nullable=True)
     dept_enseigne: int = Field(default=0)
 
-class Poids(SQLModel, table=True):
-    """Table représentant les poids et timbres associés aux commandes."""
-    
-    __tablename__ = "t_poids"
-    
-    id: int | None = Field(default=None, primary_key=True)
-    valmin: Decimal | None = Field(default=Decimal("0"), nullable=True)
-    valtimbre: Decimal | None = Field(default=Decimal("0"), nullable=True)
-    
-class Vignette(SQLModel, table=True):
-    """Table représentant les vignettes (timbre) avec leurs prix pour un certain poids."""
-    
-    __tablename__ = "t_poidsv"
-    
-    id: int | None = Field(default=None, primary_key=True)
-    valmin: Decimal | None = Field(default=Decimal("0"), nullable=True)
-    valtimbre: Decimal | None = Field(default=Decimal("0"), nullable=True)
-
-
 class Role(SQLModel, table=True):
     """Table représentant les rôles dans le système."""
     
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger("uvicorn.error")
+
+# Profilage des requêtes (en-tête Server-Timing), PROFILING=1 pour l'activer : désactivé par défaut,
+# l'en-tête expose les temps SQL à tout client et chaque requête SQL paie deux hooks d'événements
+PROFILING = os.environ.get("PROFILING", "0").lower() in ("1", "true", "yes")
+
+# Une même requête SQL répétée au moins autant de fois dans une requête HTTP la signale comme N+1
+NPLUS1_THRESHOLD = int(os.environ.get("PROFILING_NPLUS1_THRESHOLD", "10"))
+
+# Échantillonneur de piles, activé si PROFILING_SAMPLE_SLOW_MS > 0 : les requêtes plus lentes
+# sont écrites au format "folded" (flamegraph.pl, speedscope) dans PROFILING_DIR
+SAMPLE_SLOW_MS = float(os.environ.get("PROFILING_SAMPLE_SLOW_MS", "0"))
+SAMPLE_INTERVAL_MS = float(os.environ.get("PROFILING_SAMPLE_INTERVAL_MS", "5"))
+PROFILING_DIR = os.environ.get("PROFILING_DIR", "profiles")
+
+
+class RequestProfile:
+    """Timings and SQL statements of one HTTP request."""
+
+    __slots__ = ("start", "endpoint_end", "sql_count", "sql_time", "statements", "threads")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.endpoint_end: float | None = None
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.statements: Counter[str] = Counter()
+        # Threads ayant travaillé pour la requête (boucle d'événements, threadpool des routes synchrones)
+        self.threads = {threading.get_ident()}
+
+    def add_query(self, statement: str, duration: float) -> None:
+        self.sql_count += 1
+        self.sql_time += duration
+        self.statements[statement] += 1
+        self.threads.add(threading.get_ident())
+
+    def nplus1_suspect(self) -> tuple[str, int] | None:
+        """The most repeated statement and its count, if it crosses NPLUS1_THRESHOLD."""
+        if not self.statements:
+            return None
+        statement, count = self.statements.most_common(1)[0]
+        return (statement, count) if count >= NPLUS1_THRESHOLD else None
+
+    def server_timing(self, now: float) -> str:
+        """Server-Timing header value: total, database and serialization durations in ms."""
+        metrics = [
+            f"app;dur={(now - self.start) * 1000:.2f}",
+            f'db;dur={self.sql_time * 1000:.2f};desc="{self.sql_count} queries"',
+        ]
+        if self.endpoint_end is not None:
+            metrics.append(f"serialize;dur={(now - self.endpoint_end) * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+current_profile: ContextVar[RequestProfile | None] = ContextVar("current_profile", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and current_profile.get() is not None:
+        context._profiling_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    start = getattr(context, "_profiling_start", None)
+    if profile is not None and start is not None:
+        profile.add_query(statement, time.perf_counter() - start)
+
+
+def instrument_engine(engine: Engine | AsyncEngine) -> None:
+    """Count the statements and database time of the current request on `engine` (idempotent)."""
+    if isinstance(engine, AsyncEngine):
+        engine = engine.sync_engine
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _endpoint_done() -> None:
+    profile = current_profile.get()
+    if profile is not None:
+        profile.endpoint_end = time.perf_counter()
+        profile.threads.add(threading.get_ident())
+
+
+def _timed(call):
+    """Wrap an endpoint to record when it returns, the rest until the response start being serialization."""
+    if asyncio.iscoroutinefunction(call):
+        @wraps(call)
+        async def endpoint(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                _endpoint_done()
+    else:
+        # Reste synchrone : FastAPI continue de l'exécuter dans le threadpool
+        @wraps(call)
+        def endpoint(*args, **kwargs):
+            try:
+                return call(*args, **kwargs)
+            finally:
+                _endpoint_done()
+    endpoint._profiled = True
+    return endpoint
+
+
+def instrument_routes(app: FastAPI) -> None:
+    """Time the endpoints of every API route of `app`, once its routers are included."""
+    for route in app.routes:
+        if isinstance(route, APIRoute) and not getattr(route.dependant.call, "_profiled", False):
+            route.dependant.call = _timed(route.dependant.call)
+
+
+def _fold(frame) -> str:
+    """Stack of `frame` in folded format: root first, frames separated by semicolons."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """Samples the Python stacks of every thread while requests are in flight.
+
+    Samples are kept in a bounded ring buffer; the stacks of a slow request are
+    the samples of its threads taken between its start and end.
+    """
+
+    def __init__(self, interval_ms: float = 5.0, max_samples: int = 200_000):
+        self.interval = interval_ms / 1000
+        self.samples: deque[tuple[float, int, str]] = deque(maxlen=max_samples)
+        self._active = 0
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while True:
+            time.sleep(self.interval)
+            if not self._active:
+                continue
+            now = time.perf_counter()
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self.samples.append((now, ident, _fold(frame)))
+
+    def begin(self) -> None:
+        with self._lock:
+            self._active += 1
+
+    def end(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    def collect(self, start: float, end: float, threads: set[int]) -> Counter[str]:
+        """Folded stacks sampled on `threads` between `start` and `end`, with their count."""
+        return Counter(stack for at, ident, stack in list(self.samples) if start <= at <= end and ident in threads)
+
+    def dump(self, stacks: Counter[str], name: str) -> str:
+        """Write `stacks` as a .folded file in PROFILING_DIR and return its path."""
+        os.makedirs(PROFILING_DIR, exist_ok=True)
+        path = os.path.join(PROFILING_DIR, f"{datetime.now():%Y%m%d-%H%M%S-%f}-{name}.folded")
+        with open(path, "w") as file:
+            file.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        return path
+
+
+class ProfilingMiddleware:
+    """ASGI middleware adding a Server-Timing header to every response.
+
+    The header gives the time until the response starts (`app`), the SQL
+    statement count and database time (`db`) and the serialization time
+    (`serialize`). Requests repeating a statement NPLUS1_THRESHOLD times are
+    flagged with an `X-NPlus1-Suspect` header and a warning.
+    """
+
+    def __init__(self, app, sampler: StackSampler | None = None):
+        self.app = app
+        self.sampler = sampler
+        if sampler is not None:
+            sampler.start()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", profile.server_timing(time.perf_counter()))
+                suspect = profile.nplus1_suspect()
+                if suspect is not None:
+                    statement, count = suspect
+                    headers.append("X-NPlus1-Suspect", str(count))
+                    logger.warning(
+                        "N+1 suspect on %s %s: %d statements, repeated %d times: %s",
+                        scope["method"], scope["path"], profile.sql_count, count, " ".join(statement.split())[:200]
+                    )
+            await send(message)
+
+        if self.sampler is not None:
+            self.sampler.begin()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_profile.reset(token)
+            if self.sampler is not None:
+                self.sampler.end()
+                self._dump_if_slow(scope, profile)
+
+    def _dump_if_slow(self, scope, profile: RequestProfile) -> None:
+        end = time.perf_counter()
+        elapsed_ms = (end - profile.start) * 1000
+        if elapsed_ms < SAMPLE_SLOW_MS:
+            return
+        stacks = self.sampler.collect(profile.start, end, profile.threads)
+        if stacks:
+            name = f"{scope['method']}{scope['path']}".replace("/", "_")
+            path = self.sampler.dump(stacks, name)
+            logger.warning("Slow request %s %s (%.0f ms), stacks written to %s", scope["method"], scope["path"], elapsed_ms, path)
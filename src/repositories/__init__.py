@@ -1 +1,10 @@
-from .client_repository import ClientRepository
\ No newline at end of file
+from .client_repository import ClientRepository
+from .client_search_repository import ClientSearchRepository
+from .client_points_repository import ClientPointsRepository
+from .sales_rollup_repository import SalesRollupRepository
+from .client_async_repository import AsyncClientRepository
+from .commune_repository import CommuneRepository
+from .objet_repository import ObjetRepository
+from .commande_repository import CommandeRepository
+from .shipping_repository import ShippingRepository
+from .crud_repository import CrudRepository
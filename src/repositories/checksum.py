@@ -0,0 +1,27 @@
+import zlib
+
+from sqlalchemy import func
+from sqlmodel import Session, SQLModel, select
+
+
+def table_checksum(model: type[SQLModel], columns: list, session: Session) -> tuple[int, int]:
+    """Row count and order-independent checksum of the values of `columns`.
+
+    Unlike a count and max(id), the checksum changes when a row is updated in
+    place. MySQL computes it server side (sum of the CRC32 of each row); other
+    dialects read the columns and hash them here.
+
+    Args:
+        model (type[SQLModel]): The table model.
+        columns (list): The columns of `model` covered by the checksum.
+        session (Session): The database session.
+    """
+    if session.get_bind().dialect.name == "mysql":
+        row = func.crc32(func.concat_ws("|", *columns))
+        count, total = session.exec(select(func.count(), func.coalesce(func.sum(row), 0)).select_from(model)).one()
+        return count, int(total)
+    count, total = 0, 0
+    for values in session.exec(select(*columns)):
+        count += 1
+        total += zlib.crc32("|".join(str(value) for value in values if value is not None).encode())
+    return count, total
@@ -0,0 +1,126 @@
+from sqlalchemy import delete, exists, func, insert, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .client_repository import ClientRepository
+from .client_search_repository import ClientSearchRepository, SEARCH_FIELDS
+from ..models import Client, ClientPoints, ClientSearchToken, Commande
+
+
+class AsyncClientRepository:
+    """Asynchronous counterpart of ClientRepository, used when DB_ASYNC is enabled."""
+    
+    @staticmethod
+    async def _index(client_id: int, values: dict, session: AsyncSession) -> None:
+        rows = ClientSearchRepository.token_rows(client_id, values)
+        if rows:
+            await session.exec(insert(ClientSearchToken), params=rows)
+    
+    @staticmethod
+    async def _unindex(client_id: int, session: AsyncSession) -> None:
+        await session.exec(delete(ClientSearchToken).where(ClientSearchToken.client_id == client_id))
+    
+    @staticmethod
+    async def get_all(limit: int, offset: int, session: AsyncSession, order_by: str = "client_id", expand: frozenset = frozenset()):
+        statement = (
+            select(Client)
+            .options(*ClientRepository._load_options(expand))
+            .order_by(*ClientRepository._order_by(order_by))
+            .offset(offset)
+            .limit(limit)
+        )
+        clients = (await session.exec(statement)).all()
+        return clients
+    
+    @staticmethod
+    async def get_after(limit: int, after: tuple, session: AsyncSession, order_by: str = "client_id", expand: frozenset = frozenset()):
+        statement = (
+            select(Client)
+            .options(*ClientRepository._load_options(expand))
+            .where(ClientRepository._after(after, order_by))
+            .order_by(*ClientRepository._order_by(order_by))
+            .limit(limit)
+        )
+        clients = (await session.exec(statement)).all()
+        return clients
+    
+    @staticmethod
+    async def get_rows(
+        limit: int,
+        session: AsyncSession,
+        offset: int = 0,
+        after: tuple | None = None,
+        order_by: str = "client_id",
+        columns: tuple[str, ...] | None = None,
+    ) -> list[dict]:
+        statement = ClientRepository._rows_statement(limit, offset=offset, after=after, order_by=order_by, columns=columns)
+        return [dict(row) for row in (await session.exec(statement)).mappings()]
+    
+    @staticmethod
+    async def get_row(id: int, session: AsyncSession, columns: tuple[str, ...]) -> dict | None:
+        table = Client.__table__
+        statement = select(*[table.c[name] for name in columns]).where(table.c.client_id == id)
+        row = (await session.exec(statement)).mappings().first()
+        return dict(row) if row else None
+    
+    @staticmethod
+    async def get_by_id(id: int, session: AsyncSession, expand: frozenset = frozenset()):
+        if expand:
+            statement = select(Client).options(*ClientRepository._load_options(expand)).where(Client.client_id == id)
+            return (await session.exec(statement)).first()
+        return await session.get(Client, id)
+    
+    @staticmethod
+    async def create(data: dict, session: AsyncSession):
+        new_client = Client(**data)
+        session.add(new_client)
+        await session.flush()
+        await AsyncClientRepository._index(new_client.client_id, data, session)
+        await session.commit()
+        await session.refresh(new_client)
+        return new_client
+    
+    @staticmethod
+    async def patch(id: int, data: dict, session: AsyncSession):
+        """Same single-statement UPDATE ... RETURNING as ClientRepository.patch."""
+        if not data:
+            return await session.get(Client, id)
+        
+        table = Client.__table__
+        statement = update(table).where(table.c.client_id == id).values(**data, version=table.c.version + 1)
+        if session.bind.dialect.update_returning:
+            row = (await session.exec(statement.returning(*table.columns))).first()
+        else:
+            result = await session.exec(statement)
+            row = (await session.exec(select(*table.columns).where(table.c.client_id == id))).first() if result.rowcount else None
+        if row is None:
+            await session.rollback()
+            return None
+        
+        if any(field in data for field in SEARCH_FIELDS):
+            await AsyncClientRepository._unindex(id, session)
+            await AsyncClientRepository._index(id, row._mapping, session)
+        await session.commit()
+        return Client(**row._mapping)
+    
+    @staticmethod
+    async def delete(id: int, session: AsyncSession) -> bool:
+        """Delete a client with its search tokens and points balance.
+        
+        Raises:
+            ValueError: If the client still has orders.
+        """
+        client = await session.get(Client, id)
+        if not client:
+            return False
+        if (await session.exec(select(exists().where(Commande.codcli == id)))).one():
+            raise ValueError(f"Client with ID {id} still has orders")
+        await AsyncClientRepository._unindex(id, session)
+        await session.exec(delete(ClientPoints).where(ClientPoints.client_id == id))
+        await session.delete(client)
+        await session.commit()
+        return True
+
+    
+    @staticmethod
+    async def count(session: AsyncSession) -> int:
+        return (await session.exec(select(func.count()).select_from(Client))).one()
\ No newline at end of file
@@ -0,0 +1,47 @@
+from sqlalchemy import delete, func, insert
+from sqlmodel import Session, select
+from ..models import ClientPoints, Commande, Detail, Objet
+from .upsert import add_or_insert
+
+
+class ClientPointsRepository:
+    """Maintains the t_client_points balances.
+    
+    The write helpers do not commit: they are called by CommandeRepository and
+    ClientRepository inside the transaction of the write they follow.
+    """
+    
+    @staticmethod
+    def add(client_id: int, delta: int, session: Session) -> None:
+        """Add `delta` points to the balance of a client, creating the balance if needed (one upsert)."""
+        if not delta or client_id is None:
+            return
+        add_or_insert(ClientPoints.__table__, ("client_id",), [{"client_id": client_id, "points": delta}], session)
+    
+    @staticmethod
+    def delete(client_ids: list[int], session: Session) -> None:
+        session.execute(delete(ClientPoints).where(ClientPoints.client_id.in_(client_ids)))
+    
+    @staticmethod
+    def get(client_id: int, session: Session) -> int | None:
+        """Balance of a client: a primary key lookup, whatever the order history."""
+        return session.exec(select(ClientPoints.points).where(ClientPoints.client_id == client_id)).first()
+    
+    @staticmethod
+    def rebuild(session: Session) -> int:
+        """Recompute every balance from the orders with one set-based INSERT ... SELECT.
+        
+        Returns:
+            int: The number of clients with a balance.
+        """
+        totals = (
+            select(Commande.codcli, func.sum(Detail.qte * Objet.points))
+            .join(Detail, Detail.codcde == Commande.codcde)
+            .join(Objet, Objet.codobj == Detail.codobj)
+            .where(Commande.codcli.is_not(None))
+            .group_by(Commande.codcli)
+        )
+        session.execute(delete(ClientPoints))
+        session.execute(insert(ClientPoints).from_select(["client_id", "points"], totals))
+        session.commit()
+        return session.exec(select(func.count()).select_from(ClientPoints)).one()
@@ -1,19 +1,140 @@
-from sqlmodel import Session, select
+from sqlalchemy import delete, exists, func, insert, text, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select, or_, and_
 from .abstract_repository import AbstractRepository
-from ..models import Client
+from .client_search_repository import ClientSearchRepository, SEARCH_FIELDS
+from .client_points_repository import ClientPointsRepository
+from ..models import Client, ClientSearchToken, Commande, Commune
 
 class ClientRepository(AbstractRepository):
     """Repository for managing Client entities in the database."""
 
     @staticmethod
-    def get_all(limit: int, session: Session):
-        statement = select(Client).limit(limit)
+    def _order_by(order_by: str):
+        if order_by == "lastname":
+            # Utilise l'index sur lastname, client_id départage les homonymes
+            return (Client.lastname, Client.client_id)
+        return (Client.client_id,)
+    
+    @staticmethod
+    def _load_options(expand: frozenset) -> list:
+        """Eager loading of the expanded relations: one extra SELECT ... IN per relation, whatever the page size."""
+        if "departement" in expand:
+            return [selectinload(Client.commune).selectinload(Commune.departement)]
+        if "commune" in expand:
+            return [selectinload(Client.commune)]
+        return []
+    
+    @staticmethod
+    def get_all(limit: int, offset: int, session: Session, order_by: str = "client_id", expand: frozenset = frozenset()):
+        statement = (
+            select(Client)
+            .options(*ClientRepository._load_options(expand))
+            .order_by(*ClientRepository._order_by(order_by))
+            .offset(offset)
+            .limit(limit)
+        )
         clients = session.exec(statement).all()
         return clients
     
     @staticmethod
-    def get_by_id(id: int, session: Session):
-        statement = select(Client).where(Client.client_id == id)
+    def _after(after: tuple, order_by: str):
+        if order_by == "lastname":
+            lastname, client_id = after
+            return or_(
+                Client.lastname > lastname,
+                and_(Client.lastname == lastname, Client.client_id > client_id),
+            )
+        return Client.client_id > after[0]
+    
+    @staticmethod
+    def get_after(limit: int, after: tuple, session: Session, order_by: str = "client_id", expand: frozenset = frozenset()):
+        """Keyset pagination: rows strictly after the `after` sort values."""
+        statement = (
+            select(Client)
+            .options(*ClientRepository._load_options(expand))
+            .where(ClientRepository._after(after, order_by))
+            .order_by(*ClientRepository._order_by(order_by))
+            .limit(limit)
+        )
+        clients = session.exec(statement).all()
+        return clients
+    
+    @staticmethod
+    def _rows_statement(limit: int, offset: int = 0, after: tuple | None = None, order_by: str = "client_id", columns: tuple[str, ...] | None = None):
+        table = Client.__table__
+        statement = select(*[table.c[name] for name in columns] if columns else table.columns)
+        if after is not None:
+            statement = statement.where(ClientRepository._after(after, order_by))
+        else:
+            statement = statement.offset(offset)
+        return statement.order_by(*ClientRepository._order_by(order_by)).limit(limit)
+    
+    @staticmethod
+    def get_rows(
+        limit: int,
+        session: Session,
+        offset: int = 0,
+        after: tuple | None = None,
+        order_by: str = "client_id",
+        columns: tuple[str, ...] | None = None,
+    ) -> list[dict]:
+        """Same page as get_all/get_after, read as plain column mappings without building ORM objects.
+        
+        With `columns`, only those columns are selected.
+        """
+        statement = ClientRepository._rows_statement(limit, offset=offset, after=after, order_by=order_by, columns=columns)
+        return [dict(row) for row in session.execute(statement).mappings()]
+    
+    @staticmethod
+    def get_row(id: int, session: Session, columns: tuple[str, ...]) -> dict | None:
+        """Only the given columns of one client, as a plain mapping."""
+        table = Client.__table__
+        row = session.execute(select(*[table.c[name] for name in columns]).where(table.c.client_id == id)).mappings().first()
+        return dict(row) if row else None
+    
+    @staticmethod
+    def stream(session: Session, chunk_size: int = 1000, newsletter: int | None = None, commune_id: int | None = None):
+        """Stream the t_client rows as plain tuples, chunk by chunk.
+        
+        `yield_per` enables a server-side cursor so that only one chunk is held
+        in memory at a time, whatever the size of the table.
+        
+        Yields:
+            list[Row]: Chunks of at most `chunk_size` rows, in client_id order.
+        """
+        table = Client.__table__
+        statement = select(*table.columns).order_by(table.c.client_id)
+        if newsletter is not None:
+            statement = statement.where(table.c.newsletter == newsletter)
+        if commune_id is not None:
+            statement = statement.where(table.c.commune_id == commune_id)
+        result = session.execute(statement.execution_options(yield_per=chunk_size))
+        yield from result.partitions()
+    
+    @staticmethod
+    def stream_by_commune(session: Session, columns: tuple[str, ...], chunk_size: int = 1000):
+        """Stream the given columns of t_client in (commune_id, client_id) order, chunk by chunk.
+
+        The clients of a commune arrive consecutively, so a consumer only needs
+        to hold one commune at a time. Clients without commune come first.
+        """
+        table = Client.__table__
+        statement = select(*[table.c[name] for name in columns]).order_by(table.c.commune_id, table.c.client_id)
+        result = session.execute(statement.execution_options(yield_per=chunk_size))
+        yield from result.partitions()
+
+    @staticmethod
+    def get_rows_by_ids(ids: list[int], session: Session, columns: tuple[str, ...]) -> list[dict]:
+        """The given columns of the listed clients, as plain mappings."""
+        table = Client.__table__
+        statement = select(*[table.c[name] for name in columns]).where(table.c.client_id.in_(ids))
+        return [dict(row) for row in session.execute(statement).mappings()]
+
+    @staticmethod
+    def get_by_id(id: int, session: Session, expand: frozenset = frozenset()):
+        statement = select(Client).options(*ClientRepository._load_options(expand)).where(Client.client_id == id)
         client = session.exec(statement).first()
         if not client:
             return None
@@ -23,32 +144,246 @@ class ClientRepository(AbstractRepository):
     def create(data: dict, session: Session):
         new_client = Client(**data)
         session.add(new_client)
+        session.flush()
+        ClientSearchRepository.index(new_client.client_id, data, session)
         session.commit()
         session.refresh(new_client)
         return new_client
     
+    @staticmethod
+    def create_many(rows: list[dict], session: Session) -> list[tuple[int, str]]:
+        """Insert a batch of clients in a single transaction (executemany).
+        
+        The new clients are indexed from the ids returned by their own insert
+        (one INSERT per row on MySQL, which has no RETURNING). If the batch is rejected by the database, it is replayed row by row
+        inside savepoints so that only the faulty rows are dropped.
+        
+        Returns:
+            list[tuple[int, str]]: The index in `rows` and the error of each rejected row.
+        """
+        if not rows:
+            return []
+        try:
+            ClientRepository._insert_returning_ids(rows, session)
+            session.commit()
+            return []
+        except SQLAlchemyError:
+            session.rollback()
+        
+        errors = []
+        for index, row in enumerate(rows):
+            try:
+                with session.begin_nested():
+                    result = session.execute(insert(Client).values(**row))
+                    ClientSearchRepository.index(result.inserted_primary_key[0], row, session)
+            except SQLAlchemyError as e:
+                errors.append((index, str(e.orig) if getattr(e, "orig", None) else str(e)))
+        session.commit()
+        return errors
+    
+    @staticmethod
+    def _insert_returning_ids(rows: list[dict], session: Session) -> list[int]:
+        """Insert and index `rows`, returning the generated client_id of each one, in order."""
+        if session.get_bind().dialect.insert_executemany_returning:
+            # executemany : mêmes clés pour toutes les lignes, les champs absents valent NULL
+            keys = {key for row in rows for key in row}
+            rows = [{key: row.get(key) for key in keys} for row in rows]
+            ids = list(session.scalars(insert(Client).returning(Client.client_id, sort_by_parameter_order=True), rows).all())
+        else:
+            # Sans RETURNING (MySQL), l'ordre des auto-incréments d'un INSERT multiple n'est pas garanti :
+            # une instruction par ligne, mais toujours un seul commit
+            ids = [session.execute(insert(Client).values(**row)).inserted_primary_key[0] for row in rows]
+        tokens = [token for client_id, row in zip(ids, rows) for token in ClientSearchRepository.token_rows(client_id, row)]
+        if tokens:
+            session.execute(insert(ClientSearchToken), tokens)
+        return ids
+
+    @staticmethod
+    def create_group(rows: list[dict], session: Session) -> list[int | SQLAlchemyError]:
+        """Insert the rows of several callers in a single transaction (group commit).
+
+        If the group is rejected, it is replayed row by row inside savepoints:
+        a faulty row only fails its own caller and the others still share one
+        commit. A failing final commit raises and nothing is written.
+
+        Returns:
+            list[int | SQLAlchemyError]: The client_id, or the error, of each row of `rows`.
+        """
+        if not rows:
+            return []
+        try:
+            ids = ClientRepository._insert_returning_ids(rows, session)
+            session.commit()
+            return ids
+        except SQLAlchemyError:
+            session.rollback()
+
+        results = []
+        for row in rows:
+            try:
+                with session.begin_nested():
+                    client_id = session.execute(insert(Client).values(**row)).inserted_primary_key[0]
+                    ClientSearchRepository.index(client_id, row, session)
+                results.append(client_id)
+            except SQLAlchemyError as e:
+                results.append(e)
+        session.commit()
+        return results
+
     @staticmethod
     def patch(id: int, data: dict, session: Session):
-        statement = select(Client).where(Client.client_id == id)
-        client = session.exec(statement).first()
-        if not client:
+        """Single UPDATE ... RETURNING when the database supports it, UPDATE then SELECT otherwise."""
+        if not data:
+            return ClientRepository.get_by_id(id=id, session=session)
+        
+        table = Client.__table__
+        statement = update(table).where(table.c.client_id == id).values(**data, version=table.c.version + 1)
+        if session.get_bind().dialect.update_returning:
+            row = session.execute(statement.returning(*table.columns)).first()
+        else:
+            result = session.execute(statement)
+            row = session.execute(select(*table.columns).where(table.c.client_id == id)).first() if result.rowcount else None
+        if row is None:
+            session.rollback()
             return None
         
-        # Update the client with the provided data
-        client = client.sqlmodel_update(data)
+        # Keep the search index in the same transaction
+        if any(field in data for field in SEARCH_FIELDS):
+            ClientSearchRepository.reindex(id, row._mapping, session)
         
-        # Commit the changes to the database
-        session.add(client)
         session.commit()
-        session.refresh(client)
-        return client
+        # Instance détachée construite depuis la ligne : pas de refresh après le commit
+        return Client(**row._mapping)
+    
+    @staticmethod
+    def _where(criteria: dict):
+        return [getattr(Client, field) == value for field, value in criteria.items()]
+    
+    @staticmethod
+    def iter_id_chunks(session: Session, ids: list[int] | None = None, criteria: dict | None = None, chunk_size: int = 1000):
+        """Yield the targeted client ids chunk by chunk, from an id list or by keyset over a filter."""
+        if ids is not None:
+            unique_ids = sorted(set(ids))
+            for start in range(0, len(unique_ids), chunk_size):
+                yield unique_ids[start:start + chunk_size]
+            return
+        last_id = 0
+        while True:
+            chunk = session.exec(
+                select(Client.client_id)
+                .where(*ClientRepository._where(criteria), Client.client_id > last_id)
+                .order_by(Client.client_id)
+                .limit(chunk_size)
+            ).all()
+            if not chunk:
+                return
+            yield list(chunk)
+            last_id = chunk[-1]
+    
+    @staticmethod
+    def patch_many(data: dict, session: Session, ids: list[int] | None = None, criteria: dict | None = None, chunk_size: int = 1000) -> tuple[int, list[int]]:
+        """Set-based UPDATE of the targeted clients, one statement and one transaction per chunk.
+        
+        Returns:
+            tuple[int, list[int]]: The number of updated rows and the targeted ids.
+        """
+        affected, targeted = 0, []
+        reindex = any(field in data for field in SEARCH_FIELDS)
+        for chunk in ClientRepository.iter_id_chunks(session, ids=ids, criteria=criteria, chunk_size=chunk_size):
+            table = Client.__table__
+            result = session.execute(update(table).where(table.c.client_id.in_(chunk)).values(**data, version=table.c.version + 1))
+            affected += result.rowcount
+            targeted.extend(chunk)
+            if reindex:
+                ClientSearchRepository.unindex(chunk, session)
+                rows = session.exec(
+                    select(Client.client_id, *[getattr(Client, field) for field in SEARCH_FIELDS]).where(Client.client_id.in_(chunk))
+                ).all()
+                tokens = [
+                    token for row in rows
+                    for token in ClientSearchRepository.token_rows(row[0], dict(zip(SEARCH_FIELDS, row[1:])))
+                ]
+                if tokens:
+                    session.execute(insert(ClientSearchToken), tokens)
+            session.commit()
+        return affected, targeted
+    
+    @staticmethod
+    def delete_many(session: Session, ids: list[int] | None = None, criteria: dict | None = None, chunk_size: int = 1000) -> tuple[int, list[int]]:
+        """Set-based DELETE of the targeted clients, one statement and one transaction per chunk.
+        
+        Clients that still have orders are kept: t_entcde.codcli references them.
+        
+        Returns:
+            tuple[int, list[int]]: The number of deleted rows and the targeted ids.
+        """
+        affected, targeted = 0, []
+        for chunk in ClientRepository.iter_id_chunks(session, ids=ids, criteria=criteria, chunk_size=chunk_size):
+            chunk = ClientRepository.without_orders(chunk, session)
+            if not chunk:
+                continue
+            ClientSearchRepository.unindex(chunk, session)
+            ClientPointsRepository.delete(chunk, session)
+            result = session.execute(delete(Client.__table__).where(Client.__table__.c.client_id.in_(chunk)))
+            affected += result.rowcount
+            targeted.extend(chunk)
+            session.commit()
+        return affected, targeted
     
     @staticmethod
     def delete(id: int, session: Session) -> bool:
+        """Delete a client with its search tokens and points balance.
+        
+        Raises:
+            ValueError: If the client still has orders.
+        """
         statement = select(Client).where(Client.client_id == id)
         client = session.exec(statement).first()
         if not client:
             return False
-        session.delete(client)
-        session.commit()
-        return True
\ No newline at end of file
+        if ClientRepository.has_orders(id, session):
+            raise ValueError(f"Client with ID {id} still has orders")
+        try:
+            ClientSearchRepository.unindex([id], session)
+            ClientPointsRepository.delete([id], session)
+            session.delete(client)
+            session.commit()
+        except IntegrityError as e:
+            # Commande enregistrée entre la vérification et la suppression
+            session.rollback()
+            raise ValueError(f"Client with ID {id} still has orders") from e
+        return True
+    
+    @staticmethod
+    def has_orders(id: int, session: Session) -> bool:
+        return session.exec(select(exists().where(Commande.codcli == id))).one()
+    
+    @staticmethod
+    def without_orders(ids: list[int], session: Session) -> list[int]:
+        """The clients of `ids` that no order references."""
+        table, orders = Client.__table__, Commande.__table__
+        statement = select(table.c.client_id).where(
+            table.c.client_id.in_(ids), ~exists().where(orders.c.codcli == table.c.client_id)
+        )
+        return list(session.exec(statement).all())
+    
+    @staticmethod
+    def exists(id: int, session: Session) -> bool:
+        return session.exec(select(exists().where(Client.client_id == id))).one()
+    
+    @staticmethod
+    def count(session: Session) -> int:
+        return session.exec(select(func.count()).select_from(Client)).one()
+    
+    @staticmethod
+    def estimate_count(session: Session) -> int | None:
+        """Approximate row count from the table statistics (MySQL/MariaDB), None if unavailable."""
+        if session.get_bind().dialect.name != "mysql":
+            return None
+        return session.execute(
+            text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+            ),
+            {"table": Client.__tablename__},
+        ).scalar()
\ No newline at end of file
@@ -0,0 +1,115 @@
+import math
+
+from sqlalchemy import delete, func, insert
+from sqlmodel import Session, select
+from ..models import Client, ClientSearchToken
+from ..text import trigrams
+
+
+# Champs indexés pour la recherche partielle des clients
+SEARCH_FIELDS = ("lastname", "firstname", "email", "mobile_phone")
+
+# Part minimale des trigrammes de la requête qu'un client doit contenir
+MIN_MATCH_RATIO = 0.5
+
+
+def _digits(text: str) -> str:
+    return "".join(char for char in text if char.isdigit())
+
+
+class ClientSearchRepository:
+    """Maintains and queries the t_client_search trigram side table.
+    
+    The write helpers do not commit: they are called by ClientRepository inside
+    the transaction of the client write they follow.
+    """
+    
+    @staticmethod
+    def grams(values: dict) -> set[str]:
+        """Trigrams of the searchable fields of a client."""
+        grams = set()
+        for field in SEARCH_FIELDS:
+            value = values.get(field)
+            if field == "mobile_phone" and value:
+                value = _digits(value)
+            grams |= trigrams(value)
+        return grams
+    
+    @staticmethod
+    def query_grams(q: str) -> set[str]:
+        """Trigrams of a search query; phone numbers are compared on their digits only."""
+        compact = q.replace(" ", "").replace(".", "").replace("-", "")
+        if compact.isdigit():
+            return trigrams(compact)
+        return trigrams(q)
+    
+    @staticmethod
+    def token_rows(client_id: int, values: dict) -> list[dict]:
+        return [{"gram": gram, "client_id": client_id} for gram in ClientSearchRepository.grams(values)]
+    
+    @staticmethod
+    def index(client_id: int, values: dict, session: Session) -> None:
+        rows = ClientSearchRepository.token_rows(client_id, values)
+        if rows:
+            session.execute(insert(ClientSearchToken), rows)
+    
+    @staticmethod
+    def unindex(client_ids: list[int], session: Session) -> None:
+        session.execute(delete(ClientSearchToken).where(ClientSearchToken.client_id.in_(client_ids)))
+    
+    @staticmethod
+    def reindex(client_id: int, values: dict, session: Session) -> None:
+        ClientSearchRepository.unindex([client_id], session)
+        ClientSearchRepository.index(client_id, values, session)
+    
+    @staticmethod
+    def search_statement(grams: set[str], limit: int):
+        """Rank the clients by number of matching trigrams (one GROUP BY on the side table)."""
+        score = func.count().label("score")
+        return (
+            select(ClientSearchToken.client_id, score)
+            .where(ClientSearchToken.gram.in_(sorted(grams)))
+            .group_by(ClientSearchToken.client_id)
+            .having(func.count() >= math.ceil(len(grams) * MIN_MATCH_RATIO))
+            .order_by(score.desc(), ClientSearchToken.client_id)
+            .limit(limit)
+        )
+    
+    @staticmethod
+    def search(q: str, limit: int, session: Session) -> list[tuple[Client, float]]:
+        """Return the best matching clients with a score between 0 and 1."""
+        grams = ClientSearchRepository.query_grams(q)
+        if not grams:
+            return []
+        ranked = session.exec(ClientSearchRepository.search_statement(grams, limit)).all()
+        if not ranked:
+            return []
+        clients = session.exec(select(Client).where(Client.client_id.in_([client_id for client_id, _ in ranked])))
+        by_id = {client.client_id: client for client in clients}
+        return [(by_id[client_id], count / len(grams)) for client_id, count in ranked if client_id in by_id]
+    
+    @staticmethod
+    def rebuild(session: Session, chunk_size: int = 1000) -> int:
+        """Rebuild the whole index from t_client, one transaction per chunk of clients.
+        
+        Returns:
+            int: The number of indexed clients.
+        """
+        session.execute(delete(ClientSearchToken))
+        session.commit()
+        columns = [Client.client_id] + [getattr(Client, field) for field in SEARCH_FIELDS]
+        last_id, total = 0, 0
+        while True:
+            rows = session.exec(
+                select(*columns).where(Client.client_id > last_id).order_by(Client.client_id).limit(chunk_size)
+            ).all()
+            if not rows:
+                return total
+            tokens = []
+            for row in rows:
+                tokens.extend(ClientSearchRepository.token_rows(row[0], dict(zip(SEARCH_FIELDS, row[1:]))))
+            if tokens:
+                session.execute(insert(ClientSearchToken), tokens)
+            session.commit()
+            last_id = rows[-1][0]
+            total += len(rows)
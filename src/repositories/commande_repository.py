@@ -0,0 +1,167 @@
+from sqlalchemy import bindparam, delete, func, insert, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+from ..models import Commande, Detail
+from .client_points_repository import ClientPointsRepository
+from .sales_rollup_repository import SalesRollupRepository
+
+
+class CommandeRepository:
+    """Repository for managing orders (Commande header and Detail lines)."""
+    
+    @staticmethod
+    def create(header: dict, lignes: list[dict], session: Session, points: int = 0, rollup: list[dict] | None = None) -> int:
+        """Insert the order header and all its lines in one transaction.
+        
+        The lines are written with a single executemany INSERT. The `points`
+        earned are added to the client balance and the `rollup` deltas to the
+        sales rollup in the same transaction.
+        
+        Returns:
+            int: The id (codcde) of the new order.
+        """
+        try:
+            commande = Commande(**header)
+            session.add(commande)
+            session.flush()
+            session.execute(insert(Detail), [{**ligne, "codcde": commande.codcde} for ligne in lignes])
+            ClientPointsRepository.add(header["codcli"], points, session)
+            SalesRollupRepository.add(rollup, session)
+            session.commit()
+        except SQLAlchemyError:
+            session.rollback()
+            raise
+        return commande.codcde
+    
+    @staticmethod
+    def patch(
+        id: int,
+        codcli: int,
+        data: dict,
+        lignes: list[dict] | None,
+        session: Session,
+        points: int = 0,
+        rollup: list[dict] | None = None,
+    ) -> None:
+        """Update the order header and, when given, replace all its lines, in one transaction.
+        
+        Args:
+            id (int): The order to update.
+            codcli (int): The client of the order, whose balance changes by `points`.
+            data (dict): The header columns to update.
+            lignes (list[dict] | None): The new lines, or None to keep the current ones.
+            session (Session): The database session.
+            points (int): The change of the client balance.
+            rollup (list[dict] | None): The sales rollup deltas.
+        """
+        table = Commande.__table__
+        try:
+            if data:
+                session.execute(update(table).where(table.c.codcde == id).values(**data))
+            if lignes is not None:
+                session.execute(delete(Detail).where(Detail.codcde == id))
+                session.execute(insert(Detail), [{**ligne, "codcde": id} for ligne in lignes])
+            ClientPointsRepository.add(codcli, points, session)
+            SalesRollupRepository.add(rollup, session)
+            session.commit()
+        except SQLAlchemyError:
+            session.rollback()
+            raise
+    
+    @staticmethod
+    def delete(id: int, codcli: int, session: Session, points: int = 0, rollup: list[dict] | None = None) -> bool:
+        """Delete an order and its lines, remove its `points` from the client balance and apply the `rollup` deltas.
+        
+        The balance and rollup only change when this transaction deleted the
+        order: a concurrent delete of the same order does not subtract twice.
+        
+        Returns:
+            bool: True if the order was deleted, False if it no longer existed.
+        """
+        try:
+            session.execute(delete(Detail).where(Detail.codcde == id))
+            deleted = session.execute(delete(Commande).where(Commande.codcde == id)).rowcount == 1
+            if deleted:
+                ClientPointsRepository.add(codcli, -points, session)
+                SalesRollupRepository.add(rollup, session)
+            session.commit()
+        except SQLAlchemyError:
+            session.rollback()
+            raise
+        return deleted
+    
+    @staticmethod
+    def get_by_id(id: int, session: Session, lock: bool = False) -> Commande | None:
+        """An order with its lines; with `lock`, the order row is locked (SELECT ... FOR UPDATE) until the commit."""
+        statement = select(Commande).options(selectinload(Commande.lignes)).where(Commande.codcde == id)
+        if lock:
+            # Relu même si déjà dans la session : les lignes doivent être celles vues sous le verrou
+            statement = statement.with_for_update().execution_options(populate_existing=True)
+        return session.exec(statement).first()
+    
+    @staticmethod
+    def get_by_client(codcli: int, limit: int, offset: int, session: Session) -> list[Commande]:
+        """Orders of a client, most recent first, with their lines eagerly loaded."""
+        statement = (
+            select(Commande)
+            .options(selectinload(Commande.lignes))
+            .where(Commande.codcli == codcli)
+            .order_by(Commande.codcde.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        return session.exec(statement).all()
+    
+    @staticmethod
+    def max_id(session: Session) -> int:
+        return session.exec(select(func.max(Commande.codcde))).one() or 0
+    
+    @staticmethod
+    def get_chunk(session: Session, after: int, until: int, chunk_size: int = 1000) -> list[Commande]:
+        """The next `chunk_size` orders after `after` and up to `until` (codcde), with their lines (keyset)."""
+        return session.exec(
+            select(Commande)
+            .options(selectinload(Commande.lignes))
+            .where(Commande.codcde > after, Commande.codcde <= until)
+            .order_by(Commande.codcde)
+            .limit(chunk_size)
+        ).all()
+    
+    @staticmethod
+    def get_many(ids: list[int], session: Session) -> list[Commande]:
+        """Orders by id, with their lines, in two queries whatever the number of orders."""
+        statement = select(Commande).options(selectinload(Commande.lignes)).where(Commande.codcde.in_(ids))
+        return session.exec(statement).all()
+    
+    @staticmethod
+    def set_departements(rows: list[dict], session: Session) -> None:
+        """Record the rollup departement of many orders with a single executemany UPDATE, without committing.
+        
+        Args:
+            rows (list[dict]): Items with the keys codcde and departement_id.
+        """
+        if not rows:
+            return
+        table = Commande.__table__
+        statement = update(table).where(table.c.codcde == bindparam("b_codcde")).values(departement_id=bindparam("b_departement_id"))
+        session.execute(statement, [{"b_codcde": row["codcde"], "b_departement_id": row["departement_id"]} for row in rows])
+    
+    @staticmethod
+    def set_stamps(rows: list[dict], session: Session) -> None:
+        """Write timbrecde/timbrecli of many orders with a single executemany UPDATE, without committing.
+        
+        Args:
+            rows (list[dict]): Items with the keys codcde, timbrecde and timbrecli.
+        """
+        if not rows:
+            return
+        table = Commande.__table__
+        statement = (
+            update(table)
+            .where(table.c.codcde == bindparam("b_codcde"))
+            .values(timbrecde=bindparam("b_timbrecde"), timbrecli=bindparam("b_timbrecli"))
+        )
+        session.execute(statement, [
+            {"b_codcde": row["codcde"], "b_timbrecde": row["timbrecde"], "b_timbrecli": row["timbrecli"]} for row in rows
+        ])
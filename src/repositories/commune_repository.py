@@ -0,0 +1,32 @@
+from sqlmodel import Session, select
+from ..models import Commune, Departement
+from .checksum import table_checksum
+
+
+class CommuneRepository:
+    """Repository for reading Commune reference data."""
+    
+    @staticmethod
+    def get_index_rows(session: Session):
+        """Return every commune joined with its departement, as plain rows, in one query."""
+        statement = (
+            select(
+                Commune.id,
+                Commune.city_name,
+                Commune.postal_code,
+                Commune.departement_id,
+                Departement.department_code,
+                Departement.department_name,
+            )
+            .outerjoin(Departement, Commune.departement_id == Departement.id)
+        )
+        return session.exec(statement).all()
+    
+    @staticmethod
+    def signature(session: Session) -> tuple:
+        """Fingerprint of the indexed columns of the reference tables (row counts and content checksums)."""
+        communes = table_checksum(Commune, [Commune.id, Commune.city_name, Commune.postal_code, Commune.departement_id], session)
+        departements = table_checksum(
+            Departement, [Departement.id, Departement.department_code, Departement.department_name], session
+        )
+        return communes + departements
@@ -0,0 +1,155 @@
+from sqlalchemy import bindparam, delete, exists, func, insert, update
+from sqlmodel import Session, select
+from typing import Generic, Optional, TypeVar
+from .abstract_repository import AbstractRepository
+
+T = TypeVar("T")
+
+
+class CrudRepository(AbstractRepository[T], Generic[T]):
+    """Generic AbstractRepository of a table model with a single integer primary key.
+
+    The statements are built once per model with bound parameters, so a
+    request only binds values: SQLAlchemy then reuses their compiled form
+    from its cache. Updates take their SET columns from the parameters, one
+    statement serving every combination of patched fields. Lookups by
+    primary key go through `session.get` and the identity map.
+    """
+
+    def __init__(self, model: type[T]):
+        self.model = model
+        self.table = model.__table__
+        (self.pk,) = self.table.primary_key.columns
+        table, pk = self.table, self.pk
+
+        # Instructions construites une fois : seules les valeurs liées changent d'une requête à l'autre
+        self._page = select(*table.columns).order_by(pk).offset(bindparam("crud_offset")).limit(bindparam("crud_limit"))
+        self._after = select(*table.columns).where(pk > bindparam("crud_after")).order_by(pk).limit(bindparam("crud_limit"))
+        self._row = select(*table.columns).where(pk == bindparam("crud_pk"))
+        self._exists = select(exists().where(pk == bindparam("crud_pk")))
+        self._count = select(func.count()).select_from(table)
+        self._insert = insert(table)
+        self._update = update(table).where(pk == bindparam("crud_pk"))
+        self._update_many = update(table).where(pk.in_(bindparam("crud_ids", expanding=True)))
+        self._delete = delete(table).where(pk == bindparam("crud_pk"))
+        self._delete_many = delete(table).where(pk.in_(bindparam("crud_ids", expanding=True)))
+        # Pages projetées, une instruction par jeu de colonnes demandé
+        self._projected: dict[tuple, object] = {}
+
+    def _to_model(self, row) -> T:
+        # Instance détachée construite depuis la ligne : pas de refresh après le commit
+        return self.model(**row._mapping)
+
+    def _rows_statement(self, columns: tuple[str, ...] | None, keyset: bool):
+        if columns is None:
+            return self._after if keyset else self._page
+        key = (columns, keyset)
+        statement = self._projected.get(key)
+        if statement is None:
+            statement = select(*[self.table.c[name] for name in columns])
+            if keyset:
+                statement = statement.where(self.pk > bindparam("crud_after"))
+            else:
+                statement = statement.offset(bindparam("crud_offset"))
+            statement = self._projected.setdefault(key, statement.order_by(self.pk).limit(bindparam("crud_limit")))
+        return statement
+
+    def get_all(self, limit: int, offset: int, session: Session) -> list[T]:
+        return [self._to_model(row) for row in session.execute(self._page, {"crud_offset": offset, "crud_limit": limit})]
+
+    def get_rows(
+        self,
+        limit: int,
+        session: Session,
+        offset: int = 0,
+        after: int | None = None,
+        columns: tuple[str, ...] | None = None,
+    ) -> list[dict]:
+        """A page in primary key order as plain mappings, by offset or after the `after` key."""
+        if after is not None:
+            params = {"crud_after": after, "crud_limit": limit}
+        else:
+            params = {"crud_offset": offset, "crud_limit": limit}
+        statement = self._rows_statement(columns, keyset=after is not None)
+        return [dict(row) for row in session.execute(statement, params).mappings()]
+
+    def get_row(self, id: int, session: Session, columns: tuple[str, ...]) -> dict | None:
+        """Only the given columns of one record, as a plain mapping."""
+        row = session.execute(
+            select(*[self.table.c[name] for name in columns]).where(self.pk == id)
+        ).mappings().first()
+        return dict(row) if row else None
+
+    def get_by_id(self, id: int, session: Session) -> Optional[T]:
+        return session.get(self.model, id)
+
+    def create(self, data: dict, session: Session) -> T:
+        if session.get_bind().dialect.insert_returning:
+            row = session.execute(self._insert.returning(*self.table.columns), data).first()
+        else:
+            id = session.execute(self._insert, data).inserted_primary_key[0]
+            row = session.execute(self._row, {"crud_pk": id}).first()
+        session.commit()
+        return self._to_model(row)
+
+    def patch(self, id: int, data: dict, session: Session) -> Optional[T]:
+        """Single UPDATE ... RETURNING when the database supports it, UPDATE then SELECT otherwise."""
+        if not data:
+            return self.get_by_id(id, session)
+        params = {**data, "crud_pk": id}
+        if session.get_bind().dialect.update_returning:
+            row = session.execute(self._update.returning(*self.table.columns), params).first()
+        else:
+            result = session.execute(self._update, params)
+            row = session.execute(self._row, {"crud_pk": id}).first() if result.rowcount else None
+        if row is None:
+            session.rollback()
+            return None
+        session.commit()
+        return self._to_model(row)
+
+    def delete(self, id: int, session: Session) -> bool:
+        deleted = session.execute(self._delete, {"crud_pk": id}).rowcount > 0
+        session.commit()
+        return deleted
+
+    def iter_id_chunks(self, session: Session, ids: list[int] | None = None, criteria: dict | None = None, chunk_size: int = 1000):
+        """Yield the targeted ids chunk by chunk, from an id list or by keyset over a filter."""
+        if ids is not None:
+            unique_ids = sorted(set(ids))
+            for start in range(0, len(unique_ids), chunk_size):
+                yield unique_ids[start:start + chunk_size]
+            return
+        where = [self.table.c[name] == value for name, value in (criteria or {}).items()]
+        last_id = None
+        while True:
+            statement = select(self.pk).where(*where).order_by(self.pk).limit(chunk_size)
+            if last_id is not None:
+                statement = statement.where(self.pk > last_id)
+            chunk = session.exec(statement).all()
+            if not chunk:
+                return
+            yield list(chunk)
+            last_id = chunk[-1]
+
+    def patch_many(self, data: dict, session: Session, ids: list[int] | None = None, criteria: dict | None = None, chunk_size: int = 1000) -> int:
+        """Set-based UPDATE of the targeted records, one statement and one transaction per chunk."""
+        affected = 0
+        for chunk in self.iter_id_chunks(session, ids=ids, criteria=criteria, chunk_size=chunk_size):
+            affected += session.execute(self._update_many, {**data, "crud_ids": chunk}).rowcount
+            session.commit()
+        return affected
+
+    def delete_many(self, session: Session, ids: list[int] | None = None, criteria: dict | None = None, chunk_size: int = 1000) -> int:
+        """Set-based DELETE of the targeted records, one statement and one transaction per chunk."""
+        affected = 0
+        for chunk in self.iter_id_chunks(session, ids=ids, criteria=criteria, chunk_size=chunk_size):
+            affected += session.execute(self._delete_many, {"crud_ids": chunk}).rowcount
+            session.commit()
+        return affected
+
+    def exists(self, id: int, session: Session) -> bool:
+        return session.execute(self._exists, {"crud_pk": id}).scalar()
+
+    def count(self, session: Session) -> int:
+        return session.execute(self._count).scalar()
@@ -0,0 +1,40 @@
+from sqlalchemy.orm import Bundle
+from sqlmodel import Session, select
+from ..models import Objet, ObjetCond, Conditionnement
+
+
+class ObjetRepository:
+    """Repository for reading the product catalogue (objets and their packagings)."""
+    
+    @staticmethod
+    def get_catalogue(codobjs: set[int], session: Session) -> dict[int, tuple]:
+        """Load the given objets with their packaging rules in a single query.
+        
+        Plain rows are returned rather than ORM instances, so that they stay
+        usable after a commit without being refreshed one by one.
+        
+        Returns:
+            dict: For each found codobj, its row (codobj, libobj, puobj, poidsobj, indispobj, points)
+            and the list of its packaging rules (qteobjdeb, qteobjfin, idcondit, poidscondit, prixcond).
+        """
+        if not codobjs:
+            return {}
+        objet = Bundle(
+            "objet", Objet.codobj, Objet.libobj, Objet.puobj, Objet.poidsobj, Objet.indispobj, Objet.points
+        )
+        regle = Bundle(
+            "regle", ObjetCond.qteobjdeb, ObjetCond.qteobjfin,
+            Conditionnement.idcondit, Conditionnement.poidscondit, Conditionnement.prixcond,
+        )
+        statement = (
+            select(objet, regle)
+            .outerjoin(ObjetCond, ObjetCond.codobj == Objet.codobj)
+            .outerjoin(Conditionnement, Conditionnement.idcondit == ObjetCond.codcond)
+            .where(Objet.codobj.in_(codobjs))
+        )
+        catalogue = {}
+        for row, rule in session.exec(statement):
+            _, regles = catalogue.setdefault(row.codobj, (row, []))
+            if rule.idcondit is not None:
+                regles.append(rule)
+        return catalogue
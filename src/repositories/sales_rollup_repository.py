@@ -0,0 +1,120 @@
+from datetime import date
+
+from sqlalchemy import delete, func, insert, update
+from sqlmodel import Session, select
+from ..models import Client, Commune, Departement, SalesRollup, SalesRollupBackfill
+from .upsert import add_or_insert
+
+
+class SalesRollupRepository:
+    """Maintains and queries the t_sales_rollup table.
+    
+    The write helpers do not commit: they are called by CommandeRepository
+    inside the transaction of the order write they follow.
+    """
+    
+    @staticmethod
+    def add(deltas: list[dict] | None, session: Session) -> None:
+        """Add revenue and order count deltas to their (departement_id, month) rows, creating missing rows (one upsert).
+        
+        Args:
+            deltas (list[dict] | None): Items with the keys departement_id, month, revenue and orders.
+        """
+        if deltas:
+            add_or_insert(SalesRollup.__table__, ("departement_id", "month"), deltas, session)
+    
+    @staticmethod
+    def clear(session: Session) -> None:
+        session.execute(delete(SalesRollup))
+    
+    @staticmethod
+    def counts(codcde: int, session: Session) -> bool:
+        """Whether the rollup counts the order `codcde`, i.e. whether a write of it must apply its deltas.
+        
+        It does, except during a backfill for the orders the backfill has not
+        aggregated yet. The progress row is share-locked until the commit, so
+        the backfill cannot aggregate the order while it is being written.
+        """
+        statement = select(SalesRollupBackfill.done, SalesRollupBackfill.until).with_for_update(read=True)
+        progress = session.exec(statement).first()
+        return progress is None or codcde <= progress.done or codcde > progress.until
+    
+    @staticmethod
+    def start_backfill(until: int, session: Session) -> None:
+        """Record that a backfill of the orders up to `until` starts, none of them being counted yet."""
+        session.execute(delete(SalesRollupBackfill))
+        session.execute(insert(SalesRollupBackfill).values(id=1, until=until, done=0))
+    
+    @staticmethod
+    def lock_backfill(session: Session) -> None:
+        """Lock the backfill progress until the commit: the order writes wait for the current chunk."""
+        session.exec(select(SalesRollupBackfill.id).with_for_update()).first()
+    
+    @staticmethod
+    def advance_backfill(done: int, session: Session) -> None:
+        """Record that the orders up to `done` are counted."""
+        session.execute(update(SalesRollupBackfill).values(done=done))
+    
+    @staticmethod
+    def end_backfill(session: Session) -> None:
+        session.execute(delete(SalesRollupBackfill))
+    
+    @staticmethod
+    def departements_of(client_ids: set[int], session: Session) -> dict[int, int]:
+        """Departement id of each client (0 when unknown), in one query."""
+        if not client_ids:
+            return {}
+        statement = (
+            select(Client.client_id, Commune.departement_id)
+            .outerjoin(Commune, Commune.id == Client.commune_id)
+            .where(Client.client_id.in_(client_ids))
+        )
+        return {client_id: departement_id or 0 for client_id, departement_id in session.exec(statement)}
+    
+    @staticmethod
+    def _range(statement, start: date | None, end: date | None, departement_code: str | None):
+        if start is not None:
+            statement = statement.where(SalesRollup.month >= start)
+        if end is not None:
+            statement = statement.where(SalesRollup.month <= end)
+        if departement_code is not None:
+            statement = statement.where(Departement.department_code == departement_code)
+        return statement
+    
+    @staticmethod
+    def get_rows(session: Session, start: date | None = None, end: date | None = None, departement_code: str | None = None):
+        """Rollup rows of the range, with the departement code and name."""
+        statement = (
+            select(
+                SalesRollup.departement_id, Departement.department_code, Departement.department_name,
+                SalesRollup.month, SalesRollup.revenue, SalesRollup.orders,
+            )
+            .outerjoin(Departement, Departement.id == SalesRollup.departement_id)
+            .order_by(SalesRollup.month, SalesRollup.departement_id)
+        )
+        return session.exec(SalesRollupRepository._range(statement, start, end, departement_code)).all()
+    
+    @staticmethod
+    def get_by_departement(session: Session, start: date | None = None, end: date | None = None):
+        """Totals of the range per departement."""
+        statement = (
+            select(
+                SalesRollup.departement_id, Departement.department_code, Departement.department_name,
+                func.sum(SalesRollup.revenue), func.sum(SalesRollup.orders),
+            )
+            .outerjoin(Departement, Departement.id == SalesRollup.departement_id)
+            .group_by(SalesRollup.departement_id, Departement.department_code, Departement.department_name)
+            .order_by(SalesRollup.departement_id)
+        )
+        return session.exec(SalesRollupRepository._range(statement, start, end, None)).all()
+    
+    @staticmethod
+    def get_by_month(session: Session, start: date | None = None, end: date | None = None, departement_code: str | None = None):
+        """Totals of the range per month, over every departement or one of them."""
+        statement = (
+            select(SalesRollup.month, func.sum(SalesRollup.revenue), func.sum(SalesRollup.orders))
+            .outerjoin(Departement, Departement.id == SalesRollup.departement_id)
+            .group_by(SalesRollup.month)
+            .order_by(SalesRollup.month)
+        )
+        return session.exec(SalesRollupRepository._range(statement, start, end, departement_code)).all()
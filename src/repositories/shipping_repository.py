@@ -0,0 +1,20 @@
+from sqlmodel import Session, select
+from ..models import Poids, Vignette
+from .checksum import table_checksum
+
+
+class ShippingRepository:
+    """Repository for reading the stamp price brackets (t_poids and t_poidsv)."""
+    
+    @staticmethod
+    def get_brackets(model: type[Poids] | type[Vignette], session: Session):
+        """Return the (valmin, valtimbre) rows of a bracket table, by increasing threshold."""
+        statement = select(model.valmin, model.valtimbre).where(model.valmin.is_not(None)).order_by(model.valmin)
+        return session.exec(statement).all()
+    
+    @staticmethod
+    def signature(session: Session) -> tuple:
+        """Fingerprint of the bracket tables (row counts and checksums of the bounds and prices)."""
+        poids = table_checksum(Poids, [Poids.id, Poids.valmin, Poids.valtimbre], session)
+        vignettes = table_checksum(Vignette, [Vignette.id, Vignette.valmin, Vignette.valtimbre], session)
+        return poids + vignettes
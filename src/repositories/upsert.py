@@ -0,0 +1,42 @@
+from sqlalchemy import Table, insert, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlmodel import Session
+
+
+def add_or_insert(table: Table, keys: tuple[str, ...], rows: list[dict], session: Session) -> None:
+    """Add the values of `rows` to the existing rows with the same `keys`, inserting the missing ones.
+
+    One atomic INSERT ... ON DUPLICATE KEY UPDATE (MySQL) or ON CONFLICT DO
+    UPDATE (SQLite, PostgreSQL) per batch: two transactions creating the same
+    row at once both end up counted instead of failing on the primary key.
+
+    Args:
+        table (Table): The table, whose primary key is `keys`.
+        keys (tuple[str, ...]): The key columns; every other column of the rows is added.
+        rows (list[dict]): The rows, all with the same columns.
+        session (Session): The database session, not committed.
+    """
+    if not rows:
+        return
+    values = [name for name in rows[0] if name not in keys]
+    dialect = session.get_bind().dialect.name
+    if dialect == "mysql":
+        statement = mysql.insert(table)
+        statement = statement.on_duplicate_key_update({name: table.c[name] + statement.inserted[name] for name in values})
+    elif dialect in ("sqlite", "postgresql"):
+        statement = (sqlite if dialect == "sqlite" else postgresql).insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(keys), set_={name: table.c[name] + statement.excluded[name] for name in values}
+        )
+    else:
+        # Pas d'upsert connu pour ce dialecte : UPDATE puis INSERT, non atomique
+        for row in rows:
+            result = session.execute(
+                update(table)
+                .where(*[table.c[key] == row[key] for key in keys])
+                .values({name: table.c[name] + row[name] for name in values})
+            )
+            if not result.rowcount:
+                session.execute(insert(table).values(**row))
+        return
+    session.execute(statement, rows)
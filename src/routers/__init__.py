@@ -1,5 +1,32 @@
 from fastapi import APIRouter
+from ..database import ASYNC_MODE
 from .client_router import router as router_client
+from .client_async_router import router as router_client_async
+from .commune_router import router as router_commune
+from .departement_router import router as router_departement
+from .commande_router import router as router_commande
+from .shipping_router import router as router_shipping
+from .analytics_router import router as router_analytics
+
+
+def use_async_routes(router: APIRouter, async_router: APIRouter) -> None:
+    """Remplace en place les routes de `router` par celles de `async_router` ayant le même chemin et les mêmes méthodes.
+    
+    L'ordre des routes est conservé, les routes sans équivalent asynchrone (import, export...) restent synchrones.
+    """
+    overrides = {(route.path, frozenset(route.methods)): route for route in async_router.routes}
+    router.routes[:] = [overrides.get((route.path, frozenset(route.methods)), route) for route in router.routes]
+
+
+if ASYNC_MODE:
+    use_async_routes(router_client, router_client_async)
+
 
 global_router = APIRouter(prefix="/api/v1")
-global_router.include_router(router_client, prefix="/clients", tags=["clients"])
+
+global_router.include_router(router_client)
+global_router.include_router(router_commune)
+global_router.include_router(router_departement)
+global_router.include_router(router_commande)
+global_router.include_router(router_shipping)
+global_router.include_router(router_analytics)
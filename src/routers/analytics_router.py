@@ -0,0 +1,45 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+
+from ..database import get_session
+from ..models import SalesRollupPublic
+from ..services import SalesService as service
+
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["analytics"],
+)
+
+
+@router.get("/sales", response_model=list[SalesRollupPublic], response_model_exclude_none=True)
+def get_sales(
+    start: date | None = Query(default=None, description="First month included (any day of the month)"),
+    end: date | None = Query(default=None, description="Last month included (any day of the month)"),
+    department_code: str | None = Query(default=None, description="Restrict to one departement"),
+    session: Session = Depends(get_session)
+):
+    """Revenue and number of orders per departement and month."""
+    return service.get_rollup(session=session, start=start, end=end, departement_code=department_code)
+
+
+@router.get("/sales/by-departement", response_model=list[SalesRollupPublic], response_model_exclude_none=True)
+def get_sales_by_departement(
+    start: date | None = Query(default=None, description="First month included (any day of the month)"),
+    end: date | None = Query(default=None, description="Last month included (any day of the month)"),
+    session: Session = Depends(get_session)
+):
+    """Revenue and number of orders per departement over the period."""
+    return service.get_by_departement(session=session, start=start, end=end)
+
+
+@router.get("/sales/by-month", response_model=list[SalesRollupPublic], response_model_exclude_none=True)
+def get_sales_by_month(
+    start: date | None = Query(default=None, description="First month included (any day of the month)"),
+    end: date | None = Query(default=None, description="Last month included (any day of the month)"),
+    department_code: str | None = Query(default=None, description="Restrict to one departement"),
+    session: Session = Depends(get_session)
+):
+    """Revenue and number of orders per month, over every departement or one of them."""
+    return service.get_by_month(session=session, start=start, end=end, departement_code=department_code)
@@ -0,0 +1,154 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..database import get_async_session
+from ..models import ClientPublic, ClientExpanded, ClientPost, ClientPatch
+from ..models.projection import projection_list_adapter, projection_model
+from ..services import AsyncClientService as service
+from .fast_response import FastJSONResponse, render_rows
+from .http_cache import CACHE_CONTROL, client_etag, is_not_modified, not_modified, page_etag
+
+
+# Mêmes chemins que client_router : ces routes remplacent leurs équivalents synchrones en mode DB_ASYNC
+router = APIRouter(
+    prefix="/clients",
+    tags=["clients"],
+    responses={404: {"description": "Not found"}}
+)
+
+
+@router.get("/", response_model=list[ClientExpanded], response_model_exclude_unset=True)
+async def get_clients(
+    request: Request,
+    response: Response,
+    limit: int = Query(default=10, ge=1, le=100, description="Number of clients to return"),
+    offset: int = Query(default=0, ge=0, description="Number of clients to skip"),
+    cursor: str | None = Query(default=None, description="Opaque cursor returned in X-Next-Cursor"),
+    order_by: Literal["client_id", "lastname"] = Query(default="client_id", description="Sort key"),
+    expand: str | None = Query(default=None, description="Relations to embed: commune,departement"),
+    fields: str | None = Query(default=None, description="Comma separated fields to return, client_id is always included"),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Retrieve all clients with offset or cursor (keyset) pagination."""
+    try:
+        relations = service.parse_expand(expand)
+        projection = service.parse_fields(fields)
+        if projection and relations:
+            raise ValueError("fields and expand cannot be combined")
+        if projection:
+            rows, next_cursor = await service.get_page_rows(
+                limit=limit, offset=offset, cursor=cursor, order_by=order_by, fields=projection, session=session
+            )
+        else:
+            clients, next_cursor = await service.get_page(
+                limit=limit, offset=offset, cursor=cursor, order_by=order_by, expand=relations, session=session
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    total = (await service.count(session=session)).count
+    headers = {"X-Total-Count": str(total)}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if not relations:
+        etag = page_etag(
+            service.row_versions(rows if projection else clients), limit, offset, cursor, order_by, projection, total
+        )
+        if is_not_modified(request, etag):
+            return not_modified(etag, headers)
+        headers.update({"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    if projection:
+        rows = service.project(rows, projection)
+        return FastJSONResponse(render_rows(rows, projection_list_adapter(ClientPublic, projection)), headers=headers)
+    response.headers.update(headers)
+    return clients
+
+
+@router.get("/{client_id}", response_model=ClientExpanded, response_model_exclude_unset=True)
+async def get_client_by_id(
+    client_id: int,
+    request: Request,
+    response: Response,
+    expand: str | None = Query(default=None, description="Relations to embed: commune,departement"),
+    fields: str | None = Query(default=None, description="Comma separated fields to return, client_id is always included"),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Retrieve a specific client by ID."""
+    try:
+        relations = service.parse_expand(expand)
+        projection = service.parse_fields(fields)
+        if projection and relations:
+            raise ValueError("fields and expand cannot be combined")
+        if projection:
+            client = await service.get_fields_by_id(id=client_id, fields=projection, session=session)
+        else:
+            client = await service.get_by_id(id=client_id, session=session, expand=relations)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not client:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, 
+            detail=f"Client with ID {client_id} not found"
+        )
+    headers = {}
+    if not relations:
+        if projection:
+            etag = client_etag(client_id, client["version"], variant=",".join(projection))
+        else:
+            etag = client_etag(client_id, client.version)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if projection:
+        body = projection_model(ClientPublic, projection).model_validate(client).model_dump_json().encode()
+        return FastJSONResponse(body, headers=headers)
+    response.headers.update(headers)
+    return client
+
+
+@router.post("/", response_model=ClientPublic, status_code=status.HTTP_201_CREATED)
+async def create_client(data: ClientPost, session: AsyncSession = Depends(get_async_session)):
+    """Create a new client."""
+    try:
+        client = await service.create(data=data, session=session)
+        return client
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
+            detail="Failed to create client"
+        )
+
+
+@router.patch("/{client_id}", response_model=ClientPublic)
+async def update_client(
+    client_id: int, 
+    client_data: ClientPatch, 
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Update an existing client partially."""
+    try:
+        client = await service.patch(id=client_id, data=client_data, session=session)
+        if not client:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, 
+                detail=f"Client with ID {client_id} not found"
+            )
+        return client
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.delete("/{client_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_client(client_id: int, session: AsyncSession = Depends(get_async_session)):
+    """Delete a client by ID, refused while the client still has orders."""
+    try:
+        success = await service.delete(id=client_id, session=session)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, 
+            detail=f"Client with ID {client_id} not found"
+        )
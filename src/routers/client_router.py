@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlmodel import Session
 
 from ..database import get_session
-from ..models import ClientPublic, ClientPost, ClientPatch
-from ..services import ClientService as service
+from ..models import (
+    ClientPublic, ClientExpanded, ClientPost, ClientPatch, ClientImportReport, ClientImportError, ClientSearchResult,
+    ClientBulkTarget, ClientBulkPatch, ClientBulkResult, ClientCount, ClientPointsPublic, ClientDuplicateReport,
+)
+from ..services import ClientService as service, ClientDedupService
+from .streaming import iter_records, encode_ndjson, encode_csv
+from ..models.projection import projection_list_adapter, projection_model
+from .http_cache import CACHE_CONTROL, client_etag, is_not_modified, not_modified, page_etag
+from .fast_response import FastJSONResponse, FAST_RESPONSE_TRUSTED, fast_response_enabled, render_rows
 
 
 router = APIRouter(
@@ -12,37 +23,211 @@ router = APIRouter(
     responses={404: {"description": "Not found"}}
 )
 
+# Chemin de sérialisation rapide des listes (FAST_RESPONSE_ROUTERS=clients) :
+# lignes brutes validées une seule fois par un TypeAdapter en cache, ou pas du tout si FAST_RESPONSE_TRUSTED=1
+FAST_RESPONSE = fast_response_enabled("clients")
+CLIENT_LIST_ADAPTER = None if FAST_RESPONSE_TRUSTED else TypeAdapter(list[ClientPublic])
+
 
-@router.get("/", response_model=list[ClientPublic])
+@router.get("/", response_model=list[ClientExpanded], response_model_exclude_unset=True)
 def get_clients(
+    request: Request,
+    response: Response,
     limit: int = Query(default=10, ge=1, le=100, description="Number of clients to return"),
     offset: int = Query(default=0, ge=0, description="Number of clients to skip"),
+    cursor: str | None = Query(default=None, description="Opaque cursor returned in X-Next-Cursor"),
+    order_by: Literal["client_id", "lastname"] = Query(default="client_id", description="Sort key"),
+    expand: str | None = Query(default=None, description="Relations to embed: commune,departement"),
+    fields: str | None = Query(default=None, description="Comma separated fields to return, client_id is always included"),
     session: Session = Depends(get_session)
 ):
-    """Retrieve all clients with pagination."""
-    return service.get_all(limit=limit, offset=offset, session=session)
+    """Retrieve all clients with offset or cursor (keyset) pagination.
+    
+    The cursor of the next page is returned in the `X-Next-Cursor` header and
+    the total number of clients in `X-Total-Count`. With `fields`, only the
+    requested columns are read and returned. Pages carry a weak ETag: a
+    matching `If-None-Match` gets a 304 without serializing the page.
+    """
+    try:
+        relations = service.parse_expand(expand)
+        projection = service.parse_fields(fields)
+        if projection and relations:
+            raise ValueError("fields and expand cannot be combined")
+        rows_path = projection is not None or (FAST_RESPONSE and not relations)
+        if rows_path:
+            rows, next_cursor = service.get_page_rows(
+                limit=limit, offset=offset, cursor=cursor, order_by=order_by, fields=projection, session=session
+            )
+        else:
+            clients, next_cursor = service.get_page(
+                limit=limit, offset=offset, cursor=cursor, order_by=order_by, expand=relations, session=session
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    total = service.count(session=session).count
+    headers = {"X-Total-Count": str(total)}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    # ETag faible de la page (sauf relations embarquées, dont les versions ne sont pas suivies)
+    if not relations:
+        etag = page_etag(
+            service.row_versions(rows if rows_path else clients), limit, offset, cursor, order_by, projection, total
+        )
+        if is_not_modified(request, etag):
+            return not_modified(etag, headers)
+        headers.update({"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    if rows_path:
+        adapter = CLIENT_LIST_ADAPTER
+        if projection is not None and not FAST_RESPONSE_TRUSTED:
+            adapter = projection_list_adapter(ClientPublic, projection)
+        return FastJSONResponse(render_rows(service.project(rows, projection), adapter), headers=headers)
+    response.headers.update(headers)
+    return clients
 
 
-@router.get("/{client_id}", response_model=ClientPublic)
-def get_client_by_id(client_id: int, session: Session = Depends(get_session)):
-    """Retrieve a specific client by ID."""
-    client = service.get_by_id(id=client_id, session=session)
+@router.get("/count", response_model=ClientCount)
+def count_clients(
+    approximate: bool = Query(default=False, description="Read the table statistics instead of the exact count"),
+    session: Session = Depends(get_session)
+):
+    """Total number of clients."""
+    return service.count(session=session, approximate=approximate)
+
+
+@router.get("/search", response_model=list[ClientSearchResult])
+def search_clients(
+    q: str = Query(min_length=2, max_length=100, description="Part of a name, email or mobile phone"),
+    limit: int = Query(default=20, ge=1, le=100, description="Number of clients to return"),
+    session: Session = Depends(get_session)
+):
+    """Search clients by partial lastname, firstname, email or mobile phone, ranked by relevance."""
+    return service.search(q=q, limit=limit, session=session)
+
+
+@router.get("/export")
+def export_clients(
+    format: Literal["ndjson", "csv"] = Query(default="ndjson", description="Export format"),
+    newsletter: int | None = Query(default=None, description="Filter on newsletter subscription"),
+    commune_id: int | None = Query(default=None, description="Filter on commune"),
+    chunk_size: int = Query(default=1000, ge=1, le=10000, description="Number of rows read per chunk"),
+    session: Session = Depends(get_session)
+):
+    """Stream the whole client table as NDJSON or CSV.
+    
+    Rows are read through a server-side cursor and written chunk by chunk,
+    so memory stays flat whatever the size of the table.
+    """
+    # Le flux est lu après la fermeture de la session de la requête : il ouvre la sienne sur le même moteur
+    columns, chunks = service.export(
+        bind=session.get_bind(), newsletter=newsletter, commune_id=commune_id, chunk_size=chunk_size
+    )
+    if format == "csv":
+        return StreamingResponse(
+            encode_csv(columns, chunks),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="clients.csv"'},
+        )
+    return StreamingResponse(encode_ndjson(columns, chunks), media_type="application/x-ndjson")
+
+
+@router.get("/duplicates", response_model=ClientDuplicateReport)
+def find_duplicate_clients(
+    min_score: float = Query(default=0.8, ge=0, le=1, description="Minimum similarity score of a candidate pair"),
+    limit: int = Query(default=100, ge=1, le=1000, description="Number of best candidates to return"),
+    max_block: int = Query(default=50, ge=2, le=1000, description="Blocks larger than this are skipped"),
+    chunk_size: int = Query(default=1000, ge=1, le=10000, description="Number of rows read per chunk"),
+    session: Session = Depends(get_session)
+):
+    """Detect probable duplicate clients and report the best merge candidates.
+    
+    The table is streamed once; only clients sharing a blocking key
+    (phonetic lastname or address within a commune, email, phone) are
+    compared. The report gives the volumes and throughput of the run.
+    """
+    return ClientDedupService.report(
+        session=session, min_score=min_score, limit=limit, chunk_size=chunk_size, max_block=max_block
+    )
+
+
+@router.get("/cache/stats")
+def get_cache_stats():
+    """Hit/miss/eviction counters of the client cache."""
+    return service.cache.stats()
+
+
+@router.get("/{client_id}", response_model=ClientExpanded, response_model_exclude_unset=True)
+def get_client_by_id(
+    client_id: int,
+    request: Request,
+    response: Response,
+    expand: str | None = Query(default=None, description="Relations to embed: commune,departement"),
+    fields: str | None = Query(default=None, description="Comma separated fields to return, client_id is always included"),
+    session: Session = Depends(get_session)
+):
+    """Retrieve a specific client by ID.
+    
+    The strong ETag comes from the row version: a matching `If-None-Match`
+    gets a 304 without serializing the client.
+    """
+    try:
+        relations = service.parse_expand(expand)
+        projection = service.parse_fields(fields)
+        if projection and relations:
+            raise ValueError("fields and expand cannot be combined")
+        if projection:
+            client = service.get_fields_by_id(id=client_id, fields=projection, session=session)
+        else:
+            client = service.get_by_id(id=client_id, session=session, expand=relations)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     if not client:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail=f"Client with ID {client_id} not found"
         )
+    headers = {}
+    if not relations:
+        if projection:
+            etag = client_etag(client_id, client["version"], variant=",".join(projection))
+        else:
+            etag = client_etag(client_id, client.version)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if projection:
+        body = projection_model(ClientPublic, projection).model_validate(client).model_dump_json().encode()
+        return FastJSONResponse(body, headers=headers)
+    response.headers.update(headers)
     return client
 
 
+@router.get("/{client_id}/points", response_model=ClientPointsPublic)
+def get_client_points(client_id: int, session: Session = Depends(get_session)):
+    """Loyalty points balance of a client."""
+    points = service.get_points(id=client_id, session=session)
+    if points is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, 
+            detail=f"Client with ID {client_id} not found"
+        )
+    return points
+
+
 @router.post("/", response_model=ClientPublic, status_code=status.HTTP_201_CREATED)
-def create_client(data: ClientPost, session: Session = Depends(get_session)):
-    """Create a new client."""
+async def create_client(data: ClientPost, session: Session = Depends(get_session)):
+    """Create a new client.
+    
+    With group commit, the request awaits its group without holding a worker thread.
+    """
     try:
-        client = service.create(data=data, session=session)
-        return client
+        if service.group_commit:
+            return await service.create_grouped(data=data, session=session)
+        return await run_in_threadpool(service.create, data=data, session=session)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except TimeoutError as e:
+        # Group commit saturé ou bloqué
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
@@ -50,6 +235,62 @@ def create_client(data: ClientPost, session: Session = Depends(get_session)):
         )
 
 
+@router.post("/bulk", response_model=ClientImportReport)
+async def import_clients(
+    request: Request,
+    format: Literal["ndjson", "csv"] | None = Query(default=None, description="Body format, defaults to the Content-Type"),
+    batch_size: int = Query(default=1000, ge=1, le=10000, description="Number of rows per insert transaction"),
+    session: Session = Depends(get_session)
+):
+    """Import clients from a streamed NDJSON or CSV body.
+    
+    Rows are inserted in batches, one transaction per batch. Invalid rows are
+    reported with their line number and do not abort the import.
+    """
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    
+    report = ClientImportReport()
+    batch = []
+    async for line, record, error in iter_records(request.stream(), format):
+        if error is None:
+            try:
+                batch.append((line, service.prepare_import_row(record)))
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            report.failed += 1
+            report.errors.append(ClientImportError(line=line, error=error))
+        if len(batch) >= batch_size:
+            await run_in_threadpool(service.import_batch, batch, report, session)
+            batch = []
+    await run_in_threadpool(service.import_batch, batch, report, session)
+    return report
+
+
+@router.patch("/bulk", response_model=ClientBulkResult)
+def update_clients(
+    request: ClientBulkPatch,
+    chunk_size: int = Query(default=1000, ge=1, le=10000, description="Number of rows per UPDATE statement"),
+    session: Session = Depends(get_session)
+):
+    """Apply the same partial update to the clients selected by ids or by filter."""
+    try:
+        return service.patch_many(request=request, session=session, chunk_size=chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.delete("/bulk", response_model=ClientBulkResult)
+def delete_clients(
+    request: ClientBulkTarget,
+    chunk_size: int = Query(default=1000, ge=1, le=10000, description="Number of rows per DELETE statement"),
+    session: Session = Depends(get_session)
+):
+    """Delete the clients selected by ids or by filter; clients that still have orders are kept."""
+    return service.delete_many(request=request, session=session, chunk_size=chunk_size)
+
+
 @router.patch("/{client_id}", response_model=ClientPublic)
 def update_client(
     client_id: int, 
@@ -71,8 +312,11 @@ def update_client(
 
 @router.delete("/{client_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_client(client_id: int, session: Session = Depends(get_session)):
-    """Delete a client by ID."""
-    success = service.delete(id=client_id, session=session)
+    """Delete a client by ID, refused while the client still has orders."""
+    try:
+        success = service.delete(id=client_id, session=session)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
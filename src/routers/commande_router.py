@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlmodel import Session
+
+from ..database import get_session
+from ..models import CommandePost, CommandePatch, CommandePublic
+from ..services import CommandeService as service
+
+
+router = APIRouter(
+    prefix="/orders",
+    tags=["orders"],
+    responses={404: {"description": "Not found"}}
+)
+
+
+@router.get("/", response_model=list[CommandePublic])
+def get_orders(
+    client_id: int = Query(description="Client whose orders are returned"),
+    limit: int = Query(default=10, ge=1, le=100, description="Number of orders to return"),
+    offset: int = Query(default=0, ge=0, description="Number of orders to skip"),
+    session: Session = Depends(get_session)
+):
+    """Retrieve the orders of a client, most recent first."""
+    return service.get_by_client(codcli=client_id, limit=limit, offset=offset, session=session)
+
+
+@router.get("/{order_id}", response_model=CommandePublic)
+def get_order_by_id(order_id: int, session: Session = Depends(get_session)):
+    """Retrieve a specific order with its lines."""
+    commande = service.get_by_id(id=order_id, session=session)
+    if not commande:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Order with ID {order_id} not found"
+        )
+    return commande
+
+
+@router.post("/", response_model=CommandePublic, status_code=status.HTTP_201_CREATED)
+def create_order(data: CommandePost, session: Session = Depends(get_session)):
+    """Create an order: the header and all its lines are written in one transaction."""
+    try:
+        return service.create(data=data, session=session)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.patch("/{order_id}", response_model=CommandePublic)
+def update_order(order_id: int, data: CommandePatch, session: Session = Depends(get_session)):
+    """Update an order header; when `lignes` is given, all the lines are replaced."""
+    try:
+        commande = service.patch(id=order_id, data=data, session=session)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not commande:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Order with ID {order_id} not found"
+        )
+    return commande
+
+
+@router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_order(order_id: int, session: Session = Depends(get_session)):
+    """Delete an order and its lines."""
+    if not service.delete(id=order_id, session=session):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Order with ID {order_id} not found"
+        )
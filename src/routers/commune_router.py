@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+
+from ..database import get_session
+from ..models import CommuneSearchResult, CommunePublic, CommunePost, CommunePatch
+from ..services import CommuneService as service, commune_crud
+from .crud_router import crud_router
+
+
+router = APIRouter(
+    prefix="/communes",
+    tags=["communes"],
+    responses={404: {"description": "Not found"}}
+)
+
+
+@router.get("/search", response_model=list[CommuneSearchResult])
+def search_communes(
+    q: str = Query(min_length=1, max_length=50, description="Postal code or city name prefix"),
+    limit: int = Query(default=10, ge=1, le=50, description="Number of communes to return"),
+    session: Session = Depends(get_session)
+):
+    """Autocomplete communes by postal code or accent-insensitive city name."""
+    return service.search(q=q, limit=limit, session=session)
+
+
+@router.get("/postal-codes/{postal_code}", response_model=list[CommuneSearchResult])
+def get_communes_by_postal_code(postal_code: str, session: Session = Depends(get_session)):
+    """Retrieve the communes sharing a postal code."""
+    return service.get_by_postal_code(postal_code=postal_code, session=session)
+
+
+# CRUD générique, après les routes spécifiques pour qu'elles restent prioritaires sur /{id}
+router.include_router(crud_router(commune_crud, CommunePublic, CommunePost, CommunePatch, name="Commune"))
@@ -0,0 +1,139 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from pydantic import TypeAdapter, create_model
+from sqlmodel import Session, SQLModel
+
+from ..database import get_session
+from ..models import BulkTarget, BulkResult, Count
+from ..models.projection import projection_list_adapter, projection_model
+from ..services import CrudService
+from .fast_response import FastJSONResponse, FAST_RESPONSE_TRUSTED, render_rows
+
+
+def crud_router(
+    service: CrudService,
+    public_model: type[SQLModel],
+    post_model: type[SQLModel],
+    patch_model: type[SQLModel],
+    name: str,
+) -> APIRouter:
+    """Build the list, detail, create, update, delete and bulk routes of a CrudService.
+
+    The routes follow the client semantics: offset or cursor pagination with
+    X-Total-Count and X-Next-Cursor headers, `fields` projection and bulk
+    updates/deletes by ids or filter. Response adapters and models are
+    built here, once, so each route costs the same per request as a
+    hand-written one.
+
+    Args:
+        service (CrudService): The service of the table.
+        public_model (type[SQLModel]): The response schema.
+        post_model (type[SQLModel]): The creation payload schema.
+        patch_model (type[SQLModel]): The partial update payload schema.
+        name (str): The record name used in error messages.
+    """
+    router = APIRouter()
+    list_adapter = None if FAST_RESPONSE_TRUSTED else TypeAdapter(list[public_model])
+    bulk_patch_model = create_model(f"{public_model.__name__}BulkPatch", __base__=BulkTarget, data=(patch_model, ...))
+
+    def not_found(id: int) -> HTTPException:
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"{name} with ID {id} not found")
+
+    @router.get("/", response_model=list[public_model])
+    def get_all(
+        limit: int = Query(default=10, ge=1, le=100, description="Number of records to return"),
+        offset: int = Query(default=0, ge=0, description="Number of records to skip"),
+        cursor: str | None = Query(default=None, description="Opaque cursor returned in X-Next-Cursor"),
+        fields: str | None = Query(default=None, description="Comma separated fields to return, the id is always included"),
+        session: Session = Depends(get_session)
+    ):
+        """Retrieve the records with offset or cursor (keyset) pagination, in id order."""
+        try:
+            projection = service.parse_fields(fields)
+            rows, next_cursor = service.get_page(limit=limit, offset=offset, cursor=cursor, fields=projection, session=session)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        headers = {"X-Total-Count": str(service.count(session=session).count)}
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        adapter = list_adapter
+        if projection is not None and not FAST_RESPONSE_TRUSTED:
+            adapter = projection_list_adapter(public_model, projection)
+        return FastJSONResponse(render_rows(rows, adapter), headers=headers)
+
+    @router.get("/count", response_model=Count)
+    def count(session: Session = Depends(get_session)):
+        """Total number of records."""
+        return service.count(session=session)
+
+    @router.get("/{id}", response_model=public_model)
+    def get_by_id(
+        id: int,
+        fields: str | None = Query(default=None, description="Comma separated fields to return, the id is always included"),
+        session: Session = Depends(get_session)
+    ):
+        """Retrieve a record by ID."""
+        try:
+            projection = service.parse_fields(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        record = service.get_by_id(id=id, fields=projection, session=session)
+        if not record:
+            raise not_found(id)
+        if projection:
+            return FastJSONResponse(projection_model(public_model, projection).model_validate(record).model_dump_json().encode())
+        return record
+
+    @router.post("/", response_model=public_model, status_code=status.HTTP_201_CREATED)
+    def create(data: post_model, session: Session = Depends(get_session)):
+        """Create a record."""
+        try:
+            return service.create(data=data, session=session)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    @router.patch("/bulk", response_model=BulkResult)
+    def update_many(
+        request: bulk_patch_model,
+        chunk_size: int = Query(default=1000, ge=1, le=10000, description="Number of rows per UPDATE statement"),
+        session: Session = Depends(get_session)
+    ):
+        """Apply the same partial update to the records selected by ids or by filter."""
+        try:
+            return service.patch_many(target=request, data=request.data, session=session, chunk_size=chunk_size)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    @router.delete("/bulk", response_model=BulkResult)
+    def delete_many(
+        request: BulkTarget,
+        chunk_size: int = Query(default=1000, ge=1, le=10000, description="Number of rows per DELETE statement"),
+        session: Session = Depends(get_session)
+    ):
+        """Delete the records selected by ids or by filter."""
+        try:
+            return service.delete_many(target=request, session=session, chunk_size=chunk_size)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    @router.patch("/{id}", response_model=public_model)
+    def update(id: int, data: patch_model, session: Session = Depends(get_session)):
+        """Update a record partially."""
+        try:
+            record = service.patch(id=id, data=data, session=session)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if not record:
+            raise not_found(id)
+        return record
+
+    @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
+    def delete(id: int, session: Session = Depends(get_session)):
+        """Delete a record by ID."""
+        try:
+            deleted = service.delete(id=id, session=session)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if not deleted:
+            raise not_found(id)
+
+    return router
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+from sqlmodel import Session
+
+from ..database import get_session
+from ..models import CommuneSearchResult, DepartementPublic, DepartementPost, DepartementPatch
+from ..services import CommuneService as service, departement_crud
+from .crud_router import crud_router
+
+
+router = APIRouter(
+    prefix="/departements",
+    tags=["departements"],
+    responses={404: {"description": "Not found"}}
+)
+
+
+@router.get("/{department_code}/communes", response_model=list[CommuneSearchResult])
+def get_departement_communes(department_code: str, session: Session = Depends(get_session)):
+    """Retrieve the communes of a departement."""
+    return service.get_by_department_code(department_code=department_code, session=session)
+
+
+# CRUD générique, après les routes spécifiques pour qu'elles restent prioritaires sur /{id}
+router.include_router(crud_router(departement_crud, DepartementPublic, DepartementPost, DepartementPatch, name="Departement"))
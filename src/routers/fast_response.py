@@ -0,0 +1,49 @@
+import json
+import os
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : repli sur le module json standard
+    orjson = None
+
+
+# Routeurs servant leurs listes par le chemin rapide, ex. FAST_RESPONSE_ROUTERS=clients
+FAST_RESPONSE_ROUTERS = {name.strip() for name in os.environ.get("FAST_RESPONSE_ROUTERS", "").split(",") if name.strip()}
+
+# Données issues de la base considérées sûres : pas de validation pydantic du tout
+FAST_RESPONSE_TRUSTED = os.environ.get("FAST_RESPONSE_TRUSTED", "0").lower() in ("1", "true", "yes")
+
+
+def fast_response_enabled(router_name: str) -> bool:
+    return router_name in FAST_RESPONSE_ROUTERS
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=str)
+    return json.dumps(content, default=str, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with orjson when available, bypassing FastAPI's jsonable_encoder."""
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def render_rows(rows: list[dict], adapter: TypeAdapter | None = None) -> bytes:
+    """Serialize plain rows to JSON bytes.
+    
+    With an adapter, the rows are validated once against the public schema and
+    dumped by pydantic's JSON serializer; without, they are trusted and encoded as is.
+    """
+    if adapter is None:
+        return dumps(rows)
+    return adapter.dump_json(adapter.validate_python(rows))
@@ -0,0 +1,47 @@
+import hashlib
+
+from fastapi import Request, Response, status
+
+# Les terminaux peuvent garder la réponse mais doivent la revalider (If-None-Match) à chaque fois
+CACHE_CONTROL = "private, no-cache"
+
+
+def client_etag(client_id: int, version: int, variant: str = "") -> str:
+    """Strong ETag of a client representation, from its row version.
+    
+    `variant` distinguishes the representations of the same row (e.g. a field projection).
+    """
+    if variant:
+        variant = "-" + hashlib.blake2b(variant.encode(), digest_size=4).hexdigest()
+    return f'"{client_id}-{version}{variant}"'
+
+
+def page_etag(rows, *params) -> str:
+    """Weak ETag of a page, from the (client_id, version) of its rows and the query parameters."""
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update(repr(params).encode())
+    for client_id, version in rows:
+        digest.update(f"{client_id}:{version};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _opaque(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Weak comparison of `etag` with the If-None-Match header, as required for GET (RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag.strip()) for tag in header.split(",")}
+
+
+def not_modified(etag: str, headers: dict | None = None) -> Response:
+    """304 response: no body, so nothing is serialized."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={**(headers or {}), "ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel import Session
+
+from ..database import get_session
+from ..models import ShippingQuoteRequest, ShippingQuote
+from ..services import ShippingService as service
+
+
+router = APIRouter(
+    prefix="/shipping",
+    tags=["shipping"],
+)
+
+
+@router.post("/quote", response_model=list[ShippingQuote])
+def quote_shipping(request: ShippingQuoteRequest, session: Session = Depends(get_session)):
+    """Price the stamps of a batch of orders (by id) or of raw weights.
+    
+    With `update`, the computed stamps are saved on the orders.
+    """
+    try:
+        return service.quote(request=request, session=session)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterable, Iterator
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a streamed request body into decoded lines without buffering it whole."""
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig").rstrip("\r")
+
+
+async def iter_records(stream: AsyncIterator[bytes], fmt: str) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    """Yield (line number, record, parse error) from an NDJSON or CSV body.
+    
+    CSV bodies must start with a header line and hold one record per line.
+    Empty CSV cells are read as null.
+    """
+    header = None
+    line_no = 0
+    async for line in iter_lines(stream):
+        line_no += 1
+        if not line.strip():
+            continue
+        if fmt == "csv":
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            if len(values) != len(header):
+                yield line_no, None, f"Expected {len(header)} columns, got {len(values)}"
+                continue
+            yield line_no, {key: (value if value != "" else None) for key, value in zip(header, values)}, None
+        else:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None, "Expected a JSON object"
+                continue
+            yield line_no, record, None
+
+
+def encode_ndjson(columns: list[str], chunks: Iterable[list[tuple]]) -> Iterator[bytes]:
+    """Serialize chunks of rows to NDJSON, one bytes block per chunk."""
+    for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=str, ensure_ascii=False) + "\n" for row in rows
+        ).encode()
+
+
+def encode_csv(columns: list[str], chunks: Iterable[list[tuple]]) -> Iterator[bytes]:
+    """Serialize chunks of rows to CSV (with header), one bytes block per chunk."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
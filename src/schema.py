@@ -0,0 +1,143 @@
+import hashlib
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Engine, MetaData, String, Table, inspect, literal, select
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlmodel import SQLModel
+
+logger = logging.getLogger("uvicorn.error")
+
+# Table de version du schéma, hors de SQLModel.metadata pour ne pas entrer dans l'empreinte
+version_metadata = MetaData()
+schema_version = Table(
+    "t_schema_version",
+    version_metadata,
+    Column("fingerprint", String(64), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def schema_fingerprint(metadata: MetaData = SQLModel.metadata) -> str:
+    """Compute a stable hash of the tables, columns, indexes and foreign keys of `metadata`.
+    
+    Args:
+        metadata (MetaData): The metadata describing the expected schema.
+    
+    Returns:
+        str: The sha256 hex digest of the schema description.
+    """
+    parts = []
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        parts.append(f"T {table.name}")
+        for column in table.columns:
+            parts.append(f"C {column.name} {column.type} {column.nullable} {column.primary_key}")
+        for fk in sorted(table.foreign_keys, key=lambda fk: fk.target_fullname):
+            parts.append(f"F {fk.parent.name} {fk.target_fullname}")
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            parts.append(f"I {index.name} {[c.name for c in index.columns]} {index.unique}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def _stored_fingerprint(engine: Engine) -> str | None:
+    try:
+        with engine.connect() as connection:
+            return connection.execute(select(schema_version.c.fingerprint)).scalar()
+    except (OperationalError, ProgrammingError):
+        # Table de version absente : base vierge ou créée avant cette gestion
+        return None
+
+
+def _store_fingerprint(engine: Engine, fingerprint: str) -> None:
+    version_metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(schema_version.delete())
+        connection.execute(
+            schema_version.insert().values(fingerprint=fingerprint, applied_at=datetime.now(timezone.utc))
+        )
+
+
+def _column_ddl(engine: Engine, column: Column) -> str:
+    """Column specification of an ALTER TABLE ... ADD COLUMN, with a default filling the existing rows.
+    
+    Raises:
+        RuntimeError: If the column cannot be added automatically.
+    """
+    if column.primary_key:
+        raise RuntimeError(f"Cannot add the primary key column {column.table.name}.{column.name}, migrate it by hand")
+    spec = engine.dialect.ddl_compiler(engine.dialect, None).get_column_specification(column)
+    if column.server_default is None and not column.nullable:
+        default = column.default.arg if column.default is not None and column.default.is_scalar else None
+        if default is None:
+            raise RuntimeError(f"Cannot add {column.table.name}.{column.name}: NOT NULL without default, migrate it by hand")
+        spec += " DEFAULT " + str(literal(default, column.type).compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    return spec
+
+
+def _add_missing_columns(engine: Engine, metadata: MetaData) -> list[str]:
+    """Add the model columns missing from the existing tables, with their indexes.
+    
+    Existing columns are never altered or dropped.
+    
+    Returns:
+        list[str]: The added columns, as table.column.
+    """
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    preparer = engine.dialect.identifier_preparer
+    added = []
+    with engine.begin() as connection:
+        for table in metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+            present = {column["name"] for column in inspector.get_columns(table.name)}
+            missing = [column for column in table.columns if column.name not in present]
+            for column in missing:
+                connection.exec_driver_sql(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {_column_ddl(engine, column)}")
+                added.append(f"{table.name}.{column.name}")
+            for index in table.indexes:
+                if any(column in missing for column in index.columns):
+                    index.create(connection)
+    return added
+
+
+def ensure_schema(engine: Engine, metadata: MetaData = SQLModel.metadata) -> bool:
+    """Verify the schema at startup and bring it up to date without touching data.
+    
+    When the stored fingerprint matches, a single SELECT is issued. Otherwise the
+    missing tables are created, the columns missing from existing tables are
+    added (ALTER TABLE ... ADD COLUMN, with their default) and the new
+    fingerprint is stored. Existing columns are not altered.
+    
+    Returns:
+        bool: True if the schema was already up to date, False if it was updated.
+    
+    Raises:
+        RuntimeError: If a missing column cannot be added automatically.
+    """
+    fingerprint = schema_fingerprint(metadata)
+    stored = _stored_fingerprint(engine)
+    if stored == fingerprint:
+        return True
+    
+    try:
+        metadata.create_all(engine, checkfirst=True)
+        added = _add_missing_columns(engine, metadata)
+    except (OperationalError, ProgrammingError):
+        # Un autre worker a migré les tables en même temps : on revérifie
+        if _stored_fingerprint(engine) == fingerprint:
+            return True
+        raise
+    if added:
+        logger.warning("Added the missing columns %s", ", ".join(added))
+    if stored is not None:
+        logger.warning("Schema fingerprint changed: existing columns are not altered, check their types by hand")
+    _store_fingerprint(engine, fingerprint)
+    return False
+
+
+def reset_schema(engine: Engine, metadata: MetaData = SQLModel.metadata) -> None:
+    """Drop and recreate every table. Destroys all the data."""
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    _store_fingerprint(engine, schema_fingerprint(metadata))
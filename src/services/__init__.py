@@ -1 +1,8 @@
-from .client_service import ClientService
\ No newline at end of file
+from .client_service import ClientService
+from .client_async_service import AsyncClientService
+from .client_dedup_service import ClientDedupService
+from .commune_service import CommuneService, commune_crud, departement_crud
+from .crud_service import CrudService
+from .commande_service import CommandeService
+from .shipping_service import ShippingService
+from .sales_service import SalesService
@@ -18,11 +18,12 @@ class AbstractService(ABC):
     
     @staticmethod
     @abstractmethod
-    def get_all(limit: int, session: Session):
-        """Retrieve all records with an optional limit.
+    def get_all(limit: int, offset: int, session: Session):
+        """Retrieve all records with pagination.
         
         Args:
             limit (int): The maximum number of records to retrieve.
+            offset (int): The number of records to skip.
             session (Session): The database session.
         
         Returns:
@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class CacheBackend(ABC):
+    """Interface of the cache backends used by the services.
+    
+    The default backend is an in-process LRU. A shared backend (Redis,
+    memcached...) can implement this interface so that every worker sees the
+    same entries and invalidations.
+    """
+    
+    @abstractmethod
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value, or None on a miss."""
+        pass
+    
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value."""
+        pass
+    
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        """Invalidate a key, if present."""
+        pass
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Invalidate every key."""
+        pass
+    
+    @abstractmethod
+    def stats(self) -> dict:
+        """Return the hit/miss/eviction counters."""
+        pass
+
+
+class LRUCache(CacheBackend):
+    """Thread-safe in-process LRU cache with a time-to-live per entry."""
+    
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": type(self).__name__,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class NullCache(CacheBackend):
+    """Backend that never stores anything, used when the cache is disabled."""
+    
+    def get(self, key: Hashable) -> Any | None:
+        return None
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        pass
+    
+    def delete(self, key: Hashable) -> None:
+        pass
+    
+    def clear(self) -> None:
+        pass
+    
+    def stats(self) -> dict:
+        return {"backend": type(self).__name__}
+
+
+def cache_from_env(prefix: str) -> CacheBackend:
+    """Build the default cache of a service from `<prefix>_CACHE_SIZE` and `<prefix>_CACHE_TTL`.
+    
+    A size of 0 disables the cache.
+    """
+    maxsize = int(os.environ.get(f"{prefix}_CACHE_SIZE", "10000"))
+    ttl = float(os.environ.get(f"{prefix}_CACHE_TTL", "60"))
+    if maxsize <= 0:
+        return NullCache()
+    return LRUCache(maxsize=maxsize, ttl=ttl)
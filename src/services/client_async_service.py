@@ -0,0 +1,121 @@
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..repositories import AsyncClientRepository as repository
+from ..models import ClientPublic, ClientPost, ClientPatch, ClientCount
+from .client_service import ClientService
+from .pagination import decode_cursor, next_cursor
+
+
+class AsyncClientService:
+    """Asynchronous counterpart of ClientService, used when DB_ASYNC is enabled."""
+    
+    @staticmethod
+    def parse_expand(expand: str | None) -> frozenset:
+        return ClientService.parse_expand(expand)
+    
+    @staticmethod
+    async def count(session: AsyncSession) -> ClientCount:
+        # Même compteur que le service synchrone
+        value = ClientService.counter.current()
+        if value is None:
+            value = await repository.count(session)
+            ClientService.counter.set(value)
+        return ClientCount(count=value)
+    
+    @staticmethod
+    def parse_fields(fields: str | None) -> tuple[str, ...] | None:
+        return ClientService.parse_fields(fields)
+    
+    @staticmethod
+    def project(rows: list[dict], fields: tuple[str, ...] | None) -> list[dict]:
+        return ClientService.project(rows, fields)
+    
+    @staticmethod
+    def row_versions(rows: list) -> list[tuple[int, int]]:
+        return ClientService.row_versions(rows)
+    
+    @staticmethod
+    async def get_page_rows(
+        limit: int,
+        session: AsyncSession,
+        offset: int = 0,
+        cursor: str | None = None,
+        order_by: str = "client_id",
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Plain dict rows of a page (see ClientService.get_page_rows)."""
+        after = None
+        if cursor is not None:
+            if offset:
+                raise ValueError("offset and cursor cannot be combined")
+            after = decode_cursor(cursor, order_by)
+        columns = ClientService._page_columns(fields, order_by)
+        rows = await repository.get_rows(limit=limit, offset=offset, after=after, order_by=order_by, columns=columns, session=session)
+        return rows, next_cursor(rows, limit, order_by)
+    
+    @staticmethod
+    async def get_fields_by_id(id: int, fields: tuple[str, ...], session: AsyncSession) -> dict | None:
+        columns = fields if "version" in fields else fields + ("version",)
+        cached = ClientService.cache.get(id)
+        if cached is not None:
+            return cached.model_dump(include=set(columns))
+        return await repository.get_row(id=id, columns=columns, session=session)
+    
+    @staticmethod
+    async def get_all(limit: int, offset: int, session: AsyncSession):
+        return await repository.get_all(limit=limit, offset=offset, session=session)
+    
+    @staticmethod
+    async def get_page(
+        limit: int,
+        session: AsyncSession,
+        offset: int = 0,
+        cursor: str | None = None,
+        order_by: str = "client_id",
+        expand: frozenset = frozenset(),
+    ):
+        """Return a page of clients and the cursor of the next page (see ClientService.get_page)."""
+        if cursor is not None:
+            if offset:
+                raise ValueError("offset and cursor cannot be combined")
+            after = decode_cursor(cursor, order_by)
+            clients = await repository.get_after(limit=limit, after=after, session=session, order_by=order_by, expand=expand)
+        else:
+            clients = await repository.get_all(limit=limit, offset=offset, session=session, order_by=order_by, expand=expand)
+        return [ClientService.to_public(client, expand) for client in clients], next_cursor(clients, limit, order_by)
+    
+    @staticmethod
+    async def get_by_id(id: int, session: AsyncSession, expand: frozenset = frozenset()):
+        if expand:
+            client = await repository.get_by_id(id=id, session=session, expand=expand)
+            return ClientService.to_public(client, expand) if client else None
+        # Même cache que le service synchrone
+        client = ClientService.cache.get(id)
+        if client is None:
+            client = await repository.get_by_id(id=id, session=session)
+            if client is None:
+                return None
+            client = ClientPublic.model_validate(client)
+            ClientService.cache.set(id, client)
+        return client
+    
+    @staticmethod
+    async def create(data: ClientPost, session: AsyncSession):
+        data_traite = ClientService._traitement(data)
+        client = await repository.create(data=data_traite, session=session)
+        ClientService.counter.add(1)
+        return client
+    
+    @staticmethod
+    async def patch(id: int, data: ClientPatch, session: AsyncSession):
+        data_traite = ClientService._traitement(data)
+        client = await repository.patch(id=id, data=data_traite, session=session)
+        ClientService.cache.delete(id)
+        return client
+    
+    @staticmethod
+    async def delete(id: int, session: AsyncSession):
+        deleted = await repository.delete(id=id, session=session)
+        ClientService.cache.delete(id)
+        if deleted:
+            ClientService.counter.add(-1)
+        return deleted
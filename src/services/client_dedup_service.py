@@ -0,0 +1,209 @@
+import heapq
+import time
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+from typing import Iterator
+
+from sqlmodel import Session
+
+from ..models import ClientDuplicate, ClientDuplicateReport
+from ..repositories import ClientRepository as repository
+from ..text import normalize, normalize_email, normalize_phone, phonetic
+
+DEDUP_COLUMNS = (
+    "client_id", "firstname", "lastname", "commune_id",
+    "address_line_1", "address_line_2", "address_line_3", "email", "phone", "mobile_phone",
+)
+
+# Poids de chaque critère dans le score (total 1)
+WEIGHTS = {"lastname": 0.3, "firstname": 0.25, "address": 0.2, "contact": 0.25}
+
+# Valeur d'un critère absent chez l'un des deux clients : ni preuve ni contre-preuve
+NEUTRAL = 0.5
+
+
+def _prepare(row: dict) -> dict:
+    """Normalized fields and blocking keys of a client row."""
+    address = normalize(" ".join(filter(None, (row["address_line_1"], row["address_line_2"], row["address_line_3"]))))
+    record = {
+        "id": row["client_id"],
+        "commune_id": row["commune_id"],
+        "lastname": normalize(row["lastname"]),
+        "phonetic": phonetic(row["lastname"]),
+        "firstname": normalize(row["firstname"]),
+        "firstname_phonetic": phonetic(row["firstname"]),
+        "address": address,
+        "address_tokens": set(address.split()),
+        "email": normalize_email(row["email"]),
+        "phones": {phone for phone in (normalize_phone(row["phone"]), normalize_phone(row["mobile_phone"])) if phone},
+    }
+    record["contact_keys"] = ([f"e:{record['email']}"] if record["email"] else []) + [f"p:{phone}" for phone in record["phones"]]
+    # Clés de blocage au sein d'une commune : nom phonétique, adresse, email et téléphones
+    record["keys"] = record["contact_keys"] + ([f"n:{record['phonetic']}"] if record["phonetic"] else []) + (
+        [f"a:{address}"] if address else []
+    )
+    return record
+
+
+def _name_similarity(a: str, b: str, phonetic_a: str, phonetic_b: str) -> float:
+    if not a or not b:
+        return NEUTRAL
+    if a == b:
+        return 1.0
+    if phonetic_a and phonetic_a == phonetic_b:
+        return 0.9
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def score(a: dict, b: dict) -> ClientDuplicate:
+    """Weighted similarity of two prepared clients and the criteria they share."""
+    reasons = []
+    lastname = _name_similarity(a["lastname"], b["lastname"], a["phonetic"], b["phonetic"])
+    if lastname == 1.0:
+        reasons.append("same_lastname")
+    elif lastname == 0.9:
+        reasons.append("phonetic_lastname")
+    firstname = _name_similarity(a["firstname"], b["firstname"], a["firstname_phonetic"], b["firstname_phonetic"])
+    if firstname >= 0.9:
+        reasons.append("same_firstname")
+
+    address = NEUTRAL
+    if a["address_tokens"] and b["address_tokens"]:
+        address = len(a["address_tokens"] & b["address_tokens"]) / len(a["address_tokens"] | b["address_tokens"])
+        if address >= 0.8:
+            reasons.append("same_address")
+
+    contact = NEUTRAL
+    if a["email"] and a["email"] == b["email"]:
+        contact = 1.0
+        reasons.append("same_email")
+    if a["phones"] & b["phones"]:
+        contact = 1.0
+        reasons.append("same_phone")
+    if contact != 1.0 and a["email"] and b["email"]:
+        contact = 0.0
+
+    total = (
+        WEIGHTS["lastname"] * lastname + WEIGHTS["firstname"] * firstname
+        + WEIGHTS["address"] * address + WEIGHTS["contact"] * contact
+    )
+    low, high = sorted((a["id"], b["id"]))
+    return ClientDuplicate(client_id=low, duplicate_id=high, score=round(total, 3), reasons=reasons)
+
+
+class ClientDedupService:
+    """Duplicate client detection by blocking, without comparing every pair of the table."""
+
+    @staticmethod
+    def _compare(a: dict, b: dict, seen: set, report: ClientDuplicateReport, min_score: float) -> ClientDuplicate | None:
+        pair = (a["id"], b["id"]) if a["id"] < b["id"] else (b["id"], a["id"])
+        if pair in seen:
+            return None
+        seen.add(pair)
+        report.pairs += 1
+        candidate = score(a, b)
+        if candidate.score < min_score:
+            return None
+        report.found += 1
+        return candidate
+
+    @staticmethod
+    def _compare_block(
+        members: list[dict], seen: set, report: ClientDuplicateReport, min_score: float, max_block: int
+    ) -> Iterator[ClientDuplicate]:
+        report.blocks += 1
+        if len(members) > max_block:
+            # Bloc trop grand (nom très courant) : ignoré pour garder un coût quasi linéaire
+            report.skipped_blocks += 1
+            return
+        for a, b in combinations(members, 2):
+            candidate = ClientDedupService._compare(a, b, seen, report, min_score)
+            if candidate is not None:
+                yield candidate
+
+    @staticmethod
+    def _compare_commune(group: list[dict], report: ClientDuplicateReport, min_score: float, max_block: int) -> Iterator[ClientDuplicate]:
+        blocks = defaultdict(list)
+        for record in group:
+            for key in record["keys"]:
+                blocks[key].append(record)
+        seen = set()
+        for members in blocks.values():
+            if len(members) > 1:
+                yield from ClientDedupService._compare_block(members, seen, report, min_score, max_block)
+
+    @staticmethod
+    def find(
+        session: Session,
+        report: ClientDuplicateReport,
+        min_score: float = 0.8,
+        chunk_size: int = 1000,
+        max_block: int = 50,
+    ) -> Iterator[ClientDuplicate]:
+        """Stream the clients once and yield the merge candidates scoring at least `min_score`.
+
+        Clients are read in commune order and compared within their commune
+        when they share a blocking key: phonetic lastname, normalized address,
+        email or phone. Clients of different communes, or without commune, are
+        paired by those contact keys only and compared at the end: each email
+        and phone keeps its first `max_block` owners, and a client is paired
+        with every owner outside its commune.
+
+        Besides the current commune, memory is O(distinct emails and phones)
+        for the owners, plus the cross-commune pairs found (at most
+        `max_block` per owner of a key). `report` is updated in place.
+        """
+        start = time.perf_counter()
+        # Hash de l'email ou du téléphone -> [(client, commune)], au plus max_block propriétaires
+        contacts: dict[int, list[tuple[int, int | None]]] = {}
+        cross_pairs: set[tuple[int, int]] = set()
+        group: list[dict] = []
+        current = None
+
+        for chunk in repository.stream_by_commune(session, DEDUP_COLUMNS, chunk_size=chunk_size):
+            for row in chunk:
+                record = _prepare(row._mapping)
+                report.scanned += 1
+                commune_id = record["commune_id"]
+                for key in record["contact_keys"]:
+                    owners = contacts.setdefault(hash(key), [])
+                    for owner_id, owner_commune in owners:
+                        # Même commune : déjà comparés par les blocs de la commune
+                        if owner_id != record["id"] and (owner_commune is None or owner_commune != commune_id):
+                            cross_pairs.add((owner_id, record["id"]))
+                    if len(owners) < max_block and (record["id"], commune_id) not in owners:
+                        owners.append((record["id"], commune_id))
+                if record["commune_id"] is None:
+                    continue
+                if record["commune_id"] != current:
+                    yield from ClientDedupService._compare_commune(group, report, min_score, max_block)
+                    group, current = [], record["commune_id"]
+                group.append(record)
+        yield from ClientDedupService._compare_commune(group, report, min_score, max_block)
+
+        # Paires entre communes différentes, relues par lots
+        pairs = sorted(cross_pairs)
+        seen = set()
+        for index in range(0, len(pairs), chunk_size):
+            batch = pairs[index:index + chunk_size]
+            ids = list({id for pair in batch for id in pair})
+            records = {row["client_id"]: _prepare(row) for row in repository.get_rows_by_ids(ids, session, DEDUP_COLUMNS)}
+            for a, b in batch:
+                if a in records and b in records:
+                    candidate = ClientDedupService._compare(records[a], records[b], seen, report, min_score)
+                    if candidate is not None:
+                        yield candidate
+
+        report.elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+        report.rows_per_second = round(report.scanned / (report.elapsed_ms / 1000), 1) if report.elapsed_ms else 0.0
+
+    @staticmethod
+    def report(
+        session: Session, min_score: float = 0.8, limit: int = 100, chunk_size: int = 1000, max_block: int = 50
+    ) -> ClientDuplicateReport:
+        """Run `find` over the whole table and keep the `limit` best candidates (memory bounded by `limit`)."""
+        report = ClientDuplicateReport()
+        candidates = ClientDedupService.find(session, report, min_score=min_score, chunk_size=chunk_size, max_block=max_block)
+        report.candidates = heapq.nlargest(limit, candidates, key=lambda candidate: candidate.score)
+        return report
@@ -1,10 +1,62 @@
+import asyncio
+import logging
+import os
+import time
+from pydantic import ValidationError
 from sqlmodel import Session
-from ..repositories import ClientRepository as repository
-from ..models import ClientPost, ClientPatch
+from ..database import reads_replica
+from ..repositories import ClientRepository as repository, ClientSearchRepository, ClientPointsRepository
+from ..models.projection import parse_fields
+from ..models import (
+    Client, ClientPublic, ClientExpanded, CommuneExpanded, ClientSearchResult, ClientPost, ClientPatch, ClientImportReport, ClientImportError,
+    ClientBulkTarget, ClientBulkPatch, ClientBulkResult, ClientCount, ClientPointsPublic,
+)
+from .cache import CacheBackend, cache_from_env
+from .counter import RowCounter
+from .group_commit import GroupCommitWriter
+from .pagination import CURSOR_KEYS, decode_cursor, next_cursor
+
+logger = logging.getLogger("uvicorn.error")
+
+# Budget de latence de la recherche client, au-delà une alerte est journalisée
+SEARCH_BUDGET_MS = float(os.environ.get("CLIENT_SEARCH_BUDGET_MS", "50"))
+
+# Relations chargeables via ?expand= (departement implique commune)
+EXPANDABLE = ("commune", "departement")
 
 
 class ClientService:
     
+    # Cache de lecture de get_by_id (LRU + TTL en mémoire par défaut, CLIENT_CACHE_SIZE=0 pour le désactiver)
+    cache: CacheBackend = cache_from_env("CLIENT")
+    
+    # Nombre total de clients (X-Total-Count), réconcilié avec COUNT(*) toutes les CLIENT_COUNT_RECONCILE_INTERVAL secondes
+    counter = RowCounter(reconcile_interval=float(os.environ.get("CLIENT_COUNT_RECONCILE_INTERVAL", "300")))
+    
+    # Group commit des créations (CLIENT_GROUP_COMMIT=1) : les POST concurrents partagent une transaction
+    group_commit = os.environ.get("CLIENT_GROUP_COMMIT", "0").lower() in ("1", "true", "yes")
+    # Attente maximale d'une création groupée, au-delà la requête échoue (503) au lieu de rester bloquée
+    group_commit_timeout = float(os.environ.get("CLIENT_GROUP_COMMIT_TIMEOUT_MS", "5000")) / 1000
+    _writers: dict = {}
+    
+    @staticmethod
+    def writer(engine) -> GroupCommitWriter:
+        """The group-commit writer of `engine`, created on first use."""
+        writer = ClientService._writers.get(engine)
+        if writer is None:
+            writer = ClientService._writers.setdefault(engine, GroupCommitWriter(
+                engine,
+                repository.create_group,
+                max_rows=int(os.environ.get("CLIENT_GROUP_COMMIT_MAX_ROWS", "100")),
+                max_delay=float(os.environ.get("CLIENT_GROUP_COMMIT_DELAY_MS", "2")) / 1000,
+            ))
+        return writer
+    
+    @staticmethod
+    def set_cache(backend: CacheBackend) -> None:
+        """Replace the client cache, e.g. by a backend shared between workers."""
+        ClientService.cache = backend
+    
     @staticmethod
     def _traitement(data: ClientPost | ClientPatch, patch: bool = True) -> dict:
         # Drop unset fields if patching
@@ -23,23 +75,318 @@ class ClientService:
         return data
     
     @staticmethod
-    def get_all(limit: int, session: Session):
-        return repository.get_all(limit=limit, session=session)
+    def parse_expand(expand: str | None) -> frozenset:
+        """Parse a comma separated `expand` parameter.
+        
+        Raises:
+            ValueError: If a relation cannot be expanded.
+        """
+        if not expand:
+            return frozenset()
+        relations = frozenset(part.strip() for part in expand.split(",") if part.strip())
+        unknown = relations - set(EXPANDABLE)
+        if unknown:
+            raise ValueError(f"Cannot expand {sorted(unknown)}, expected any of {list(EXPANDABLE)}")
+        return relations
+    
+    @staticmethod
+    def to_public(client: Client | ClientPublic, expand: frozenset = frozenset()) -> ClientPublic | ClientExpanded:
+        """Build the public schema of a client, with its eagerly loaded relations when expanded.
+        
+        Relations are only read when expanded, so that no lazy load is triggered.
+        """
+        if not expand:
+            return client if isinstance(client, ClientPublic) else ClientPublic.model_validate(client)
+        commune = None
+        if client.commune is not None and "departement" in expand:
+            commune = CommuneExpanded.model_validate(client.commune)
+        elif client.commune is not None:
+            commune = CommuneExpanded(**client.commune.model_dump())
+        return ClientExpanded(**ClientPublic.model_validate(client).model_dump(), commune=commune)
+    
+    @staticmethod
+    def count(session: Session, approximate: bool = False) -> ClientCount:
+        """Total number of clients, from the delta-maintained cache or the table statistics.
+        
+        Like the client cache, the counter is only seeded from the primary.
+        """
+        if approximate:
+            estimate = repository.estimate_count(session)
+            if estimate is not None:
+                return ClientCount(count=estimate, approximate=True)
+        value = ClientService.counter.current()
+        if value is None:
+            value = repository.count(session)
+            if not reads_replica(session):
+                ClientService.counter.set(value)
+        return ClientCount(count=value)
+    
+    @staticmethod
+    def get_all(limit: int, offset: int, session: Session):
+        return repository.get_all(limit=limit, offset=offset, session=session)
+    
+    @staticmethod
+    def get_page(
+        limit: int,
+        session: Session,
+        offset: int = 0,
+        cursor: str | None = None,
+        order_by: str = "client_id",
+        expand: frozenset = frozenset(),
+    ):
+        """Return a page of clients and the cursor of the next page (or None).
+        
+        Without cursor, classic offset paging is used. With a cursor, the page
+        is read by keyset so that deep pages cost the same as the first one.
+        Expanded relations are eagerly loaded with a constant number of queries.
+        """
+        if cursor is not None:
+            if offset:
+                raise ValueError("offset and cursor cannot be combined")
+            after = decode_cursor(cursor, order_by)
+            clients = repository.get_after(limit=limit, after=after, session=session, order_by=order_by, expand=expand)
+        else:
+            clients = repository.get_all(limit=limit, offset=offset, session=session, order_by=order_by, expand=expand)
+        return [ClientService.to_public(client, expand) for client in clients], next_cursor(clients, limit, order_by)
+    
+    @staticmethod
+    def parse_fields(fields: str | None) -> tuple[str, ...] | None:
+        """Parse a comma separated `fields` parameter; client_id is always included.
+        
+        Raises:
+            ValueError: If a field is not part of ClientPublic.
+        """
+        return parse_fields(ClientPublic, fields, required=("client_id",))
+    
+    @staticmethod
+    def _page_columns(fields: tuple[str, ...] | None, order_by: str) -> tuple[str, ...] | None:
+        """Selected columns: the projected fields plus the sort keys of the next cursor and the row version (ETag)."""
+        if fields is None:
+            return None
+        return fields + tuple(key for key in CURSOR_KEYS[order_by] + ("version",) if key not in fields)
     
     @staticmethod
-    def get_by_id(id: int, session: Session):
-        return repository.get_by_id(id=id, session=session)
+    def project(rows: list[dict], fields: tuple[str, ...] | None) -> list[dict]:
+        """Drop the columns that were only selected for the cursor and the ETag."""
+        if fields is None or (rows and rows[0].keys() == set(fields)):
+            return rows
+        return [{name: row[name] for name in fields} for row in rows]
+    
+    @staticmethod
+    def row_versions(rows: list) -> list[tuple[int, int]]:
+        """(client_id, version) of page rows, plain dicts or ClientPublic, for the page ETag."""
+        return [
+            (row["client_id"], row["version"]) if isinstance(row, dict) else (row.client_id, row.version)
+            for row in rows
+        ]
+    
+    @staticmethod
+    def get_page_rows(
+        limit: int,
+        session: Session,
+        offset: int = 0,
+        cursor: str | None = None,
+        order_by: str = "client_id",
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Same as get_page, but returns plain dict rows for the fast serialization path.
+        
+        With `fields`, only those columns are read from the database, plus the
+        sort keys and the version, to be dropped with `project` once the cursor
+        and the ETag are computed.
+        """
+        after = None
+        if cursor is not None:
+            if offset:
+                raise ValueError("offset and cursor cannot be combined")
+            after = decode_cursor(cursor, order_by)
+        columns = ClientService._page_columns(fields, order_by)
+        rows = repository.get_rows(limit=limit, offset=offset, after=after, order_by=order_by, columns=columns, session=session)
+        return rows, next_cursor(rows, limit, order_by)
+    
+    @staticmethod
+    def get_fields_by_id(id: int, fields: tuple[str, ...], session: Session) -> dict | None:
+        """Only `fields` (and the version) of a client: projected from the cache when hot, else a column-pruned SELECT."""
+        columns = fields if "version" in fields else fields + ("version",)
+        cached = ClientService.cache.get(id)
+        if cached is not None:
+            return cached.model_dump(include=set(columns))
+        return repository.get_row(id=id, columns=columns, session=session)
+    
+    @staticmethod
+    def search(q: str, limit: int, session: Session) -> list[ClientSearchResult]:
+        """Partial search on lastname, firstname, email and mobile phone, best matches first."""
+        start = time.perf_counter()
+        results = [
+            ClientSearchResult(**ClientPublic.model_validate(client).model_dump(), score=round(score, 3))
+            for client, score in ClientSearchRepository.search(q=q, limit=limit, session=session)
+        ]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms > SEARCH_BUDGET_MS:
+            logger.warning("Client search '%s' took %.1f ms (budget %.0f ms)", q, elapsed_ms, SEARCH_BUDGET_MS)
+        return results
+    
+    @staticmethod
+    def export(bind, newsletter: int | None = None, commune_id: int | None = None, chunk_size: int = 1000):
+        """Return the exported column names and an iterator over chunks of rows.
+        
+        The rows are read by a session of their own, opened on `bind` when the
+        iteration starts and closed when it ends: the stream outlives the
+        request session.
+        """
+        columns = [column.name for column in Client.__table__.columns]
+        
+        def chunks():
+            session = Session(bind)
+            try:
+                yield from repository.stream(session=session, chunk_size=chunk_size, newsletter=newsletter, commune_id=commune_id)
+            finally:
+                session.close()
+        
+        return columns, chunks()
+    
+    @staticmethod
+    def get_by_id(id: int, session: Session, expand: frozenset = frozenset()):
+        """Read-through lookup: hot clients are served from the cache without touching the database.
+        
+        Expanded lookups bypass the cache and load the relations eagerly. Only
+        reads from the primary fill the cache, so that a lagging replica never
+        hands a stale client to the requests that must see their own writes.
+        """
+        if expand:
+            client = repository.get_by_id(id=id, session=session, expand=expand)
+            return ClientService.to_public(client, expand) if client else None
+        client = ClientService.cache.get(id)
+        if client is None:
+            client = repository.get_by_id(id=id, session=session)
+            if client is None:
+                return None
+            client = ClientPublic.model_validate(client)
+            # Cache partagé par tout le processus : une lecture sur un réplica en retard ne le remplit pas
+            if not reads_replica(session):
+                ClientService.cache.set(id, client)
+        return client
+    
+    @staticmethod
+    def get_points(id: int, session: Session) -> ClientPointsPublic | None:
+        """Loyalty points balance of a client, read from the materialized t_client_points."""
+        points = ClientPointsRepository.get(client_id=id, session=session)
+        if points is None:
+            # Pas encore de solde : client sans commande, ou client inexistant
+            if not repository.exists(id=id, session=session):
+                return None
+            points = 0
+        return ClientPointsPublic(client_id=id, points=points)
     
     @staticmethod
     def create(data: ClientPost, session: Session):
+        """Create a client in its own transaction."""
+        client = repository.create(data=ClientService._traitement(data), session=session)
+        ClientService.counter.add(1)
+        return client
+    
+    @staticmethod
+    async def create_grouped(data: ClientPost, session: Session):
+        """Create a client in the next shared group-commit transaction.
+        
+        The request awaits its group on the event loop instead of holding a
+        threadpool worker, so the number of concurrent creations is not capped
+        by the thread limit. A row rejected by the database only fails its own
+        request; a failed commit fails every request of the group.
+        
+        Raises:
+            TimeoutError: If the group-commit writer did not answer within
+                `group_commit_timeout`. A row the writer had not taken yet is
+                not written; one already in a group may still be committed.
+        """
         data_traite = ClientService._traitement(data)
-        return repository.create(data=data_traite, session=session)
+        # Annuler l'attente annule aussi la ligne si le writer ne l'a pas encore prise
+        future = asyncio.wrap_future(ClientService.writer(session.get_bind()).submit(data_traite))
+        try:
+            client_id = await asyncio.wait_for(future, timeout=ClientService.group_commit_timeout)
+        except TimeoutError:
+            raise TimeoutError(f"Group commit did not answer within {ClientService.group_commit_timeout:g} s")
+        ClientService.counter.add(1)
+        return Client(**data_traite, client_id=client_id)
+    
+    @staticmethod
+    def prepare_import_row(raw: dict) -> dict:
+        """Validate a raw imported row and apply the same processing as `create`.
+        
+        Raises:
+            ValueError: If the row does not match the ClientPost schema.
+        """
+        try:
+            data = ClientPost.model_validate(raw)
+        except ValidationError as e:
+            details = "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            raise ValueError(details)
+        return ClientService._traitement(data, patch=False)
     
     @staticmethod
-    def patch(id: int, client_data: ClientPatch, session: Session):
-        data_traite = ClientService._traitement(client_data)
-        return repository.patch(id=id, data=data_traite, session=session)
+    def import_batch(batch: list[tuple[int, dict]], report: ClientImportReport, session: Session) -> None:
+        """Insert a batch of prepared rows and record the outcome in `report`.
+        
+        Args:
+            batch (list[tuple[int, dict]]): Pairs of (source line number, prepared row).
+            report (ClientImportReport): The report updated in place.
+            session (Session): The database session.
+        """
+        rows = [row for _, row in batch]
+        errors = repository.create_many(rows=rows, session=session)
+        for index, error in errors:
+            report.errors.append(ClientImportError(line=batch[index][0], error=error))
+        report.inserted += len(rows) - len(errors)
+        ClientService.counter.add(len(rows) - len(errors))
+        report.failed += len(errors)
+    
+    @staticmethod
+    def patch(id: int, data: ClientPatch, session: Session):
+        data_traite = ClientService._traitement(data)
+        client = repository.patch(id=id, data=data_traite, session=session)
+        ClientService.cache.delete(id)
+        return client
     
     @staticmethod
     def delete(id: int, session: Session):
-        return repository.delete(id=id, session=session)
\ No newline at end of file
+        deleted = repository.delete(id=id, session=session)
+        ClientService.cache.delete(id)
+        if deleted:
+            ClientService.counter.add(-1)
+        return deleted
+    
+    @staticmethod
+    def patch_many(request: ClientBulkPatch, session: Session, chunk_size: int = 1000) -> ClientBulkResult:
+        """Apply the same partial update to many clients with chunked set-based UPDATEs.
+        
+        `_traitement` runs once on the shared payload instead of once per client.
+        """
+        data_traite = ClientService._traitement(request.data)
+        if not data_traite:
+            raise ValueError("No field to update")
+        affected, ids = repository.patch_many(
+            data=data_traite,
+            session=session,
+            ids=request.ids,
+            criteria=request.criteria() if request.filter else None,
+            chunk_size=chunk_size,
+        )
+        for id in ids:
+            ClientService.cache.delete(id)
+        return ClientBulkResult(affected=affected)
+    
+    @staticmethod
+    def delete_many(request: ClientBulkTarget, session: Session, chunk_size: int = 1000) -> ClientBulkResult:
+        """Delete many clients with chunked set-based DELETEs."""
+        affected, ids = repository.delete_many(
+            session=session,
+            ids=request.ids,
+            criteria=request.criteria() if request.filter else None,
+            chunk_size=chunk_size,
+        )
+        for id in ids:
+            ClientService.cache.delete(id)
+        ClientService.counter.add(-affected)
+        return ClientBulkResult(affected=affected)
\ No newline at end of file
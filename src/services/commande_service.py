@@ -0,0 +1,204 @@
+from datetime import date
+from decimal import Decimal
+from sqlmodel import Session
+from ..repositories import CommandeRepository as repository, ObjetRepository, SalesRollupRepository
+from ..models import Commande, CommandePost, CommandePatch, CommandePublic, DetailPublic
+from .shipping_rates import shipping_rates
+
+
+class CommandeService:
+    
+    @staticmethod
+    def _conditionnement(regles: list, qte: int):
+        """Packaging rule of a line: the one whose quantity range contains `qte`."""
+        for regle in regles:
+            if regle.qteobjdeb <= qte <= regle.qteobjfin:
+                return regle
+        return None
+    
+    @staticmethod
+    def totaux(lignes, catalogue: dict) -> tuple[Decimal, Decimal]:
+        """Amount and weight of the lines: objets price and weight, plus the packaging of each line.
+        
+        A stored line whose objet is gone from the catalogue (deleted, or a
+        NULL codobj) counts for nothing.
+        """
+        montant, poids = Decimal("0"), Decimal("0")
+        for ligne in lignes:
+            if ligne.codobj not in catalogue:
+                continue
+            objet, regles = catalogue[ligne.codobj]
+            montant += objet.puobj * ligne.qte
+            poids += objet.poidsobj * ligne.qte
+            conditionnement = CommandeService._conditionnement(regles, ligne.qte)
+            if conditionnement is not None:
+                montant += conditionnement.prixcond
+                poids += conditionnement.poidscondit or 0
+        return montant, poids
+    
+    @staticmethod
+    def to_public(commande: Commande, catalogue: dict) -> CommandePublic:
+        montant, poids = CommandeService.totaux(commande.lignes, catalogue)
+        return CommandePublic(
+            **commande.model_dump(),
+            lignes=[DetailPublic.model_validate(ligne) for ligne in commande.lignes],
+            montant=montant,
+            poids=poids,
+        )
+    
+    @staticmethod
+    def _points(lignes, catalogue: dict) -> int:
+        """Loyalty points earned by the lines (none for a line whose objet is gone from the catalogue)."""
+        return sum(catalogue[ligne.codobj][0].points * ligne.qte for ligne in lignes if ligne.codobj in catalogue)
+    
+    @staticmethod
+    def _check_lignes(lignes, catalogue: dict) -> None:
+        """Raise a ValueError if a line references an unknown or unavailable objet."""
+        codobjs = {ligne.codobj for ligne in lignes}
+        missing = sorted(codobjs - catalogue.keys())
+        if missing:
+            raise ValueError(f"Unknown objets {missing}")
+        unavailable = sorted(codobj for codobj in codobjs if catalogue[codobj][0].indispobj)
+        if unavailable:
+            raise ValueError(f"Unavailable objets {unavailable}")
+    
+    @staticmethod
+    def _timbres(lignes, catalogue: dict, session: Session) -> dict:
+        """Stamps (timbrecde, timbrecli) priced from the weight of the lines."""
+        shipping_rates.ensure_fresh(session)
+        timbrecde, timbrecli = shipping_rates.quote(CommandeService.totaux(lignes, catalogue)[1])
+        return {"timbrecde": timbrecde, "timbrecli": timbrecli}
+    
+    @staticmethod
+    def _rollup(departement_id: int, datcde: date | None, montant: Decimal, sign: int = 1) -> list[dict]:
+        """Sales rollup delta of an order (none for an undated order)."""
+        if datcde is None:
+            return []
+        return [{"departement_id": departement_id, "month": datcde.replace(day=1), "revenue": sign * montant, "orders": sign}]
+    
+    @staticmethod
+    def _departement(commande: Commande, session: Session) -> int:
+        """Departement the order is counted under in the rollup.
+        
+        It is the one recorded at creation, so that a later change of the
+        client commune or of the commune departement does not move the order;
+        orders without one fall back to the current departement of the client.
+        """
+        if commande.departement_id is not None:
+            return commande.departement_id
+        codcli = commande.codcli
+        return SalesRollupRepository.departements_of({codcli}, session=session).get(codcli, 0) if codcli is not None else 0
+    
+    @staticmethod
+    def create(data: CommandePost, session: Session) -> CommandePublic:
+        """Create an order with all its lines.
+        
+        The objets and their packagings are prefetched in one query for the
+        whole order, then the header and lines are written in one transaction,
+        together with the client points balance. The stamps (timbrecde,
+        timbrecli) are priced from the order weight.
+        
+        Raises:
+            ValueError: If the client or an objet does not exist, or an objet is unavailable.
+        """
+        # Le département du client sert aussi de test d'existence
+        departements = SalesRollupRepository.departements_of({data.codcli}, session=session)
+        if data.codcli not in departements:
+            raise ValueError(f"Client with ID {data.codcli} not found")
+        
+        catalogue = ObjetRepository.get_catalogue({ligne.codobj for ligne in data.lignes}, session=session)
+        CommandeService._check_lignes(data.lignes, catalogue)
+        
+        header = data.model_dump(exclude={"lignes"})
+        header["datcde"] = header["datcde"] or date.today()
+        header.update(CommandeService._timbres(data.lignes, catalogue, session))
+        header["departement_id"] = departements[data.codcli]
+        codcde = repository.create(
+            header=header,
+            lignes=[ligne.model_dump() for ligne in data.lignes],
+            points=CommandeService._points(data.lignes, catalogue),
+            rollup=CommandeService._rollup(
+                departements[data.codcli], header["datcde"], CommandeService.totaux(data.lignes, catalogue)[0]
+            ),
+            session=session,
+        )
+        return CommandeService.to_public(repository.get_by_id(id=codcde, session=session), catalogue)
+    
+    @staticmethod
+    def patch(id: int, data: CommandePatch, session: Session) -> CommandePublic | None:
+        """Update an order header and optionally replace its lines.
+        
+        When the lines change, the stamps are repriced and the client balance
+        is adjusted by the difference of points; when the lines or the date
+        change, the order moves in the sales rollup. All in the same transaction.
+        
+        Raises:
+            ValueError: If a new line references an unknown or unavailable objet.
+        """
+        # Avancement du rattrapage des ventes verrouillé avant la commande, dans le même ordre que le rattrapage
+        counted = SalesRollupRepository.counts(id, session)
+        # Ligne de commande verrouillée : les modifications concurrentes partent des lignes à jour
+        commande = repository.get_by_id(id=id, session=session, lock=True)
+        if commande is None:
+            return None
+        values = data.model_dump(exclude_unset=True, exclude={"lignes"})
+        anciennes = list(commande.lignes)
+        codobjs = {ligne.codobj for ligne in anciennes} | {ligne.codobj for ligne in data.lignes or []}
+        catalogue = ObjetRepository.get_catalogue(codobjs, session=session)
+        lignes, points, rollup = None, 0, []
+        if data.lignes is not None:
+            CommandeService._check_lignes(data.lignes, catalogue)
+            values.update(CommandeService._timbres(data.lignes, catalogue, session))
+            lignes = [ligne.model_dump() for ligne in data.lignes]
+            points = CommandeService._points(data.lignes, catalogue) - CommandeService._points(anciennes, catalogue)
+        if data.lignes is not None or "datcde" in values:
+            departement_id = CommandeService._departement(commande, session)
+            values["departement_id"] = departement_id
+            # Commande pas encore agrégée par un rattrapage en cours : il la comptera telle que modifiée
+            if counted:
+                rollup = CommandeService._rollup(
+                    departement_id, commande.datcde, CommandeService.totaux(anciennes, catalogue)[0], sign=-1
+                ) + CommandeService._rollup(
+                    departement_id, values.get("datcde", commande.datcde), CommandeService.totaux(data.lignes or anciennes, catalogue)[0]
+                )
+        repository.patch(
+            id=id, codcli=commande.codcli, data=values, lignes=lignes, points=points, rollup=rollup, session=session
+        )
+        return CommandeService.to_public(repository.get_by_id(id=id, session=session), catalogue)
+    
+    @staticmethod
+    def delete(id: int, session: Session) -> bool:
+        """Delete an order and withdraw its points from the client balance."""
+        counted = SalesRollupRepository.counts(id, session)
+        commande = repository.get_by_id(id=id, session=session, lock=True)
+        if commande is None:
+            return False
+        catalogue = ObjetRepository.get_catalogue({ligne.codobj for ligne in commande.lignes}, session=session)
+        return repository.delete(
+            id=id,
+            codcli=commande.codcli,
+            points=CommandeService._points(commande.lignes, catalogue),
+            rollup=CommandeService._rollup(
+                CommandeService._departement(commande, session),
+                commande.datcde,
+                CommandeService.totaux(commande.lignes, catalogue)[0],
+                sign=-1,
+            ) if counted else [],
+            session=session,
+        )
+    
+    @staticmethod
+    def get_by_id(id: int, session: Session) -> CommandePublic | None:
+        commande = repository.get_by_id(id=id, session=session)
+        if commande is None:
+            return None
+        catalogue = ObjetRepository.get_catalogue({ligne.codobj for ligne in commande.lignes}, session=session)
+        return CommandeService.to_public(commande, catalogue)
+    
+    @staticmethod
+    def get_by_client(codcli: int, limit: int, offset: int, session: Session) -> list[CommandePublic]:
+        """A page of the orders of a client, with one catalogue query for the whole page."""
+        commandes = repository.get_by_client(codcli=codcli, limit=limit, offset=offset, session=session)
+        codobjs = {ligne.codobj for commande in commandes for ligne in commande.lignes}
+        catalogue = ObjetRepository.get_catalogue(codobjs, session=session)
+        return [CommandeService.to_public(commande, catalogue) for commande in commandes]
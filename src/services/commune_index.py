@@ -0,0 +1,119 @@
+import os
+from bisect import bisect_left
+
+from sqlmodel import Session
+
+from ..models import Commune, Departement, CommuneSearchResult
+from ..repositories import CommuneRepository as repository
+from ..text import normalize
+from .snapshot import ReloadableSnapshot
+
+
+def _prefix_range(keys: list[str], prefix: str) -> range:
+    """Indexes of the sorted `keys` starting with `prefix`."""
+    return range(bisect_left(keys, prefix), bisect_left(keys, prefix + "\uffff"))
+
+
+class CommuneSnapshot:
+    """One immutable build of the index: the communes and their sorted key arrays.
+    
+    The parallel key/id arrays of a snapshot always come from the same load,
+    so a reader holding a snapshot never pairs the keys of one build with the
+    ids of another.
+    """
+    
+    __slots__ = (
+        "communes", "by_department",
+        "postal_keys", "postal_ids", "name_keys", "name_ids", "token_keys", "token_ids",
+    )
+    
+    def __init__(self, rows=()):
+        communes = {}
+        by_department = {}
+        postal, names, tokens = [], [], []
+        for commune_id, city_name, postal_code, departement_id, department_code, department_name in rows:
+            # Données issues de la base : pas de revalidation pydantic
+            commune = CommuneSearchResult.model_construct(
+                id=commune_id,
+                city_name=city_name,
+                postal_code=postal_code,
+                departement_id=departement_id,
+                department_code=department_code,
+                department_name=department_name,
+            )
+            communes[commune.id] = commune
+            by_department.setdefault(commune.department_code, []).append(commune)
+            postal.append((commune.postal_code or "", commune.id))
+            name = normalize(commune.city_name)
+            names.append((name, commune.id))
+            # Chaque mot après le premier : "etienne" trouve "Saint-Étienne"
+            for index, char in enumerate(name):
+                if char == " ":
+                    tokens.append((name[index + 1:], commune.id))
+        postal.sort()
+        names.sort()
+        tokens.sort()
+        self.communes: dict[int, CommuneSearchResult] = communes
+        self.by_department: dict[str, list[CommuneSearchResult]] = by_department
+        self.postal_keys, self.postal_ids = [k for k, _ in postal], [i for _, i in postal]
+        self.name_keys, self.name_ids = [k for k, _ in names], [i for _, i in names]
+        self.token_keys, self.token_ids = [k for k, _ in tokens], [i for _, i in tokens]
+
+
+class CommuneIndex(ReloadableSnapshot):
+    """In-memory index of the communes for postal code lookups and city name autocomplete.
+    
+    Keys are kept in sorted arrays so that a prefix search is two binary
+    searches plus the returned slice. The whole CommuneSnapshot is rebuilt
+    when a Commune or Departement is written, or when the table signature
+    changes; lookups read it once and work on that snapshot only.
+    """
+    
+    def __init__(self, check_interval: float = 60.0):
+        super().__init__(CommuneSnapshot(), check_interval=check_interval)
+    
+    def signature(self, session: Session) -> tuple:
+        return repository.signature(session)
+    
+    def build(self, session: Session) -> CommuneSnapshot:
+        return CommuneSnapshot(repository.get_index_rows(session))
+    
+    def search(self, q: str, limit: int = 10) -> list[CommuneSearchResult]:
+        """Autocomplete on postal code (digits) or city name (accent and case insensitive).
+        
+        City names starting with `q` come first, then names with a word starting with `q`.
+        """
+        snapshot = self._snapshot
+        query = q.strip()
+        if query.isdigit():
+            ids = snapshot.postal_ids
+            found = [ids[i] for i in _prefix_range(snapshot.postal_keys, query)[:limit]]
+        else:
+            query = normalize(query)
+            if not query:
+                return []
+            found = [snapshot.name_ids[i] for i in _prefix_range(snapshot.name_keys, query)[:limit]]
+            if len(found) < limit:
+                seen = set(found)
+                for i in _prefix_range(snapshot.token_keys, query):
+                    commune_id = snapshot.token_ids[i]
+                    if commune_id not in seen:
+                        seen.add(commune_id)
+                        found.append(commune_id)
+                        if len(found) == limit:
+                            break
+        return [snapshot.communes[commune_id] for commune_id in found]
+    
+    def by_postal_code(self, postal_code: str) -> list[CommuneSearchResult]:
+        snapshot = self._snapshot
+        keys, ids = snapshot.postal_keys, snapshot.postal_ids
+        start = bisect_left(keys, postal_code)
+        end = bisect_left(keys, postal_code + "\x00")
+        return [snapshot.communes[ids[i]] for i in range(start, end)]
+    
+    def by_department_code(self, department_code: str) -> list[CommuneSearchResult]:
+        return self._snapshot.by_department.get(department_code, [])
+
+
+commune_index = CommuneIndex(check_interval=float(os.environ.get("COMMUNE_INDEX_CHECK_INTERVAL", "60")))
+commune_index.watch(Commune, Departement)
@@ -0,0 +1,29 @@
+from sqlmodel import Session
+from ..models import Commune, CommunePublic, Departement, DepartementPublic
+from ..repositories import CrudRepository
+from .commune_index import commune_index
+from .crud_service import CrudService
+
+
+class CommuneService:
+    """Commune lookups served from the in-memory CommuneIndex."""
+    
+    @staticmethod
+    def search(q: str, limit: int, session: Session):
+        commune_index.ensure_fresh(session)
+        return commune_index.search(q, limit=limit)
+    
+    @staticmethod
+    def get_by_postal_code(postal_code: str, session: Session):
+        commune_index.ensure_fresh(session)
+        return commune_index.by_postal_code(postal_code)
+    
+    @staticmethod
+    def get_by_department_code(department_code: str, session: Session):
+        commune_index.ensure_fresh(session)
+        return commune_index.by_department_code(department_code)
+
+
+# CRUD générique des tables de référence : chaque écriture invalide l'index des communes
+commune_crud = CrudService(CrudRepository(Commune), CommunePublic, on_write=commune_index.mark_dirty)
+departement_crud = CrudService(CrudRepository(Departement), DepartementPublic, on_write=commune_index.mark_dirty)
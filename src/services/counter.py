@@ -0,0 +1,36 @@
+import threading
+import time
+
+
+class RowCounter:
+    """Cached row count of a table, kept exact by write deltas and periodically reconciled.
+    
+    Deltas only cover the writes of the current process: the reconciliation
+    interval bounds the drift caused by other workers or external writes.
+    """
+    
+    def __init__(self, reconcile_interval: float = 300.0):
+        self.reconcile_interval = reconcile_interval
+        self._value: int | None = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+    
+    def current(self) -> int | None:
+        """Return the cached count, or None when it must be (re)loaded from the database."""
+        if self._value is None or time.monotonic() - self._loaded_at > self.reconcile_interval:
+            return None
+        return self._value
+    
+    def set(self, value: int) -> None:
+        with self._lock:
+            self._value = value
+            self._loaded_at = time.monotonic()
+    
+    def add(self, delta: int) -> None:
+        with self._lock:
+            if self._value is not None:
+                self._value = max(0, self._value + delta)
+    
+    def invalidate(self) -> None:
+        with self._lock:
+            self._value = None
@@ -0,0 +1,140 @@
+from typing import Callable
+
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, SQLModel
+
+from ..models import BulkTarget, BulkResult, Count
+from ..models.projection import parse_fields
+from ..repositories import CrudRepository
+from .abstract_service import AbstractService
+from .pagination import decode_cursor, next_cursor
+
+
+class CrudService(AbstractService):
+    """Generic AbstractService over a CrudRepository: pagination, projection and bulk operations.
+
+    Pages are read as plain rows in primary key order, by offset or keyset
+    cursor, like the client list. `on_write` is called after every write,
+    e.g. to invalidate an in-memory index built from the table.
+    """
+
+    def __init__(self, repository: CrudRepository, public_model: type[BaseModel], on_write: Callable[[], None] | None = None):
+        self.repository = repository
+        self.public_model = public_model
+        self.on_write = on_write
+        self.pk = repository.pk.name
+        # Curseur keyset sur la clé primaire, propre à ce service (CURSOR_KEYS reste celui des clients)
+        self.cursor_keys = (self.pk,)
+
+    def _written(self) -> None:
+        if self.on_write is not None:
+            self.on_write()
+
+    def _traitement(self, data: SQLModel) -> dict:
+        return data.model_dump(exclude_unset=True)
+
+    def _criteria(self, target: BulkTarget) -> dict | None:
+        if target.filter is None:
+            return None
+        criteria = target.criteria()
+        unknown = set(criteria) - set(self.repository.table.c.keys())
+        if unknown:
+            raise ValueError(f"Unknown filter columns {sorted(unknown)}")
+        return criteria
+
+    def parse_fields(self, fields: str | None) -> tuple[str, ...] | None:
+        return parse_fields(self.public_model, fields, required=(self.pk,))
+
+    def get_all(self, limit: int, offset: int, session: Session):
+        return self.repository.get_all(limit=limit, offset=offset, session=session)
+
+    def get_page(
+        self,
+        limit: int,
+        session: Session,
+        offset: int = 0,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Plain dict rows of a page and the cursor of the next one.
+
+        Raises:
+            ValueError: If the cursor is invalid or combined with an offset.
+        """
+        after = None
+        if cursor is not None:
+            if offset:
+                raise ValueError("offset and cursor cannot be combined")
+            (after,) = decode_cursor(cursor, self.pk, self.cursor_keys)
+        rows = self.repository.get_rows(limit=limit, session=session, offset=offset, after=after, columns=fields)
+        return rows, next_cursor(rows, limit, self.pk, self.cursor_keys)
+
+    def get_by_id(self, id: int, session: Session, fields: tuple[str, ...] | None = None):
+        if fields:
+            return self.repository.get_row(id=id, session=session, columns=fields)
+        return self.repository.get_by_id(id=id, session=session)
+
+    def count(self, session: Session) -> Count:
+        return Count(count=self.repository.count(session=session))
+
+    def create(self, data: SQLModel, session: Session):
+        try:
+            record = self.repository.create(data=self._traitement(data), session=session)
+        except IntegrityError as e:
+            session.rollback()
+            raise ValueError(str(e.orig))
+        self._written()
+        return record
+
+    def patch(self, id: int, data: SQLModel, session: Session):
+        try:
+            record = self.repository.patch(id=id, data=self._traitement(data), session=session)
+        except IntegrityError as e:
+            session.rollback()
+            raise ValueError(str(e.orig))
+        self._written()
+        return record
+
+    def delete(self, id: int, session: Session) -> bool:
+        """Delete a record.
+
+        Raises:
+            ValueError: If the record is still referenced by another table.
+        """
+        try:
+            deleted = self.repository.delete(id=id, session=session)
+        except IntegrityError as e:
+            session.rollback()
+            raise ValueError(str(e.orig))
+        self._written()
+        return deleted
+
+    def patch_many(self, target: BulkTarget, data: SQLModel, session: Session, chunk_size: int = 1000) -> BulkResult:
+        """Apply the same partial update to the records selected by ids or by filter."""
+        data_traite = self._traitement(data)
+        if not data_traite:
+            raise ValueError("No field to update")
+        try:
+            affected = self.repository.patch_many(
+                data=data_traite, session=session, ids=target.ids, criteria=self._criteria(target), chunk_size=chunk_size
+            )
+        except IntegrityError as e:
+            session.rollback()
+            raise ValueError(str(e.orig))
+        finally:
+            self._written()
+        return BulkResult(affected=affected)
+
+    def delete_many(self, target: BulkTarget, session: Session, chunk_size: int = 1000) -> BulkResult:
+        """Delete the records selected by ids or by filter."""
+        try:
+            affected = self.repository.delete_many(
+                session=session, ids=target.ids, criteria=self._criteria(target), chunk_size=chunk_size
+            )
+        except IntegrityError as e:
+            session.rollback()
+            raise ValueError(str(e.orig))
+        finally:
+            self._written()
+        return BulkResult(affected=affected)
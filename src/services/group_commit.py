@@ -0,0 +1,106 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class GroupCommitWriter:
+    """Coalesces concurrent inserts into shared transactions, one commit (and one fsync) per group.
+
+    Callers `submit` a row and block on the returned future. A writer thread
+    takes the first pending row, gathers the rows arriving within `max_delay`
+    seconds (up to `max_rows`), inserts them through `insert_group` in a
+    single transaction and resolves each future with its own result. With
+    `max_delay=0`, groups only form from the rows queued while the previous
+    commit was running, so an idle server adds no latency.
+
+    `insert_group(rows, session)` returns one result per row, an exception
+    failing only its own caller; if it raises, the whole group failed and
+    every caller gets the error. An unexpected error of the writer loop
+    fails the current group and the thread goes on; a thread that died
+    anyway is restarted by the next `submit`.
+    """
+
+    def __init__(self, engine: Engine, insert_group, max_rows: int = 100, max_delay: float = 0.002):
+        self.engine = engine
+        self.insert_group = insert_group
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._queue: queue.SimpleQueue[tuple[dict, Future]] = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        # Nombre de groupes et de lignes traités, pour le suivi de l'efficacité du regroupement
+        self.groups = 0
+        self.rows = 0
+
+    def submit(self, row: dict) -> Future:
+        """Queue `row` for the next group; the future gives its result once the group is committed."""
+        future = Future()
+        self._queue.put((row, future))
+        if not self.alive:
+            self._start()
+        return future
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self.alive:
+                return
+            if self._thread is not None:
+                logger.error("Group commit writer thread died, restarting it")
+            self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+            self._thread.start()
+
+    def _collect(self) -> list[tuple[dict, Future]]:
+        """Block for a first row, then gather the following ones until the group is full or the delay is over."""
+        group = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(group) < self.max_rows:
+            try:
+                remaining = deadline - time.monotonic()
+                group.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return group
+
+    def _run(self) -> None:
+        while True:
+            group = []
+            try:
+                group = self._collect()
+                # Les appelants ayant abandonné (annulation, délai dépassé) ne sont pas écrits
+                group = [(row, future) for row, future in group if future.set_running_or_notify_cancel()]
+                if group:
+                    self._write(group)
+            except Exception as e:
+                # Erreur inattendue : le groupe échoue, le thread continue pour les suivants
+                logger.exception("Group commit writer failed")
+                for _, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _write(self, group: list[tuple[dict, Future]]) -> None:
+        try:
+            with Session(self.engine) as session:
+                results = self.insert_group([row for row, _ in group], session)
+        except Exception as e:
+            logger.warning("Group commit of %d rows failed: %s", len(group), e)
+            for _, future in group:
+                future.set_exception(e)
+            return
+        self.groups += 1
+        self.rows += len(group)
+        for (_, future), result in zip(group, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
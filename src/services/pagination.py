@@ -0,0 +1,61 @@
+import base64
+import json
+from collections.abc import Mapping
+
+
+# Colonnes de tri autorisées pour la pagination par curseur (keyset)
+CURSOR_KEYS = {
+    "client_id": ("client_id",),
+    "lastname": ("lastname", "client_id"),
+}
+
+
+def encode_cursor(order_by: str, values: tuple) -> str:
+    """Encode the position of the last row of a page into an opaque cursor.
+
+    Args:
+        order_by (str): The sort key used for the page.
+        values (tuple): The values of the sort columns for the last row.
+
+    Returns:
+        str: A URL-safe opaque cursor.
+    """
+    payload = json.dumps({"o": order_by, "v": list(values)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str, keys: tuple[str, ...] | None = None) -> tuple:
+    """Decode an opaque cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): The opaque cursor.
+        order_by (str): The sort key expected for the page.
+        keys (tuple[str, ...] | None): The sort columns, `CURSOR_KEYS[order_by]` by default.
+
+    Returns:
+        tuple: The values of the sort columns to resume after.
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match `order_by`.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        values = tuple(payload["v"])
+        key = payload["o"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+    if key != order_by or len(values) != len(keys or CURSOR_KEYS[order_by]):
+        raise ValueError(f"Cursor does not match order_by={order_by}")
+    return values
+
+
+def next_cursor(rows: list, limit: int, order_by: str, keys: tuple[str, ...] | None = None) -> str | None:
+    """Build the cursor of the page following `rows` (sorted on `keys`, `CURSOR_KEYS[order_by]` by default), or None on the last page."""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    keys = keys or CURSOR_KEYS[order_by]
+    if isinstance(last, Mapping):
+        return encode_cursor(order_by, tuple(last[key] for key in keys))
+    return encode_cursor(order_by, tuple(getattr(last, key) for key in keys))
@@ -0,0 +1,111 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+from ..repositories import CommandeRepository, ObjetRepository, SalesRollupRepository as repository
+from ..models import SalesRollupPublic
+from .commande_service import CommandeService
+
+
+def _month(value: date | None) -> date | None:
+    return value.replace(day=1) if value is not None else None
+
+
+class SalesService:
+    """Sales analytics answered from the t_sales_rollup table only, whatever the number of orders."""
+    
+    @staticmethod
+    def get_rollup(
+        session: Session, start: date | None = None, end: date | None = None, departement_code: str | None = None
+    ) -> list[SalesRollupPublic]:
+        """Revenue and order count per departement and month, `start` and `end` months included."""
+        rows = repository.get_rows(session, start=_month(start), end=_month(end), departement_code=departement_code)
+        return [
+            SalesRollupPublic(
+                departement_id=departement_id, department_code=code, department_name=name,
+                month=month, revenue=revenue, orders=orders,
+            )
+            for departement_id, code, name, month, revenue, orders in rows
+        ]
+    
+    @staticmethod
+    def get_by_departement(session: Session, start: date | None = None, end: date | None = None) -> list[SalesRollupPublic]:
+        rows = repository.get_by_departement(session, start=_month(start), end=_month(end))
+        return [
+            SalesRollupPublic(departement_id=departement_id, department_code=code, department_name=name, revenue=revenue, orders=orders)
+            for departement_id, code, name, revenue, orders in rows
+        ]
+    
+    @staticmethod
+    def get_by_month(
+        session: Session, start: date | None = None, end: date | None = None, departement_code: str | None = None
+    ) -> list[SalesRollupPublic]:
+        rows = repository.get_by_month(session, start=_month(start), end=_month(end), departement_code=departement_code)
+        return [SalesRollupPublic(month=month, revenue=revenue, orders=orders) for month, revenue, orders in rows]
+    
+    @staticmethod
+    def backfill(session: Session, chunk_size: int = 1000) -> int:
+        """Rebuild the rollup from the order history, one transaction per chunk of orders.
+        
+        The table is emptied and the last order to aggregate recorded, then
+        each chunk is aggregated (one catalogue and one departement query)
+        under the departement the orders are counted under, which is recorded
+        on the orders that had none, and committed with the progress. An order
+        written meanwhile applies its deltas only if its chunk is already
+        aggregated (or it is newer than the backfill): the others are counted
+        when their chunk comes. Order writes wait at most for one chunk.
+        
+        If the backfill stops halfway, the orders not aggregated yet are not
+        counted until it is run again.
+        
+        Returns:
+            int: The number of orders processed.
+        """
+        try:
+            repository.clear(session)
+            until = CommandeRepository.max_id(session)
+            repository.start_backfill(until, session)
+            session.commit()
+            done, total = 0, 0
+            while True:
+                # Verrou pris avant de lire le lot : une écriture en cours sur ces commandes est validée avant
+                repository.lock_backfill(session)
+                chunk = CommandeRepository.get_chunk(session, after=done, until=until, chunk_size=chunk_size)
+                if not chunk:
+                    break
+                catalogue = ObjetRepository.get_catalogue({ligne.codobj for commande in chunk for ligne in commande.lignes}, session=session)
+                departements = repository.departements_of(
+                    {commande.codcli for commande in chunk if commande.codcli is not None and commande.departement_id is None},
+                    session=session,
+                )
+                totals = defaultdict(lambda: [Decimal("0"), 0])
+                recorded = []
+                for commande in chunk:
+                    departement_id = commande.departement_id
+                    if departement_id is None:
+                        departement_id = departements.get(commande.codcli, 0)
+                        recorded.append({"codcde": commande.codcde, "departement_id": departement_id})
+                    if commande.datcde is None:
+                        continue
+                    key = (departement_id, _month(commande.datcde))
+                    totals[key][0] += CommandeService.totaux(commande.lignes, catalogue)[0]
+                    totals[key][1] += 1
+                repository.add([
+                    {"departement_id": departement_id, "month": month, "revenue": revenue, "orders": orders}
+                    for (departement_id, month), (revenue, orders) in totals.items()
+                ], session)
+                CommandeRepository.set_departements(recorded, session)
+                done = chunk[-1].codcde
+                repository.advance_backfill(done, session)
+                session.commit()
+                # Les commandes du lot ne sont plus utiles : la session ne les garde pas
+                session.expunge_all()
+                total += len(chunk)
+            repository.end_backfill(session)
+            session.commit()
+        except SQLAlchemyError:
+            session.rollback()
+            raise
+        return total
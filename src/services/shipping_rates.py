@@ -0,0 +1,66 @@
+import os
+from bisect import bisect_right
+from decimal import Decimal
+
+from sqlmodel import Session
+
+from ..models import Poids, Vignette
+from ..repositories import ShippingRepository as repository
+from .snapshot import ReloadableSnapshot
+
+
+class BracketTable:
+    """Weight thresholds (`valmin`) and their stamp price, kept in two parallel sorted arrays.
+    
+    The price of a weight is the one of the highest threshold lower than or
+    equal to it; a weight below the first threshold gets the first price.
+    """
+    
+    def __init__(self, rows=()):
+        self.thresholds: list[Decimal] = [valmin for valmin, _ in rows]
+        self.prices: list[Decimal] = [valtimbre or Decimal("0") for _, valtimbre in rows]
+    
+    def __len__(self) -> int:
+        return len(self.thresholds)
+    
+    def lookup(self, poids: Decimal) -> Decimal | None:
+        if not self.thresholds:
+            return None
+        return self.prices[max(bisect_right(self.thresholds, poids) - 1, 0)]
+    
+    def lookup_many(self, weights: list[Decimal]) -> list[Decimal | None]:
+        """Price of every weight of a batch, one binary search each."""
+        if not self.thresholds:
+            return [None] * len(weights)
+        thresholds, prices = self.thresholds, self.prices
+        return [prices[max(bisect_right(thresholds, poids) - 1, 0)] for poids in weights]
+
+
+class ShippingRates(ReloadableSnapshot):
+    """In-memory stamp price brackets: t_poids for the order stamp, t_poidsv for the client vignette.
+    
+    The snapshot is the pair of BracketTable (commande, client), rebuilt when
+    a bracket is written or when the table signature changes.
+    """
+    
+    def __init__(self, check_interval: float = 60.0):
+        super().__init__((BracketTable(), BracketTable()), check_interval=check_interval)
+    
+    def signature(self, session: Session) -> tuple:
+        return repository.signature(session)
+    
+    def build(self, session: Session) -> tuple[BracketTable, BracketTable]:
+        return BracketTable(repository.get_brackets(Poids, session)), BracketTable(repository.get_brackets(Vignette, session))
+    
+    def quote(self, poids: Decimal) -> tuple[Decimal | None, Decimal | None]:
+        """Order stamp (timbrecde) and client vignette (timbrecli) of a weight."""
+        commande, client = self._snapshot
+        return commande.lookup(poids), client.lookup(poids)
+    
+    def quote_many(self, weights: list[Decimal]) -> list[tuple[Decimal | None, Decimal | None]]:
+        commande, client = self._snapshot
+        return list(zip(commande.lookup_many(weights), client.lookup_many(weights)))
+
+
+shipping_rates = ShippingRates(check_interval=float(os.environ.get("SHIPPING_RATES_CHECK_INTERVAL", "60")))
+shipping_rates.watch(Poids, Vignette)
@@ -0,0 +1,49 @@
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+from ..repositories import CommandeRepository, ObjetRepository
+from ..models import ShippingQuoteRequest, ShippingQuote
+from .commande_service import CommandeService
+from .shipping_rates import shipping_rates
+
+
+class ShippingService:
+    
+    @staticmethod
+    def quote(request: ShippingQuoteRequest, session: Session) -> list[ShippingQuote]:
+        """Stamp prices of a batch of weights or orders, in the order of the request.
+        
+        Orders are loaded with their lines and the catalogue in a constant
+        number of queries, then every weight is priced from the in-memory
+        brackets. With `update`, the stamps are written back in one executemany UPDATE.
+        
+        Raises:
+            ValueError: If an order does not exist.
+        """
+        shipping_rates.ensure_fresh(session)
+        if request.weights is not None:
+            return [
+                ShippingQuote(poids=poids, timbrecde=timbrecde, timbrecli=timbrecli)
+                for poids, (timbrecde, timbrecli) in zip(request.weights, shipping_rates.quote_many(request.weights))
+            ]
+        
+        commandes = {commande.codcde: commande for commande in CommandeRepository.get_many(ids=request.order_ids, session=session)}
+        missing = sorted(set(request.order_ids) - commandes.keys())
+        if missing:
+            raise ValueError(f"Unknown orders {missing}")
+        codobjs = {ligne.codobj for commande in commandes.values() for ligne in commande.lignes}
+        catalogue = ObjetRepository.get_catalogue(codobjs, session=session)
+        weights = [CommandeService.totaux(commandes[codcde].lignes, catalogue)[1] for codcde in request.order_ids]
+        quotes = [
+            ShippingQuote(codcde=codcde, poids=poids, timbrecde=timbrecde, timbrecli=timbrecli)
+            for codcde, poids, (timbrecde, timbrecli) in zip(request.order_ids, weights, shipping_rates.quote_many(weights))
+        ]
+        if request.update:
+            try:
+                CommandeRepository.set_stamps([
+                    {"codcde": quote.codcde, "timbrecde": quote.timbrecde, "timbrecli": quote.timbrecli} for quote in quotes
+                ], session=session)
+                session.commit()
+            except SQLAlchemyError:
+                session.rollback()
+                raise
+        return quotes
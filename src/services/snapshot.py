@@ -0,0 +1,74 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+from ..database import reads_replica
+
+
+class ReloadableSnapshot(ABC):
+    """In-memory data built from database tables, rebuilt off to the side and swapped in whole.
+
+    Subclasses give a cheap `signature` of their tables and `build` the
+    snapshot from them. The snapshot is rebuilt when a watched model is
+    written through the ORM, and when the signature changes (checked at most
+    every `check_interval` seconds). Readers take `self._snapshot` once per
+    lookup and never see two builds mixed.
+    """
+
+    def __init__(self, empty, check_interval: float = 60.0):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._dirty = True
+        self._signature = None
+        self._checked_at = 0.0
+        self._snapshot = empty
+
+    def watch(self, *models) -> None:
+        """Mark the snapshot dirty on every ORM insert, update or delete of `models`."""
+        # Toute écriture ORM sur ces tables invalide le snapshot de ce processus
+        for model in models:
+            for event_name in ("after_insert", "after_update", "after_delete"):
+                event.listen(model, event_name, self.mark_dirty)
+
+    def mark_dirty(self, *args) -> None:
+        self._dirty = True
+
+    @abstractmethod
+    def signature(self, session: Session) -> tuple:
+        """Cheap fingerprint of the tables, which changes whenever their content does."""
+        pass
+
+    @abstractmethod
+    def build(self, session: Session):
+        """Build a new snapshot from the tables."""
+        pass
+
+    def load(self, session: Session) -> None:
+        """(Re)build the whole snapshot from the database, then swap it in atomically."""
+        signature = self.signature(session)
+        snapshot = self.build(session)
+        with self._lock:
+            self._snapshot = snapshot
+            self._signature = signature
+            self._checked_at = time.monotonic()
+            self._dirty = False
+
+    def ensure_fresh(self, session: Session) -> None:
+        """Reload the snapshot if it is dirty, or if the tables changed since the last check.
+
+        The snapshot serves the whole process: it is checked and built on the
+        primary, never on a replica that may lag behind.
+        """
+        if reads_replica(session):
+            with Session(session.get_bind()) as primary:
+                self.ensure_fresh(primary)
+            return
+        if self._dirty:
+            self.load(session)
+        elif time.monotonic() - self._checked_at > self.check_interval:
+            self._checked_at = time.monotonic()
+            if self.signature(session) != self._signature:
+                self.load(session)
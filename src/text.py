@@ -0,0 +1,55 @@
+import re
+import unicodedata
+
+
+def normalize(text: str | None) -> str:
+    """Lowercase, fold accents and turn punctuation into single spaces ("Saint-Étienne" -> "saint etienne")."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = "".join(char if char.isalnum() else " " for char in text.lower())
+    return " ".join(text.split())
+
+
+def trigrams(text: str | None) -> set[str]:
+    """Character trigrams of each normalized word; words shorter than 3 characters are kept whole."""
+    grams = set()
+    for word in normalize(text).split():
+        if len(word) < 3:
+            grams.add(word)
+        else:
+            grams.update(word[i:i + 3] for i in range(len(word) - 2))
+    return grams
+
+
+# Règles phonétiques simplifiées du français, appliquées dans l'ordre sur le nom normalisé
+_PHONETIC_RULES = [(re.compile(pattern), replacement) for pattern, replacement in (
+    (r"sch", "s"), (r"ch", "s"), (r"ph", "f"), (r"qu", "k"), (r"gu(?=[eiy])", "g"), (r"ck", "k"),
+    (r"c(?=[eiy])", "s"), (r"c", "k"), (r"g(?=[eiy])", "j"), (r"bv", "v"),
+    (r"eau", "o"), (r"au", "o"), (r"ai", "e"), (r"ei", "e"), (r"y", "i"), (r"w", "v"), (r"z", "s"), (r"h", ""),
+)]
+
+
+def phonetic(text: str | None) -> str:
+    """Phonetic key of a French name: homophone spellings share it ("Dupond" and "Dupont" -> "dupon")."""
+    word = normalize(text).replace(" ", "")
+    for pattern, replacement in _PHONETIC_RULES:
+        word = pattern.sub(replacement, word)
+    word = re.sub(r"(.)\1+", r"\1", word)
+    # Lettres finales muettes
+    return re.sub(r"(?<=.)[stdxe]+$", "", word)
+
+
+def normalize_email(email: str | None) -> str:
+    """Lowercase email without its "+tag" ("Jean.Dupont+promo@Mail.fr" -> "jean.dupont@mail.fr")."""
+    if not email or "@" not in email:
+        return ""
+    local, _, domain = email.strip().lower().rpartition("@")
+    return f"{local.split('+', 1)[0]}@{domain}"
+
+
+def normalize_phone(phone: str | None) -> str:
+    """Last nine digits of a French phone number, whatever its formatting ("+33 6 12..." and "06.12..." match)."""
+    digits = "".join(char for char in phone or "" if char.isdigit())
+    return digits[-9:] if len(digits) >= 9 else ""
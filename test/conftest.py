@@ -2,6 +2,10 @@
 # Modules import #
 ##################
 
+import atexit
+import os
+import shutil
+import tempfile
 import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import create_engine, Session, SQLModel
@@ -10,8 +14,19 @@ from sqlmodel import create_engine, Session, SQLModel
 # SRC imports #
 ###############
 
+# Profil de test : SQLite sans echo, avant l'import de l'application qui crée le moteur
+os.environ.setdefault("DB_PROFILE", "test")
+# Base SQLite dans un dossier temporaire (le moteur de l'application est créé à l'import, avant les fixtures)
+TEST_DB_DIR = tempfile.mkdtemp(prefix="digicheese-test-")
+atexit.register(shutil.rmtree, TEST_DB_DIR, ignore_errors=True)
+TEST_DB_URL = f"sqlite:///{os.path.join(TEST_DB_DIR, 'test.db')}"
+os.environ.setdefault("DB_URL", TEST_DB_URL)
+# Profilage désactivé par défaut, activé ici pour tester le Server-Timing
+os.environ.setdefault("PROFILING", "1")
+
 from src.main import app
 from src.database import get_session
+from src.services import ClientService
 from src.models.client import Client as ClientModel
 from src.models.commune import Commune
 from src.models.departement import Departement
@@ -26,8 +41,7 @@ def test_session():
     Crée une base de données SQLite en fichier pour vérifier.
     Initialise les tables, et insère un permet d'insérer des données par défaut.
     """
-    db_url = "sqlite:///./test.db"
-    engine = create_engine(db_url, echo=False)
+    engine = create_engine(TEST_DB_URL, echo=False)
     SQLModel.metadata.drop_all(engine)
     SQLModel.metadata.create_all(engine)
     
@@ -63,6 +77,8 @@ def client(test_session):
         
     # Ecrase la connexion à l'ancienne base de données par la nouvelle
     app.dependency_overrides[get_session] = override_get_session
+    ClientService.cache.clear()
+    ClientService.counter.invalidate()
 
     with TestClient(app) as test_client:
         yield test_client
@@ -32,4 +32,389 @@ def test_patch_client(client: TestClient):
     pass
 
 def test_delete_client(client: TestClient):
-    pass
\ No newline at end of file
+    pass
+
+def test_get_clients_cursor_pagination(client: TestClient):
+    for name in ("alpha", "bravo", "charlie"):
+        client.post(f"{BASE_URL}/clients", json={"firstname": name, "lastname": name, "address_line_1": "1 rue"})
+
+    first: Response = client.get(f"{BASE_URL}/clients", params={"limit": 2})
+    assert first.status_code == 200
+    cursor = first.headers["X-Next-Cursor"]
+
+    second: Response = client.get(f"{BASE_URL}/clients", params={"limit": 2, "cursor": cursor})
+    assert second.status_code == 200
+    first_ids = [c["client_id"] for c in first.json()]
+    second_ids = [c["client_id"] for c in second.json()]
+    assert second_ids and min(second_ids) > max(first_ids)
+
+
+def test_get_clients_cursor_by_lastname(client: TestClient):
+    first: Response = client.get(f"{BASE_URL}/clients", params={"limit": 1, "order_by": "lastname"})
+    cursor = first.headers["X-Next-Cursor"]
+    second: Response = client.get(f"{BASE_URL}/clients", params={"limit": 1, "order_by": "lastname", "cursor": cursor})
+    assert second.json()[0]["lastname"] >= first.json()[0]["lastname"]
+
+
+def test_get_clients_invalid_cursor(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/clients", params={"cursor": "not-a-cursor"})
+    assert result.status_code == 400
+
+
+def test_bulk_import_ndjson(client: TestClient):
+    body = "\n".join([
+        '{"firstname": "anna", "lastname": "bulk", "address_line_1": "2 rue"}',
+        '{"firstname": "ben", "lastname": "bulk", "address_line_1": "3 rue"}',
+        '{"firstname": "no address"}',
+        'not json',
+    ])
+    result: Response = client.post(
+        f"{BASE_URL}/clients/bulk",
+        content=body,
+        params={"batch_size": 1},
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert result.status_code == 200
+    report = result.json()
+    assert report["inserted"] == 2
+    assert report["failed"] == 2
+    assert [e["line"] for e in report["errors"]] == [3, 4]
+
+
+def test_bulk_import_csv(client: TestClient):
+    body = "firstname,lastname,address_line_1,newsletter\nchloe,csv,4 rue,1\ndavid,csv,5 rue,\n"
+    result: Response = client.post(
+        f"{BASE_URL}/clients/bulk",
+        content=body,
+        headers={"Content-Type": "text/csv"},
+    )
+    assert result.status_code == 200
+    assert result.json() == {"inserted": 2, "failed": 0, "errors": []}
+
+
+def test_export_clients_ndjson(client: TestClient):
+    import json
+
+    result: Response = client.get(f"{BASE_URL}/clients/export", params={"chunk_size": 2})
+    assert result.status_code == 200
+    assert result.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in result.text.splitlines()]
+    assert len(rows) > 0
+    assert {"client_id", "firstname", "lastname"} <= rows[0].keys()
+
+
+def test_export_clients_csv_filtered(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/clients/export", params={"format": "csv", "newsletter": 1})
+    assert result.status_code == 200
+    header, *lines = result.text.splitlines()
+    assert "client_id" in header.split(",")
+    newsletter_index = header.split(",").index("newsletter")
+    assert all(line.split(",")[newsletter_index] == "1" for line in lines)
+
+
+def test_export_clients_releases_connection(test_session):
+    from src.services import ClientService
+
+    engine = test_session.get_bind()
+    before = engine.pool.checkedout()
+    columns, chunks = ClientService.export(bind=engine, chunk_size=1)
+    assert next(chunks)
+    assert engine.pool.checkedout() == before + 1
+    chunks.close()
+    assert engine.pool.checkedout() == before
+
+
+def test_get_client_cache_and_invalidation(client: TestClient):
+    created = client.post(f"{BASE_URL}/clients", json={"firstname": "cache", "lastname": "hit", "address_line_1": "7 rue"})
+    client_id = created.json()["client_id"]
+    before = client.get(f"{BASE_URL}/clients/cache/stats").json()
+
+    assert client.get(f"{BASE_URL}/clients/{client_id}").status_code == 200
+    assert client.get(f"{BASE_URL}/clients/{client_id}").status_code == 200
+    stats = client.get(f"{BASE_URL}/clients/cache/stats").json()
+    assert stats["misses"] == before["misses"] + 1
+    assert stats["hits"] == before["hits"] + 1
+
+    client.patch(f"{BASE_URL}/clients/{client_id}", json={"firstname": "fresh"})
+    assert client.get(f"{BASE_URL}/clients/{client_id}").json()["firstname"] == "Fresh"
+
+    client.delete(f"{BASE_URL}/clients/{client_id}")
+    assert client.get(f"{BASE_URL}/clients/{client_id}").status_code == 404
+
+
+def test_search_clients(client: TestClient):
+    client.post(f"{BASE_URL}/clients", json={
+        "firstname": "hélène", "lastname": "dupont-martin", "address_line_1": "8 rue",
+        "email": "helene.dupont@example.com", "mobile_phone": "0612345678",
+    })
+
+    by_name: Response = client.get(f"{BASE_URL}/clients/search", params={"q": "helene dupon"})
+    assert by_name.status_code == 200
+    assert by_name.json()[0]["lastname"] == "DUPONT-MARTIN"
+    assert 0 < by_name.json()[0]["score"] <= 1
+
+    by_phone = client.get(f"{BASE_URL}/clients/search", params={"q": "06 12 34"}).json()
+    assert by_phone[0]["mobile_phone"] == "0612345678"
+
+    client_id = by_name.json()[0]["client_id"]
+    client.patch(f"{BASE_URL}/clients/{client_id}", json={"lastname": "durand"})
+    assert client.get(f"{BASE_URL}/clients/search", params={"q": "durand"}).json()[0]["client_id"] == client_id
+
+    client.delete(f"{BASE_URL}/clients/{client_id}")
+    assert client_id not in [c["client_id"] for c in client.get(f"{BASE_URL}/clients/search", params={"q": "durand"}).json()]
+
+
+def test_bulk_import_is_searchable(client: TestClient):
+    body = '{"firstname": "zoe", "lastname": "quibulk", "address_line_1": "9 rue"}\n'
+    client.post(f"{BASE_URL}/clients/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert client.get(f"{BASE_URL}/clients/search", params={"q": "quibulk"}).json()[0]["firstname"] == "Zoe"
+
+
+def test_get_clients_expand(client: TestClient, test_session):
+    from sqlalchemy import event
+
+    client.get(f"{BASE_URL}/clients/count")  # compteur X-Total-Count déjà en cache
+    statements = []
+    engine = test_session.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result: Response = client.get(f"{BASE_URL}/clients", params={"limit": 100, "expand": "commune,departement"})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert result.status_code == 200
+    # 1 page + 1 communes + 1 départements, quelle que soit la taille de la page
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) <= 3
+
+    robin = next(c for c in result.json() if c["lastname"] == "HOTTON")
+    assert robin["commune"]["city_name"] == "Wervicq-Sud"
+    assert robin["commune"]["departement"]["department_code"] == "59"
+
+    plain = client.get(f"{BASE_URL}/clients", params={"limit": 1}).json()[0]
+    assert "commune" not in plain
+
+
+def test_get_client_by_id_expand(client: TestClient):
+    clients = client.get(f"{BASE_URL}/clients", params={"limit": 100}).json()
+    client_id = next(c["client_id"] for c in clients if c["lastname"] == "HOTTON")
+    result = client.get(f"{BASE_URL}/clients/{client_id}", params={"expand": "commune"}).json()
+    assert result["commune"]["postal_code"] == "59117"
+    assert "departement" not in result["commune"]
+    assert client.get(f"{BASE_URL}/clients/{client_id}", params={"expand": "orders"}).status_code == 400
+
+
+def test_bulk_patch_and_delete(client: TestClient):
+    body = "\n".join(
+        f'{{"firstname": "set{i}", "lastname": "based", "address_line_1": "10 rue", "newsletter": 7}}' for i in range(5)
+    )
+    client.post(f"{BASE_URL}/clients/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+
+    patched: Response = client.patch(
+        f"{BASE_URL}/clients/bulk",
+        params={"chunk_size": 2},
+        json={"filter": {"newsletter": 7}, "data": {"newsletter": 8, "lastname": "renamed"}},
+    )
+    assert patched.status_code == 200
+    assert patched.json() == {"affected": 5}
+    ids = [c["client_id"] for c in client.get(f"{BASE_URL}/clients/search", params={"q": "renamed"}).json()]
+    assert len(ids) == 5
+
+    deleted: Response = client.request("DELETE", f"{BASE_URL}/clients/bulk", json={"ids": ids[:3]})
+    assert deleted.json() == {"affected": 3}
+    deleted = client.request("DELETE", f"{BASE_URL}/clients/bulk", json={"filter": {"newsletter": 8}})
+    assert deleted.json() == {"affected": 2}
+
+
+def test_bulk_target_validation(client: TestClient):
+    assert client.request("DELETE", f"{BASE_URL}/clients/bulk", json={}).status_code == 422
+    assert client.request("DELETE", f"{BASE_URL}/clients/bulk", json={"filter": {}}).status_code == 422
+    assert client.patch(f"{BASE_URL}/clients/bulk", json={"ids": [1], "data": {}}).status_code == 400
+
+
+def test_count_clients(client: TestClient):
+    total = client.get(f"{BASE_URL}/clients/count").json()
+    assert total["approximate"] is False
+    listed = client.get(f"{BASE_URL}/clients", params={"limit": 100})
+    assert int(listed.headers["X-Total-Count"]) == total["count"]
+
+    created = client.post(f"{BASE_URL}/clients", json={"firstname": "count", "lastname": "me", "address_line_1": "11 rue"})
+    assert client.get(f"{BASE_URL}/clients/count").json()["count"] == total["count"] + 1
+
+    client.delete(f"{BASE_URL}/clients/{created.json()['client_id']}")
+    assert client.get(f"{BASE_URL}/clients/count").json()["count"] == total["count"]
+    # Pas de statistiques de table sous SQLite : repli sur le compte exact
+    assert client.get(f"{BASE_URL}/clients/count", params={"approximate": True}).json()["approximate"] is False
+
+
+def test_get_clients_fast_response(client: TestClient, monkeypatch):
+    from src.routers import client_router
+
+    expected = client.get(f"{BASE_URL}/clients", params={"limit": 5, "order_by": "lastname"})
+    monkeypatch.setattr(client_router, "FAST_RESPONSE", True)
+    validated = client.get(f"{BASE_URL}/clients", params={"limit": 5, "order_by": "lastname"})
+    assert validated.json() == expected.json()
+    assert validated.headers["X-Next-Cursor"] == expected.headers["X-Next-Cursor"]
+    assert validated.headers["X-Total-Count"] == expected.headers["X-Total-Count"]
+
+    monkeypatch.setattr(client_router, "CLIENT_LIST_ADAPTER", None)
+    trusted = client.get(f"{BASE_URL}/clients", params={"limit": 5, "order_by": "lastname"})
+    assert trusted.json() == expected.json()
+
+
+def test_get_clients_fields(client: TestClient):
+    params = {"limit": 3, "order_by": "lastname"}
+    full = client.get(f"{BASE_URL}/clients", params=params)
+    projected = client.get(f"{BASE_URL}/clients", params={**params, "fields": "lastname,email"})
+    assert projected.status_code == 200
+    assert projected.json() == [
+        {"lastname": row["lastname"], "email": row["email"], "client_id": row["client_id"]} for row in full.json()
+    ]
+    assert projected.headers["X-Next-Cursor"] == full.headers["X-Next-Cursor"]
+
+    # Le tri sur lastname fonctionne même si lastname n'est pas demandé
+    next_page = client.get(f"{BASE_URL}/clients", params={**params, "fields": "email", "cursor": full.headers["X-Next-Cursor"]})
+    assert set(next_page.json()[0]) == {"client_id", "email"}
+
+    client_id = full.json()[0]["client_id"]
+    detail = client.get(f"{BASE_URL}/clients/{client_id}", params={"fields": "firstname"})
+    assert detail.json() == {"firstname": full.json()[0]["firstname"], "client_id": client_id}
+
+    assert client.get(f"{BASE_URL}/clients", params={"fields": "password"}).status_code == 400
+    assert client.get(f"{BASE_URL}/clients", params={"fields": "email", "expand": "commune"}).status_code == 400
+    assert client.get(f"{BASE_URL}/clients/0", params={"fields": "email"}).status_code == 404
+
+
+def test_get_client_etag(client: TestClient):
+    client_id = client.get(f"{BASE_URL}/clients", params={"limit": 1}).json()[0]["client_id"]
+    first = client.get(f"{BASE_URL}/clients/{client_id}")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    cached = client.get(f"{BASE_URL}/clients/{client_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    # Une projection est une autre représentation de la même version
+    projected = client.get(f"{BASE_URL}/clients/{client_id}", params={"fields": "email"})
+    assert projected.headers["ETag"] != etag
+
+    client.patch(f"{BASE_URL}/clients/{client_id}", json={"firstname": "versioned"})
+    changed = client.get(f"{BASE_URL}/clients/{client_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["version"] == first.json()["version"] + 1
+    assert changed.headers["ETag"] != etag
+
+
+def test_get_clients_etag(client: TestClient):
+    params = {"limit": 5}
+    first = client.get(f"{BASE_URL}/clients", params=params)
+    etag = first.headers["ETag"]
+    assert etag.startswith("W/")
+
+    cached = client.get(f"{BASE_URL}/clients", params=params, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["X-Total-Count"] == first.headers["X-Total-Count"]
+    assert client.get(f"{BASE_URL}/clients", params={"limit": 4}, headers={"If-None-Match": etag}).status_code == 200
+
+    client.patch(f"{BASE_URL}/clients/{first.json()[0]['client_id']}", json={"lastname": "etag"})
+    assert client.get(f"{BASE_URL}/clients", params=params, headers={"If-None-Match": etag}).status_code == 200
+    assert "ETag" not in client.get(f"{BASE_URL}/clients", params={**params, "expand": "commune"}).headers
+
+
+def test_get_clients_compression(client: TestClient):
+    params = {"limit": 100}
+    plain = client.get(f"{BASE_URL}/clients", params=params, headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+
+    compressed = client.get(f"{BASE_URL}/clients", params=params, headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert int(compressed.headers["Content-Length"]) < len(plain.content)
+    assert compressed.json() == plain.json()
+
+    refused = client.get(f"{BASE_URL}/clients", params=params, headers={"Accept-Encoding": "gzip;q=0"})
+    assert "Content-Encoding" not in refused.headers
+
+
+def test_create_client_group_commit(client: TestClient, test_session, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    from src.services import ClientService
+
+    monkeypatch.setattr(ClientService, "group_commit", True)
+    writer = ClientService.writer(test_session.get_bind())
+    groups, rows = writer.groups, writer.rows
+    payloads = [{"firstname": f"group{i}", "lastname": "commit", "address_line_1": "1 rue"} for i in range(20)]
+    # lastname NOT NULL : seule cette création échoue, pas celles écrites dans le même groupe
+    payloads.append({"firstname": "nolastname", "address_line_1": "1 rue"})
+    with ThreadPoolExecutor(max_workers=len(payloads)) as executor:
+        responses = list(executor.map(lambda payload: client.post(f"{BASE_URL}/clients", json=payload), payloads))
+
+    assert [response.status_code for response in responses] == [201] * 20 + [500]
+    created = [response.json() for response in responses[:20]]
+    assert len({body["client_id"] for body in created}) == 20
+    assert all(body["version"] == 1 and body["lastname"] == "COMMIT" for body in created)
+    assert writer.rows - rows == 21
+    assert writer.groups - groups <= 21
+
+    fetched = client.get(f"{BASE_URL}/clients/{created[7]['client_id']}")
+    assert fetched.json()["firstname"] == "Group7"
+    assert any(hit["client_id"] == created[3]["client_id"] for hit in client.get(f"{BASE_URL}/clients/search", params={"q": "group3"}).json())
+
+
+def test_create_client_group_commit_timeout(client: TestClient, test_session, monkeypatch):
+    import time
+    from src.services import ClientService
+    from src.services.group_commit import GroupCommitWriter
+
+    engine = test_session.get_bind()
+    writer = ClientService.writer(engine)
+
+    def slow_insert_group(rows, session):
+        time.sleep(0.3)
+        return writer.insert_group(rows, session)
+
+    monkeypatch.setattr(ClientService, "group_commit", True)
+    monkeypatch.setattr(ClientService, "group_commit_timeout", 0.05)
+    monkeypatch.setitem(ClientService._writers, engine, GroupCommitWriter(engine, slow_insert_group))
+    payload = {"firstname": "slow", "lastname": "writer", "address_line_1": "1 rue"}
+    assert client.post(f"{BASE_URL}/clients", json=payload).status_code == 503
+
+    monkeypatch.setattr(ClientService, "group_commit_timeout", 5)
+    assert client.post(f"{BASE_URL}/clients", json=payload).status_code == 201
+
+
+def test_find_duplicate_clients(client: TestClient, test_session):
+    from src.models import Client, Commune
+    from src.text import phonetic
+
+    assert phonetic("Dupond") == phonetic("DUPONT") and phonetic("Lefèvre") == phonetic("Lefebvre")
+
+    lille, roubaix = Commune(city_name="Lille", postal_code="59000"), Commune(city_name="Roubaix", postal_code="59100")
+    test_session.add_all([lille, roubaix])
+    test_session.flush()
+    clients = [
+        Client(firstname="Jean", lastname="DUPONT", address_line_1="1 rue de la Paix", commune_id=lille.id),
+        Client(firstname="jean", lastname="Dupond", address_line_1="1, Rue de la paix", commune_id=lille.id),
+        Client(firstname="Marie", lastname="DUPONT", address_line_1="1 rue de la Paix", commune_id=lille.id),
+        Client(firstname="Paul", lastname="MARTIN", address_line_1="3 place Rihour", email="p.martin@mail.fr", commune_id=lille.id),
+        Client(firstname="Paul", lastname="Martin", address_line_1="8 rue Pauvrée", email="P.Martin+shop@Mail.fr", commune_id=roubaix.id),
+        Client(firstname="Paul", lastname="Martin", address_line_1="8 rue Pauvrée", email="p.martin@mail.fr", commune_id=lille.id),
+        Client(firstname="Paul", lastname="Martin", address_line_1="8 rue Pauvrée", email="p.martin@mail.fr"),
+    ]
+    test_session.add_all(clients)
+    test_session.commit()
+    jean, jean_bis, marie, paul, paul_bis, paul_ter, paul_sans_commune = (c.client_id for c in clients)
+
+    result = client.get(f"{BASE_URL}/clients/duplicates", params={"min_score": 0.8, "limit": 1000})
+    assert result.status_code == 200
+    report = result.json()
+    pairs = {(c["client_id"], c["duplicate_id"]): c for c in report["candidates"]}
+    assert "phonetic_lastname" in pairs[(jean, jean_bis)]["reasons"]
+    assert "same_email" in pairs[(paul, paul_bis)]["reasons"]
+    # Un email partagé par deux clients d'une commune les rapproche tous deux de ceux des autres communes
+    assert "same_email" in pairs[(paul_bis, paul_ter)]["reasons"]
+    assert {(paul, paul_sans_commune), (paul_bis, paul_sans_commune), (paul_ter, paul_sans_commune)} <= pairs.keys()
+    assert (jean, marie) not in pairs and (jean_bis, marie) not in pairs
+    assert report["scanned"] >= 5 and report["pairs"] < report["scanned"] ** 2
+    assert report["rows_per_second"] > 0
@@ -0,0 +1,87 @@
+import pytest
+from fastapi import FastAPI, APIRouter, Response
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.database import get_async_session
+from src.services import ClientService
+from src.routers import use_async_routes
+from src.routers.client_router import router as router_client
+from src.routers.client_async_router import router as router_client_async
+
+BASE_URL = "/api/v1"
+
+
+@pytest.fixture(scope="module")
+def async_client(tmp_path_factory):
+    """Monte les routes clients en mode asynchrone sur une base SQLite via aiosqlite."""
+    path = tmp_path_factory.mktemp("async") / "test_async.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.drop_all(sync_engine)
+    SQLModel.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async def override_get_async_session():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    clients = APIRouter(prefix="/clients")
+    clients.routes.extend(router_client.routes)
+    use_async_routes(clients, router_client_async)
+    api = APIRouter(prefix=BASE_URL)
+    api.include_router(clients)
+
+    app = FastAPI()
+    app.include_router(api)
+    app.dependency_overrides[get_async_session] = override_get_async_session
+    ClientService.cache.clear()
+    ClientService.counter.invalidate()
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_async_routes_replace_sync_routes():
+    clients = APIRouter(prefix="/clients")
+    clients.routes.extend(router_client.routes)
+    use_async_routes(clients, router_client_async)
+    endpoints = {route.endpoint for route in clients.routes}
+    assert all(route.endpoint in endpoints for route in router_client_async.routes)
+    assert len(clients.routes) == len(router_client.routes)
+
+
+def test_async_crud(async_client: TestClient):
+    created: Response = async_client.post(
+        f"{BASE_URL}/clients", json={"firstname": "eve", "lastname": "async", "address_line_1": "6 rue"}
+    )
+    assert created.status_code == 201
+    client_id = created.json()["client_id"]
+    assert created.json()["lastname"] == "ASYNC"
+
+    patched: Response = async_client.patch(f"{BASE_URL}/clients/{client_id}", json={"firstname": "eva"})
+    assert patched.status_code == 200
+    assert patched.json()["firstname"] == "Eva"
+
+    fetched: Response = async_client.get(f"{BASE_URL}/clients/{client_id}")
+    assert fetched.json()["firstname"] == "Eva"
+    assert fetched.json()["version"] == 2
+    cached = async_client.get(f"{BASE_URL}/clients/{client_id}", headers={"If-None-Match": fetched.headers["ETag"]})
+    assert cached.status_code == 304
+
+    listed: Response = async_client.get(f"{BASE_URL}/clients", params={"limit": 1})
+    assert listed.status_code == 200
+    assert "X-Next-Cursor" in listed.headers
+    projected = async_client.get(f"{BASE_URL}/clients", params={"limit": 1, "fields": "email"})
+    assert set(projected.json()[0]) == {"client_id", "email"}
+    cached = async_client.get(
+        f"{BASE_URL}/clients", params={"limit": 1, "fields": "email"}, headers={"If-None-Match": projected.headers["ETag"]}
+    )
+    assert cached.status_code == 304
+
+    deleted: Response = async_client.delete(f"{BASE_URL}/clients/{client_id}")
+    assert deleted.status_code == 204
+    assert async_client.get(f"{BASE_URL}/clients/{client_id}").status_code == 404
@@ -0,0 +1,115 @@
+from fastapi import Response
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from src.models.commune import Commune
+from src.services.commune_index import CommuneIndex
+from src.services.pagination import CURSOR_KEYS
+from src.text import normalize
+
+BASE_URL = "/api/v1"
+
+
+def test_normalize():
+    assert normalize("Saint-Étienne") == "saint etienne"
+    assert normalize("  L'Haÿ-les-Roses ") == "l hay les roses"
+
+
+def test_search_by_postal_code(client: TestClient):
+    result: Response = client.get(f"{BASE_URL}/communes/search", params={"q": "591"})
+    assert result.status_code == 200
+    assert "Wervicq-Sud" in [c["city_name"] for c in result.json()]
+
+
+def test_search_by_name_and_word(client: TestClient):
+    by_name = client.get(f"{BASE_URL}/communes/search", params={"q": "WERVI"}).json()
+    assert by_name[0]["city_name"] == "Wervicq-Sud"
+    assert by_name[0]["department_code"] == "59"
+
+    by_word = client.get(f"{BASE_URL}/communes/search", params={"q": "sud"}).json()
+    assert "Wervicq-Sud" in [c["city_name"] for c in by_word]
+
+
+def test_index_reloads_after_write(client: TestClient, test_session):
+    test_session.add(Commune(city_name="Saint-Étienne", postal_code="42000"))
+    test_session.commit()
+    result = client.get(f"{BASE_URL}/communes/search", params={"q": "etien"}).json()
+    assert [c["city_name"] for c in result] == ["Saint-Étienne"]
+
+
+def test_index_reloads_after_update_outside_orm(test_session):
+    index = CommuneIndex(check_interval=0)
+    commune = Commune(city_name="Villeneuve", postal_code="47300")
+    test_session.add(commune)
+    test_session.commit()
+    index.load(test_session)
+
+    # Renommage en SQL (autre worker, script) : même nombre de lignes et même id max
+    test_session.execute(text("UPDATE t_communes SET city_name = 'Villeneuve-sur-Lot' WHERE id = :id"), {"id": commune.id})
+    test_session.commit()
+    index.ensure_fresh(test_session)
+    assert [c.city_name for c in index.by_postal_code("47300")] == ["Villeneuve-sur-Lot"]
+
+
+def test_communes_by_postal_code_and_departement(client: TestClient):
+    by_postal = client.get(f"{BASE_URL}/communes/postal-codes/59117").json()
+    assert [c["city_name"] for c in by_postal] == ["Wervicq-Sud"]
+    by_departement = client.get(f"{BASE_URL}/departements/59/communes").json()
+    assert "Wervicq-Sud" in [c["city_name"] for c in by_departement]
+
+
+def test_departement_crud(client: TestClient):
+    created = client.post(f"{BASE_URL}/departements", json={"department_code": "62", "department_name": "Pas-de-Calais"})
+    assert created.status_code == 201
+    departement_id = created.json()["id"]
+    assert client.get(f"{BASE_URL}/departements/{departement_id}").json()["department_name"] == "Pas-de-Calais"
+    assert client.get(f"{BASE_URL}/departements/{departement_id}", params={"fields": "department_code"}).json() == {
+        "department_code": "62", "id": departement_id
+    }
+
+    patched = client.patch(f"{BASE_URL}/departements/{departement_id}", json={"department_name": "Pas de Calais"})
+    assert patched.json() == {"id": departement_id, "department_code": "62", "department_name": "Pas de Calais"}
+    assert client.patch(f"{BASE_URL}/departements/0", json={"department_name": "x"}).status_code == 404
+
+    # Les routes spécifiques restent prioritaires sur /{id}
+    assert client.get(f"{BASE_URL}/departements/59/communes").status_code == 200
+
+    assert client.delete(f"{BASE_URL}/departements/{departement_id}").status_code == 204
+    assert client.get(f"{BASE_URL}/departements/{departement_id}").status_code == 404
+    assert client.delete(f"{BASE_URL}/departements/{departement_id}").status_code == 404
+
+
+def test_commune_list_and_bulk(client: TestClient):
+    created = [
+        client.post(f"{BASE_URL}/communes", json={"city_name": f"Bulkville {i}", "postal_code": "99000"}).json()
+        for i in range(3)
+    ]
+    total = int(client.get(f"{BASE_URL}/communes", params={"limit": 1}).headers["X-Total-Count"])
+    assert client.get(f"{BASE_URL}/communes/count").json() == {"count": total}
+
+    # Parcours complet par curseur, dans l'ordre des id
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "fields": "city_name"} | ({"cursor": cursor} if cursor else {})
+        page = client.get(f"{BASE_URL}/communes", params=params)
+        assert all(set(row) == {"id", "city_name"} for row in page.json())
+        seen.extend(row["id"] for row in page.json())
+        cursor = page.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert len(seen) == total and seen == sorted(seen)
+    assert client.get(f"{BASE_URL}/communes", params={"offset": 1, "cursor": "x"}).status_code == 400
+    # Les curseurs des routes génériques ne modifient pas ceux des clients
+    assert set(CURSOR_KEYS) == {"client_id", "lastname"}
+
+    patched = client.patch(
+        f"{BASE_URL}/communes/bulk", json={"filter": {"postal_code": "99000"}, "data": {"postal_code": "99100"}}
+    )
+    assert patched.json() == {"affected": 3}
+    # L'index des communes est invalidé par les écritures du CRUD générique
+    assert len(client.get(f"{BASE_URL}/communes/postal-codes/99100").json()) == 3
+    assert client.patch(f"{BASE_URL}/communes/bulk", json={"filter": {"password": "x"}, "data": {"city_name": "x"}}).status_code == 400
+
+    deleted = client.request("DELETE", f"{BASE_URL}/communes/bulk", json={"ids": [commune["id"] for commune in created]})
+    assert deleted.json() == {"affected": 3}
+    assert client.get(f"{BASE_URL}/communes/postal-codes/99100").json() == []
@@ -0,0 +1,25 @@
+import pytest
+
+from src.database import engine_options
+
+
+def test_prod_profile_is_tuned():
+    options = engine_options("prod")
+    assert options["echo"] is False
+    assert options["pool_pre_ping"] is True
+    assert options["pool_recycle"] > 0
+    assert options["isolation_level"] == "READ COMMITTED"
+
+
+def test_profile_env_override(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "42")
+    monkeypatch.setenv("DB_ECHO", "false")
+    options = engine_options("dev")
+    assert options["pool_size"] == 42
+    assert options["echo"] is False
+    assert "isolation_level" not in options
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        engine_options("staging")
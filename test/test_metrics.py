@@ -0,0 +1,58 @@
+import json
+import os
+
+from fastapi.testclient import TestClient
+from sqlmodel import create_engine, text as sql
+
+from src.metrics import MetricsRegistry, instrument_pool
+
+BASE_URL = "/api/v1"
+
+
+def test_metrics_endpoint(client: TestClient):
+    client.get(f"{BASE_URL}/clients/0")
+    text = client.get("/metrics").text
+    # Gabarit de route, pas l'identifiant demandé
+    assert 'http_requests_total{method="GET",route="/api/v1/clients/{client_id}",status="404"}' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/clients/{client_id}",le="+Inf"}' in text
+    assert "# TYPE db_pool_connections gauge" in text
+    assert "db_pool_checkout_seconds_count" in text
+
+
+def test_registry_aggregates_processes(tmp_path):
+    registry = MetricsRegistry(directory=str(tmp_path), flush_interval=5)
+    registry.counter("jobs_total", "Jobs.")
+    registry.histogram("job_seconds", "Job latency.", buckets=(0.1, 1.0))
+    registry.inc("jobs_total", (("kind", "a"),))
+    registry.observe("job_seconds", 0.5)
+
+    # Instantané d'un autre worker, tel qu'écrit par son flush
+    other = registry.snapshot()
+    other["pid"] = -1
+    with open(os.path.join(tmp_path, "-1.json"), "w") as file:
+        json.dump(other, file)
+    registry.observe("job_seconds", 5)
+
+    text = registry.render()
+    assert 'jobs_total{kind="a"} 2' in text
+    assert 'job_seconds_bucket{le="0.1"} 0' in text
+    assert 'job_seconds_bucket{le="1"} 2' in text
+    assert 'job_seconds_bucket{le="+Inf"} 3' in text
+    assert "job_seconds_count 3" in text
+    assert "job_seconds_sum 6" in text
+
+
+def test_instrument_pool_survives_dispose(tmp_path):
+    registry = MetricsRegistry()
+    registry.histogram("db_pool_checkout_seconds", "Checkout time.")
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    instrument_pool(engine, name="disposed", registry=registry)
+    instrument_pool(engine, name="disposed", registry=registry)
+
+    # Le pool recréé par dispose() reste mesuré, et la jauge n'est déclarée qu'une fois
+    engine.dispose()
+    with engine.connect() as connection:
+        connection.execute(sql("SELECT 1"))
+    text = registry.render()
+    assert 'db_pool_checkout_seconds_count{engine="disposed"} 1' in text
+    assert text.count('engine="disposed",state="checked_out"') == 1
@@ -0,0 +1,96 @@
+from decimal import Decimal
+
+from fastapi import Response
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlmodel import select
+
+from src.models import Client, Conditionnement, Objet, ObjetCond
+
+BASE_URL = "/api/v1"
+
+
+def create_catalogue(session) -> tuple[int, int, int]:
+    boite = Conditionnement(libcondit="Boîte", poidscondit=50, prixcond=Decimal("1.5"))
+    comte = Objet(libobj="Comté", puobj=Decimal("12"), poidsobj=Decimal("250"))
+    brie = Objet(libobj="Brie", puobj=Decimal("8"), poidsobj=Decimal("300"))
+    epuise = Objet(libobj="Maroilles", puobj=Decimal("6"), poidsobj=Decimal("200"), indispobj=1)
+    session.add_all([boite, comte, brie, epuise])
+    session.flush()
+    session.add(ObjetCond(codobj=comte.codobj, codcond=boite.idcondit, qteobjdeb=1, qteobjfin=5))
+    session.commit()
+    return comte.codobj, brie.codobj, epuise.codobj
+
+
+def test_create_order(client: TestClient, test_session):
+    comte, brie, epuise = create_catalogue(test_session)
+    codcli = test_session.exec(select(Client)).first().client_id
+
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    engine = test_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result: Response = client.post(f"{BASE_URL}/orders", json={
+            "codcli": codcli,
+            "lignes": [{"codobj": comte, "qte": 2}, {"codobj": brie, "qte": 1}, {"codobj": comte, "qte": 1}],
+        })
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert result.status_code == 201
+    order = result.json()
+    assert len(order["lignes"]) == 3
+    assert Decimal(order["montant"]) == Decimal("12") * 3 + Decimal("8") + Decimal("1.5") * 2
+    assert Decimal(order["poids"]) == Decimal("250") * 3 + Decimal("300") + 50 * 2
+    # Un seul SELECT du catalogue et un seul INSERT des lignes, quel que soit le nombre de lignes
+    assert sum("FROM t_objet" in s for s in statements) == 1
+    assert sum(s.startswith("INSERT INTO t_dtlcode") for s in statements) == 1
+
+    assert client.get(f"{BASE_URL}/orders/{order['codcde']}").json() == order
+    assert client.get(f"{BASE_URL}/orders", params={"client_id": codcli}).json()[0] == order
+
+
+def test_create_order_errors(client: TestClient, test_session):
+    comte, _, epuise = create_catalogue(test_session)
+    codcli = test_session.exec(select(Client)).first().client_id
+    lignes = [{"codobj": comte, "qte": 1}]
+
+    assert client.post(f"{BASE_URL}/orders", json={"codcli": 0, "lignes": lignes}).status_code == 400
+    assert client.post(f"{BASE_URL}/orders", json={"codcli": codcli, "lignes": [{"codobj": 0}]}).status_code == 400
+    assert client.post(f"{BASE_URL}/orders", json={"codcli": codcli, "lignes": [{"codobj": epuise}]}).status_code == 400
+    assert client.post(f"{BASE_URL}/orders", json={"codcli": codcli, "lignes": []}).status_code == 422
+    assert client.get(f"{BASE_URL}/orders/0").status_code == 404
+
+
+def test_delete_client_with_orders(client: TestClient, test_session):
+    comte, _, _ = create_catalogue(test_session)
+    kept = client.post(f"{BASE_URL}/clients", json={"firstname": "ordered", "lastname": "kept", "address_line_1": "1 rue"}).json()["client_id"]
+    gone = client.post(f"{BASE_URL}/clients", json={"firstname": "idle", "lastname": "gone", "address_line_1": "2 rue"}).json()["client_id"]
+    assert client.post(f"{BASE_URL}/orders", json={"codcli": kept, "lignes": [{"codobj": comte}]}).status_code == 201
+
+    assert client.delete(f"{BASE_URL}/clients/{kept}").status_code == 400
+    result = client.request("DELETE", f"{BASE_URL}/clients/bulk", json={"ids": [kept, gone]})
+    assert result.json() == {"affected": 1}
+    assert client.get(f"{BASE_URL}/clients/{kept}").status_code == 200
+    assert client.get(f"{BASE_URL}/clients/{gone}").status_code == 404
+
+
+def test_order_with_line_outside_catalogue(client: TestClient, test_session):
+    comte, brie, _ = create_catalogue(test_session)
+    codcli = test_session.exec(select(Client)).first().client_id
+    order = client.post(f"{BASE_URL}/orders", json={
+        "codcli": codcli, "lignes": [{"codobj": comte, "qte": 1}, {"codobj": brie, "qte": 1}],
+    }).json()
+
+    # Ligne dont l'objet n'existe plus : comptée pour rien, la commande reste lisible, modifiable et supprimable
+    test_session.execute(text("UPDATE t_dtlcode SET codobj = NULL WHERE codcde = :codcde AND codobj = :codobj"), {
+        "codcde": order["codcde"], "codobj": brie,
+    })
+    test_session.commit()
+    result = client.get(f"{BASE_URL}/orders/{order['codcde']}")
+    assert result.status_code == 200
+    assert Decimal(result.json()["montant"]) == Decimal("12") + Decimal("1.5")
+    assert client.patch(f"{BASE_URL}/orders/{order['codcde']}", json={"datcde": "2024-06-01"}).status_code == 200
+    assert client.delete(f"{BASE_URL}/orders/{order['codcde']}").status_code == 204
+    assert client.get(f"{BASE_URL}/orders/{order['codcde']}").status_code == 404
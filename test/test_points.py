@@ -0,0 +1,60 @@
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+
+from src.models import Objet
+from src.repositories import ClientPointsRepository, CommandeRepository
+
+BASE_URL = "/api/v1"
+
+
+def test_client_points(client: TestClient, test_session):
+    reblochon = Objet(libobj="Reblochon", puobj=Decimal("9"), poidsobj=Decimal("450"), points=3)
+    beurre = Objet(libobj="Beurre", puobj=Decimal("4"), poidsobj=Decimal("250"), points=1)
+    test_session.add_all([reblochon, beurre])
+    test_session.commit()
+    codcli = client.post(f"{BASE_URL}/clients", json={"firstname": "anne", "lastname": "fidele", "address_line_1": "2 rue"}).json()["client_id"]
+
+    assert client.get(f"{BASE_URL}/clients/{codcli}/points").json() == {"client_id": codcli, "points": 0}
+    assert client.get(f"{BASE_URL}/clients/0/points").status_code == 404
+
+    first = client.post(f"{BASE_URL}/orders", json={"codcli": codcli, "lignes": [{"codobj": reblochon.codobj, "qte": 2}]}).json()
+    second = client.post(f"{BASE_URL}/orders", json={"codcli": codcli, "lignes": [{"codobj": beurre.codobj, "qte": 5}]}).json()
+    assert client.get(f"{BASE_URL}/clients/{codcli}/points").json()["points"] == 2 * 3 + 5
+
+    result = client.patch(f"{BASE_URL}/orders/{first['codcde']}", json={"lignes": [{"codobj": reblochon.codobj, "qte": 1}, {"codobj": beurre.codobj, "qte": 1}]})
+    assert result.status_code == 200
+    assert len(result.json()["lignes"]) == 2
+    assert client.get(f"{BASE_URL}/clients/{codcli}/points").json()["points"] == 3 + 1 + 5
+
+    # Modification de l'en-tête seul : solde inchangé
+    assert client.patch(f"{BASE_URL}/orders/{first['codcde']}", json={"cdeComt": "à livrer"}).json()["cdeComt"] == "à livrer"
+    assert client.get(f"{BASE_URL}/clients/{codcli}/points").json()["points"] == 9
+
+    assert client.delete(f"{BASE_URL}/orders/{second['codcde']}").status_code == 204
+    assert client.get(f"{BASE_URL}/orders/{second['codcde']}").status_code == 404
+    assert client.get(f"{BASE_URL}/clients/{codcli}/points").json()["points"] == 4
+
+    # La reconstruction en masse retrouve les soldes tenus incrémentalement
+    ClientPointsRepository.rebuild(test_session)
+    assert ClientPointsRepository.get(codcli, test_session) == 4
+
+
+def test_client_points_concurrent_writes(client: TestClient, test_session):
+    tomme = Objet(libobj="Tomme", puobj=Decimal("7"), poidsobj=Decimal("400"), points=2)
+    test_session.add(tomme)
+    test_session.commit()
+    codcli = client.post(f"{BASE_URL}/clients", json={"firstname": "zoe", "lastname": "double", "address_line_1": "4 rue"}).json()["client_id"]
+
+    # Upsert : le premier ajout crée le solde, les suivants l'incrémentent
+    ClientPointsRepository.add(codcli, 5, test_session)
+    ClientPointsRepository.add(codcli, 1, test_session)
+    test_session.commit()
+    assert ClientPointsRepository.get(codcli, test_session) == 6
+
+    codcde = client.post(f"{BASE_URL}/orders", json={"codcli": codcli, "lignes": [{"codobj": tomme.codobj, "qte": 3}]}).json()["codcde"]
+    assert ClientPointsRepository.get(codcli, test_session) == 12
+    # Deux suppressions qui ont lu la même commande : une seule retire les points
+    assert CommandeRepository.delete(codcde, codcli, test_session, points=6)
+    assert not CommandeRepository.delete(codcde, codcli, test_session, points=6)
+    assert ClientPointsRepository.get(codcli, test_session) == 6
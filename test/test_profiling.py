@@ -0,0 +1,49 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from src import profiling
+from src.profiling import StackSampler, instrument_engine
+
+BASE_URL = "/api/v1"
+
+
+def test_server_timing(client: TestClient, test_session, monkeypatch):
+    instrument_engine(test_session.get_bind())
+    result = client.get(f"{BASE_URL}/clients", params={"limit": 5})
+    metrics = {part.split(";")[0]: part for part in result.headers["Server-Timing"].split(", ")}
+    assert set(metrics) == {"app", "db", "serialize"}
+    assert "queries" in metrics["db"] and 'desc="0 queries"' not in metrics["db"]
+    assert "X-NPlus1-Suspect" not in result.headers
+
+    monkeypatch.setattr(profiling, "NPLUS1_THRESHOLD", 1)
+    assert client.get(f"{BASE_URL}/clients", params={"limit": 5}).headers["X-NPlus1-Suspect"] == "1"
+
+
+def busy_loop(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_stack_sampler(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_DIR", str(tmp_path))
+    sampler = StackSampler(interval_ms=1)
+    sampler.start()
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,))
+    sampler.begin()
+    start = time.perf_counter()
+    worker.start()
+    time.sleep(0.1)
+    stop.set()
+    worker.join()
+    sampler.end()
+
+    stacks = sampler.collect(start, time.perf_counter(), {worker.ident})
+    # Quelques échantillons peuvent tomber pendant le démarrage ou l'arrêt du thread
+    assert stacks and stacks.most_common(1)[0][0].endswith("test_profiling.py:busy_loop")
+    path = sampler.dump(stacks, "test")
+    with open(path) as file:
+        stack, count = file.readline().rsplit(" ", 1)
+    assert stack in stacks and int(count) == stacks[stack]
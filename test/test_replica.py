@@ -0,0 +1,86 @@
+import pytest
+from fastapi import FastAPI, APIRouter
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from src import database
+from src.database import ReplicaPool, ReplicaStickinessMiddleware, RoutingSession
+from src.models import Client
+from src.services import ClientService
+from src.routers.client_router import router as router_client
+
+BASE_URL = "/api/v1"
+
+
+@pytest.fixture
+def engines(tmp_path):
+    """Primaire et réplica sur deux fichiers SQLite, le même client y porte un nom différent."""
+    engines = {}
+    for name in ("primary", "replica"):
+        engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(Client(client_id=1, firstname="Robin", lastname=name.upper(), address_line_1="1 rue"))
+            session.commit()
+        engines[name] = engine
+    yield engines
+    for engine in engines.values():
+        engine.dispose()
+
+
+def test_routing_session(engines):
+    session = RoutingSession(engines["primary"], engines["replica"])
+    assert session.get(Client, 1).lastname == "REPLICA"
+    assert session.exec(select(Client.lastname)).all() == ["REPLICA"]
+
+    session.add(Client(firstname="Eve", lastname="NEW", address_line_1="2 rue"))
+    session.commit()
+    # Après une écriture, la session lit ses propres écritures sur le primaire
+    assert session.exec(select(Client.lastname).order_by(Client.client_id)).all() == ["PRIMARY", "NEW"]
+    session.close()
+
+    assert RoutingSession(engines["primary"]).get(Client, 1).lastname == "PRIMARY"
+
+
+def test_replica_pool(engines, tmp_path):
+    down = create_engine(f"sqlite:///{tmp_path / 'missing' / 'down.db'}")
+    pool = ReplicaPool([engines["replica"], down, engines["primary"]], health_interval=60)
+    assert [pool.choose() for _ in range(4)] == [engines["replica"], engines["primary"], engines["replica"], engines["primary"]]
+    assert pool.healthy(down) is False
+    assert ReplicaPool([down]).choose() is None
+
+
+def test_replica_routing_endpoints(engines, monkeypatch):
+    monkeypatch.setattr(database, "engine", engines["primary"])
+    monkeypatch.setattr(database, "replicas", ReplicaPool([engines["replica"]]))
+
+    clients = APIRouter(prefix="/clients")
+    clients.routes.extend(router_client.routes)
+    api = APIRouter(prefix=BASE_URL)
+    api.include_router(clients)
+    app = FastAPI()
+    app.include_router(api)
+    app.add_middleware(ReplicaStickinessMiddleware, sticky_seconds=30)
+    ClientService.cache.clear()
+
+    with TestClient(app) as reader, TestClient(app) as writer:
+        assert reader.get(f"{BASE_URL}/clients/1").json()["lastname"] == "REPLICA"
+
+        patched = writer.patch(f"{BASE_URL}/clients/1", json={"lastname": "written"})
+        assert patched.json()["lastname"] == "WRITTEN"
+        assert database.REPLICA_STICKY_COOKIE in patched.cookies
+        # Les autres clients continuent sur le réplica, sans remplir le cache avec sa version en retard
+        assert reader.get(f"{BASE_URL}/clients/1").json()["lastname"] == "REPLICA"
+        # Le client qui vient d'écrire lit le primaire
+        assert writer.get(f"{BASE_URL}/clients/1").json()["lastname"] == "WRITTEN"
+        # Cache rempli par la lecture du primaire : les lecteurs du réplica profitent de la version à jour
+        assert reader.get(f"{BASE_URL}/clients/1").json()["lastname"] == "WRITTEN"
+
+        # Le compteur de clients n'est amorcé que par une lecture du primaire
+        ClientService.counter.invalidate()
+        assert reader.get(f"{BASE_URL}/clients/count").json()["count"] == 1
+        assert ClientService.counter.current() is None
+        assert writer.get(f"{BASE_URL}/clients/count").json()["count"] == 1
+        assert ClientService.counter.current() == 1
+    ClientService.cache.clear()
+    ClientService.counter.invalidate()
@@ -0,0 +1,124 @@
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from src.models import Client, Commune, Departement, Objet
+from src.repositories import SalesRollupRepository
+from src.services import SalesService
+
+BASE_URL = "/api/v1"
+
+
+def test_sales_rollup(client: TestClient, test_session):
+    savoie = Departement(department_name="Savoie", department_code="73")
+    chambery = Commune(city_name="Chambéry", postal_code="73000", departement=savoie)
+    acheteur = Client(firstname="Paul", lastname="ALPIN", address_line_1="3 rue", commune=chambery)
+    beaufort = Objet(libobj="Beaufort", puobj=Decimal("20"), poidsobj=Decimal("500"))
+    test_session.add_all([savoie, chambery, acheteur, beaufort])
+    test_session.commit()
+    lignes = [{"codobj": beaufort.codobj, "qte": 2}]
+
+    def post(datcde):
+        return client.post(f"{BASE_URL}/orders", json={"codcli": acheteur.client_id, "datcde": datcde, "lignes": lignes}).json()
+
+    janvier = post("2024-01-15")
+    post("2024-01-20")
+    fevrier = post("2024-02-03")
+
+    def sales(**params):
+        result = client.get(f"{BASE_URL}/analytics/sales", params={"department_code": "73", **params})
+        return [(row["month"], Decimal(row["revenue"]), row["orders"]) for row in result.json()]
+
+    assert sales() == [("2024-01-01", Decimal("80"), 2), ("2024-02-01", Decimal("40"), 1)]
+    assert sales(start="2024-02-10") == [("2024-02-01", Decimal("40"), 1)]
+    assert sales(end="2024-01-31") == [("2024-01-01", Decimal("80"), 2)]
+
+    # Changement de date et suppression : la commande change de mois puis disparaît
+    client.patch(f"{BASE_URL}/orders/{janvier['codcde']}", json={"datcde": "2024-02-10"})
+    assert sales() == [("2024-01-01", Decimal("40"), 1), ("2024-02-01", Decimal("80"), 2)]
+    client.delete(f"{BASE_URL}/orders/{fevrier['codcde']}")
+    incremental = sales()
+    assert incremental == [("2024-01-01", Decimal("40"), 1), ("2024-02-01", Decimal("40"), 1)]
+
+    by_departement = client.get(f"{BASE_URL}/analytics/sales/by-departement", params={"start": "2024-01-01", "end": "2024-12-31"}).json()
+    assert [(row["department_code"], Decimal(row["revenue"]), row["orders"]) for row in by_departement if row["department_code"] == "73"] == [
+        ("73", Decimal("80"), 2)
+    ]
+    by_month = client.get(f"{BASE_URL}/analytics/sales/by-month", params={"department_code": "73"}).json()
+    assert [row["month"] for row in by_month] == ["2024-01-01", "2024-02-01"]
+
+    # Le rattrapage par lots retrouve les agrégats tenus incrémentalement
+    with Session(test_session.get_bind()) as session:
+        assert SalesService.backfill(session, chunk_size=1) > 0
+    assert sales() == incremental
+
+
+def test_sales_rollup_keeps_order_departement(client: TestClient, test_session):
+    ain = Departement(department_name="Ain", department_code="01")
+    isere = Departement(department_name="Isère", department_code="38")
+    bourg = Commune(city_name="Bourg-en-Bresse", postal_code="01000", departement=ain)
+    grenoble = Commune(city_name="Grenoble", postal_code="38000", departement=isere)
+    acheteur = Client(firstname="Lou", lastname="NOMADE", address_line_1="5 rue", commune=bourg)
+    bleu = Objet(libobj="Bleu de Gex", puobj=Decimal("15"), poidsobj=Decimal("300"))
+    test_session.add_all([ain, isere, bourg, grenoble, acheteur, bleu])
+    test_session.commit()
+    order = client.post(f"{BASE_URL}/orders", json={
+        "codcli": acheteur.client_id, "datcde": "2023-05-02", "lignes": [{"codobj": bleu.codobj, "qte": 2}],
+    }).json()
+
+    def sales(code):
+        result = client.get(f"{BASE_URL}/analytics/sales", params={"department_code": code, "end": "2023-12-31"})
+        return [(row["month"], Decimal(row["revenue"]), row["orders"]) for row in result.json()]
+
+    # Le client déménage : la commande reste comptée dans son département d'origine
+    client.patch(f"{BASE_URL}/clients/{acheteur.client_id}", json={"commune_id": grenoble.id})
+    client.patch(f"{BASE_URL}/orders/{order['codcde']}", json={"lignes": [{"codobj": bleu.codobj, "qte": 1}]})
+    assert sales("01") == [("2023-05-01", Decimal("15"), 1)]
+    assert sales("38") == []
+
+    with Session(test_session.get_bind()) as session:
+        SalesService.backfill(session)
+    assert sales("01") == [("2023-05-01", Decimal("15"), 1)]
+
+    client.delete(f"{BASE_URL}/orders/{order['codcde']}")
+    assert sales("01") == [("2023-05-01", Decimal("0"), 0)]
+    assert sales("38") == []
+
+
+def test_sales_rollup_during_backfill(client: TestClient, test_session):
+    jura = Departement(department_name="Jura", department_code="39")
+    poligny = Commune(city_name="Poligny", postal_code="39800", departement=jura)
+    acheteur = Client(firstname="Léa", lastname="COMTOISE", address_line_1="2 rue", commune=poligny)
+    comte = Objet(libobj="Comté", puobj=Decimal("10"), poidsobj=Decimal("400"))
+    test_session.add_all([jura, poligny, acheteur, comte])
+    test_session.commit()
+
+    def post(qte):
+        return client.post(f"{BASE_URL}/orders", json={
+            "codcli": acheteur.client_id, "datcde": "2022-03-01", "lignes": [{"codobj": comte.codobj, "qte": qte}],
+        }).json()["codcde"]
+
+    def sales():
+        result = client.get(f"{BASE_URL}/analytics/sales", params={"department_code": "39"})
+        return [(Decimal(row["revenue"]), row["orders"]) for row in result.json()]
+
+    aggregated, pending = post(1), post(2)
+    assert sales() == [(Decimal("30"), 2)]
+
+    # Rattrapage arrêté entre les deux commandes : seule la commande déjà agrégée applique ses deltas
+    with Session(test_session.get_bind()) as session:
+        SalesRollupRepository.start_backfill(pending, session)
+        SalesRollupRepository.advance_backfill(aggregated, session)
+        session.commit()
+    client.patch(f"{BASE_URL}/orders/{aggregated}", json={"lignes": [{"codobj": comte.codobj, "qte": 3}]})
+    client.patch(f"{BASE_URL}/orders/{pending}", json={"lignes": [{"codobj": comte.codobj, "qte": 5}]})
+    assert sales() == [(Decimal("50"), 2)]
+    newer = post(1)
+    assert sales() == [(Decimal("60"), 3)]
+
+    with Session(test_session.get_bind()) as session:
+        SalesService.backfill(session, chunk_size=1)
+    assert sales() == [(Decimal("90"), 3)]
+    client.delete(f"{BASE_URL}/orders/{newer}")
+    assert sales() == [(Decimal("80"), 2)]
@@ -0,0 +1,40 @@
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from src.models import Client, Departement
+from src.schema import ensure_schema, reset_schema, schema_fingerprint
+
+
+def test_ensure_schema_keeps_data(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    assert ensure_schema(engine) is False
+    with Session(engine) as session:
+        session.add(Departement(department_code="59", department_name="Nord"))
+        session.commit()
+
+    assert ensure_schema(engine) is True
+    with Session(engine) as session:
+        assert len(session.exec(select(Departement)).all()) == 1
+
+    reset_schema(engine)
+    with Session(engine) as session:
+        assert session.exec(select(Departement)).all() == []
+
+
+def test_fingerprint_is_stable():
+    assert schema_fingerprint(SQLModel.metadata) == schema_fingerprint(SQLModel.metadata)
+
+
+def test_ensure_schema_adds_missing_columns(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    ensure_schema(engine)
+    with engine.begin() as connection:
+        # Base antérieure à la colonne version
+        connection.execute(text("ALTER TABLE t_client DROP COLUMN version"))
+        connection.execute(text("INSERT INTO t_client (firstname, lastname, address_line_1, newsletter) VALUES ('Ada', 'ANCIENNE', '1 rue', 0)"))
+        connection.execute(text("UPDATE t_schema_version SET fingerprint = 'old'"))
+
+    assert ensure_schema(engine) is False
+    with Session(engine) as session:
+        assert session.exec(select(Client)).one().version == 1
+    assert ensure_schema(engine) is True
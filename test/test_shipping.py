@@ -0,0 +1,69 @@
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import select
+
+from src.models import Client, Commande, Objet, Poids, Vignette
+from src.services.shipping_rates import BracketTable, ShippingRates
+
+BASE_URL = "/api/v1"
+
+
+def test_bracket_table():
+    table = BracketTable([(Decimal("0"), Decimal("1.2")), (Decimal("100"), Decimal("2.4")), (Decimal("500"), Decimal("4.8"))])
+    assert table.lookup(Decimal("0")) == Decimal("1.2")
+    assert table.lookup(Decimal("99.9")) == Decimal("1.2")
+    assert table.lookup(Decimal("100")) == Decimal("2.4")
+    assert table.lookup(Decimal("10000")) == Decimal("4.8")
+    assert table.lookup(Decimal("-1")) == Decimal("1.2")
+    assert table.lookup_many([Decimal("50"), Decimal("500")]) == [Decimal("1.2"), Decimal("4.8")]
+    assert BracketTable().lookup(Decimal("1")) is None
+
+
+def test_shipping_quote(client: TestClient, test_session):
+    test_session.add_all([
+        Poids(valmin=Decimal("0"), valtimbre=Decimal("1.5")),
+        Poids(valmin=Decimal("1000"), valtimbre=Decimal("3")),
+        Vignette(valmin=Decimal("0"), valtimbre=Decimal("0.5")),
+        Vignette(valmin=Decimal("1000"), valtimbre=Decimal("1")),
+    ])
+    fromage = Objet(libobj="Tomme", puobj=Decimal("10"), poidsobj=Decimal("400"))
+    test_session.add(fromage)
+    test_session.commit()
+    codcli = test_session.exec(select(Client)).first().client_id
+
+    result = client.post(f"{BASE_URL}/shipping/quote", json={"weights": [200, 1000]})
+    assert result.status_code == 200
+    assert [(Decimal(q["timbrecde"]), Decimal(q["timbrecli"])) for q in result.json()] == [
+        (Decimal("1.5"), Decimal("0.5")), (Decimal("3"), Decimal("1")),
+    ]
+
+    # Les timbres sont calculés à la saisie de la commande
+    order = client.post(f"{BASE_URL}/orders", json={"codcli": codcli, "lignes": [{"codobj": fromage.codobj, "qte": 3}]}).json()
+    assert (Decimal(order["timbrecde"]), Decimal(order["timbrecli"])) == (Decimal("3"), Decimal("1"))
+
+    test_session.get(Commande, order["codcde"]).timbrecde = None
+    test_session.commit()
+    result = client.post(f"{BASE_URL}/shipping/quote", json={"order_ids": [order["codcde"]], "update": True})
+    assert result.status_code == 200
+    assert Decimal(result.json()[0]["poids"]) == Decimal("1200")
+    assert Decimal(client.get(f"{BASE_URL}/orders/{order['codcde']}").json()["timbrecde"]) == Decimal("3")
+
+    assert client.post(f"{BASE_URL}/shipping/quote", json={"order_ids": [0]}).status_code == 400
+    assert client.post(f"{BASE_URL}/shipping/quote", json={"weights": [1], "update": True}).status_code == 422
+
+
+def test_shipping_rates_reload_after_update_outside_orm(test_session):
+    rates = ShippingRates(check_interval=0)
+    bracket = Poids(valmin=Decimal("50000"), valtimbre=Decimal("9"))
+    test_session.add(bracket)
+    test_session.commit()
+    rates.load(test_session)
+    assert rates.quote(Decimal("60000"))[0] == Decimal("9")
+
+    # Changement de tarif en SQL (autre worker, script) : même nombre de lignes et même id max
+    test_session.execute(text("UPDATE t_poids SET valtimbre = 12 WHERE id = :id"), {"id": bracket.id})
+    test_session.commit()
+    rates.ensure_fresh(test_session)
+    assert rates.quote(Decimal("60000"))[0] == Decimal("12")